@@ -4,12 +4,153 @@ Each agent can execute build tasks independently
 """
 
 import asyncio
+import atexit
 import logging
+import os
+import queue
+import shutil
 import sys
 import json
+import threading
+import time
+from logging.handlers import QueueHandler, QueueListener
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional, Tuple
+
+
+# Component -> handler method name, bound once per worker in register_task_handlers
+_HANDLERS = {
+    "config": "handle_config_task",
+    "voice": "handle_voice_task",
+    "lipsync": "handle_lipsync_task",
+    "avatar": "handle_avatar_task",
+    "video": "handle_video_task",
+    "api": "handle_api_task",
+    "models": "handle_models_task",
+    "deployment": "handle_deployment_task",
+    "testing": "handle_testing_task",
+    "docs": "handle_docs_task",
+    "enhancement": "handle_enhancement_task",
+    "monitoring": "handle_monitoring_task",
+    "optimization": "handle_optimization_task"
+}
+
+
+# ==================== Project Scaffold ====================
+
+PROJECT_DIRECTORIES = [
+    "config",
+    "core",
+    "models",
+    "api",
+    "tests",
+    "docs",
+    "data/avatars",
+    "data/voices",
+    "temp",
+    "logs"
+]
+
+ENV_EXAMPLE = """
+# API Keys
+ELEVENLABS_API_KEY=your_key_here
+HF_TOKEN=your_token_here
+
+# Configuration
+VIDEO_QUALITY=high
+GPU_ENABLED=true
+BATCH_SIZE=8
+
+# Server
+HOST=0.0.0.0
+PORT=8000
+"""
+
+REQUIREMENTS = """
+fastapi==0.104.1
+uvicorn==0.24.0
+torch==2.1.0
+torchvision==0.16.0
+opencv-python==4.8.1
+numpy==1.24.3
+librosa==0.10.1
+elevenlabs==0.2.27
+transformers==4.35.0
+mediapipe==0.10.8
+pydantic==2.5.0
+python-multipart==0.0.6
+"""
+
+# (path, pre-encoded content) pairs written by the config task handlers
+ENVIRONMENT_FILES = [
+    (Path(".env.example"), ENV_EXAMPLE.strip().encode("utf-8")),
+    (Path("requirements.txt"), REQUIREMENTS.strip().encode("utf-8")),
+]
+
+# Checked-in template copied to config/settings.py by create_settings_module
+SETTINGS_TEMPLATE = Path(__file__).resolve().parent / "config" / "_settings_template.py"
+
+SETTINGS_FILES = [
+    (Path("config/__init__.py"), b"from .settings import settings\n"),
+]
+
+
+def iso_timestamp(timestamp_ns: int) -> str:
+    """Format a time.time_ns() value as a local ISO-8601 string for task results"""
+    return datetime.fromtimestamp(timestamp_ns / 1e9).isoformat()
+
+
+def write_files(files: List[Tuple[Path, bytes]]):
+    """Write pre-encoded files in a single pass, creating parent directories"""
+    for path, data in files:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(data)
+
+
+# ==================== Logging ====================
+
+AGENTS_LOG_DIR = Path("logs")
+
+# One queue and listener per agent log file, shared by every AgentWorker of that agent
+_log_listeners: Dict[str, QueueListener] = {}
+_log_listener_lock = threading.Lock()
+
+
+def _agent_logger(agent_name: str) -> logging.Logger:
+    """Return an agent's logger, starting its log listener on first use
+
+    Each agent process writes only its own logs/<agent_name>.log, which the
+    keep-alive monitor watches for heartbeats, so no log file is shared
+    between processes.
+    """
+    logger = logging.getLogger(f"agents.{agent_name}")
+    with _log_listener_lock:
+        if agent_name in _log_listeners:
+            return logger
+
+        AGENTS_LOG_DIR.mkdir(exist_ok=True)
+
+        formatter = logging.Formatter(
+            f'%(asctime)s - {agent_name} - %(levelname)s - %(message)s'
+        )
+        file_handler = logging.FileHandler(AGENTS_LOG_DIR / f"{agent_name}.log")
+        stream_handler = logging.StreamHandler()
+        for handler in (file_handler, stream_handler):
+            handler.setFormatter(formatter)
+
+        # Task code only enqueues records; disk and console I/O happen on the listener thread
+        log_queue = queue.SimpleQueue()
+        listener = QueueListener(log_queue, file_handler, stream_handler)
+        listener.start()
+        atexit.register(listener.stop)
+        _log_listeners[agent_name] = listener
+
+        logger.setLevel(logging.INFO)
+        logger.addHandler(QueueHandler(log_queue))
+        logger.propagate = False
+
+    return logger
 
 
 class AgentWorker:
@@ -26,47 +167,25 @@ class AgentWorker:
 
     def setup_logging(self):
         """Setup logging for this agent"""
-        log_dir = Path("logs")
-        log_dir.mkdir(exist_ok=True)
-
-        logging.basicConfig(
-            level=logging.INFO,
-            format=f'%(asctime)s - {self.agent_name} - %(levelname)s - %(message)s',
-            handlers=[
-                logging.FileHandler(f'logs/{self.agent_name}.log'),
-                logging.StreamHandler()
-            ]
-        )
-        self.logger = logging.getLogger(self.agent_name)
+        self.logger = _agent_logger(self.agent_name)
 
     def register_task_handlers(self) -> Dict[str, callable]:
         """Register handlers for different task types"""
         return {
-            "config": self.handle_config_task,
-            "voice": self.handle_voice_task,
-            "lipsync": self.handle_lipsync_task,
-            "avatar": self.handle_avatar_task,
-            "video": self.handle_video_task,
-            "api": self.handle_api_task,
-            "models": self.handle_models_task,
-            "deployment": self.handle_deployment_task,
-            "testing": self.handle_testing_task,
-            "docs": self.handle_docs_task,
-            "enhancement": self.handle_enhancement_task,
-            "monitoring": self.handle_monitoring_task,
-            "optimization": self.handle_optimization_task
+            component: getattr(self, method_name)
+            for component, method_name in _HANDLERS.items()
         }
 
     async def execute_task(self, task: Dict[str, Any]) -> Dict[str, Any]:
         """Execute a given task"""
         task_id = task.get("id")
         task_name = task.get("name")
-        component = task.get("component")
 
-        self.logger.info(f"🎯 Starting task: {task_name} ({task_id})")
+        self.logger.info("🎯 Starting task: %s (%s)", task_name, task_id)
 
         try:
             # Get the appropriate handler
+            component = task.get("component")
             handler = self.task_handlers.get(component)
 
             if not handler:
@@ -75,24 +194,38 @@ class AgentWorker:
             # Execute the task
             result = await handler(task)
 
-            self.logger.info(f"✅ Completed task: {task_name}")
+            self.logger.info("✅ Completed task: %s", task_name)
 
             return {
                 "status": "completed",
                 "task_id": task_id,
                 "result": result,
-                "timestamp": datetime.now().isoformat()
+                "timestamp": iso_timestamp(time.time_ns())
             }
 
         except Exception as e:
-            self.logger.error(f"❌ Failed task: {task_name} - {e}")
+            self.logger.error("❌ Failed task: %s - %s", task_name, e)
             return {
                 "status": "failed",
                 "task_id": task_id,
                 "error": str(e),
-                "timestamp": datetime.now().isoformat()
+                "timestamp": iso_timestamp(time.time_ns())
             }
 
+    async def execute_batch(
+        self,
+        tasks: List[Dict[str, Any]],
+        max_concurrency: int = 4
+    ) -> List[Dict[str, Any]]:
+        """Execute independent tasks concurrently, at most max_concurrency at a time"""
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def run(task: Dict[str, Any]) -> Dict[str, Any]:
+            async with semaphore:
+                return await self.execute_task(task)
+
+        return await asyncio.gather(*(run(task) for task in tasks), return_exceptions=True)
+
     # ==================== Task Handlers ====================
 
     async def handle_config_task(self, task: Dict[str, Any]) -> Dict[str, Any]:
@@ -306,27 +439,14 @@ class VoiceSynthesizer:
         """Create project directory structure"""
         self.logger.info("Creating project structure...")
 
-        directories = [
-            "config",
-            "core",
-            "models",
-            "api",
-            "tests",
-            "docs",
-            "data/avatars",
-            "data/voices",
-            "temp",
-            "logs"
-        ]
-
-        for dir_path in directories:
-            Path(dir_path).mkdir(parents=True, exist_ok=True)
-            self.logger.info(f"  Created: {dir_path}/")
+        for dir_path in PROJECT_DIRECTORIES:
+            os.makedirs(dir_path, exist_ok=True)
+        self.logger.info("  Created %d directories", len(PROJECT_DIRECTORIES))
 
         await asyncio.sleep(1)
 
         return {
-            "directories": len(directories),
+            "directories": len(PROJECT_DIRECTORIES),
             "structure": "complete"
         }
 
@@ -334,48 +454,13 @@ class VoiceSynthesizer:
         """Setup environment configuration"""
         self.logger.info("Setting up environment...")
 
-        # Create .env.example
-        env_content = """
-# API Keys
-ELEVENLABS_API_KEY=your_key_here
-HF_TOKEN=your_token_here
-
-# Configuration
-VIDEO_QUALITY=high
-GPU_ENABLED=true
-BATCH_SIZE=8
-
-# Server
-HOST=0.0.0.0
-PORT=8000
-"""
-
-        env_file = Path(".env.example")
-        env_file.write_text(env_content.strip())
-
-        # Create requirements.txt
-        requirements = """
-fastapi==0.104.1
-uvicorn==0.24.0
-torch==2.1.0
-torchvision==0.16.0
-opencv-python==4.8.1
-numpy==1.24.3
-librosa==0.10.1
-elevenlabs==0.2.27
-transformers==4.35.0
-mediapipe==0.10.8
-pydantic==2.5.0
-python-multipart==0.0.6
-"""
-
-        req_file = Path("requirements.txt")
-        req_file.write_text(requirements.strip())
+        # Create .env.example and requirements.txt
+        write_files(ENVIRONMENT_FILES)
 
         await asyncio.sleep(1)
 
         return {
-            "files": [".env.example", "requirements.txt"],
+            "files": [str(path) for path, _ in ENVIRONMENT_FILES],
             "packages": 12
         }
 
@@ -383,44 +468,11 @@ python-multipart==0.0.6
         """Create settings configuration module"""
         self.logger.info("Creating settings module...")
 
-        settings_code = '''
-"""Configuration settings for AI Avatar Platform"""
-import os
-from pathlib import Path
-
-class Settings:
-    # API Keys
-    ELEVENLABS_API_KEY = os.getenv("ELEVENLABS_API_KEY")
-    HF_TOKEN = os.getenv("HF_TOKEN")
-
-    # Paths
-    BASE_DIR = Path(__file__).parent.parent
-    DATA_DIR = BASE_DIR / "data"
-    TEMP_DIR = BASE_DIR / "temp"
-
-    # Model Configuration
-    WAV2LIP_MODEL = "wav2lip_gan.pth"
-    FACE_DETECTOR = "mediapipe"
-
-    # Processing
-    VIDEO_QUALITY = "high"
-    GPU_ENABLED = True
-    BATCH_SIZE = 8
-
-    # Server
-    HOST = "0.0.0.0"
-    PORT = 8000
-
-settings = Settings()
-'''
-
+        # Create config/settings.py and config/__init__.py
         settings_file = Path("config/settings.py")
         settings_file.parent.mkdir(parents=True, exist_ok=True)
-        settings_file.write_text(settings_code.strip())
-
-        # Create __init__.py
-        init_file = Path("config/__init__.py")
-        init_file.write_text("from .settings import settings\n")
+        shutil.copyfile(SETTINGS_TEMPLATE, settings_file)
+        write_files(SETTINGS_FILES)
 
         await asyncio.sleep(1)
 
@@ -429,7 +481,6 @@ settings = Settings()
             "settings": 10
         }
 
-
 async def main():
     """Main entry point for agent worker"""
     if len(sys.argv) < 3:
@@ -440,13 +491,12 @@ async def main():
     agent_name = sys.argv[2]
 
     worker = AgentWorker(agent_id, agent_name)
-    worker.logger.info(f"🚀 Agent {agent_name} started (ID: {agent_id})")
+    worker.logger.info("🚀 Agent %s started (ID: %s)", agent_name, agent_id)
 
     # In real implementation, this would listen for tasks from orchestrator
     # For now, keep alive and wait for signals
     try:
-        while True:
-            await asyncio.sleep(1)
+        await asyncio.Event().wait()
     except KeyboardInterrupt:
         worker.logger.info("👋 Shutting down agent")
 
@@ -4,97 +4,248 @@ Automate 12 Claude Agents with Task Prompts and Keep-Alive
 Sends prompts to each terminal and keeps them alive with periodic Enter key presses
 """
 
+import asyncio
 import json
+import signal
 import time
 import subprocess
-import threading
-from datetime import datetime
+from functools import lru_cache
+from pathlib import Path
+
+try:
+    import orjson
+    load_json = orjson.loads
+except ImportError:
+    load_json = json.loads
 
 # Load prompts
-with open('tasks/prompts.json', 'r') as f:
-    prompts = json.load(f)
-
-# Terminal automation using AppleScript
-def send_to_terminal(window_index, text, press_enter=True):
-    """Send text to a specific Terminal window"""
-    # AppleScript to send text to terminal window
-    script = f'''
+prompts = load_json(Path('tasks/prompts.json').read_bytes())
+
+# AppleScript templates, formatted with str.format at call time
+SEND_ENTER_TPL = "sendEnter({{{0}}})"
+
+WINDOW_COUNT_SCRIPT = '''
+tell application "Terminal"
+    count of windows
+end tell
+'''
+
+# Types a prompt into window N's selected tab without bringing it to the front.
+# Window index and prompt are passed through argv, so the prompt needs no escaping.
+# Unlike a paste, every newline is typed as Return, so prompts go in as one line.
+SEND_PROMPT_ARGS = [
+    '-e', 'on run argv',
+    '-e', 'tell application "Terminal" to do script (item 2 of argv) '
+          'in selected tab of window ((item 1 of argv) as integer)',
+    '-e', 'end run',
+]
+
+# Handlers loaded once into the persistent osascript coprocess
+AUTOMATION_HANDLERS = '''
+on sendEnter(windowList)
     tell application "Terminal"
-        tell window {window_index}
-            do script "{text}" in selected tab
-        end tell
+        set windowCount to count of windows
     end tell
-    '''
-
-    if press_enter:
-        # Send the text followed by Enter
-        escaped_text = text.replace('"', '\\"').replace('\\', '\\\\')
-        script = f'''
-        tell application "Terminal"
-            set windowCount to count of windows
-            if windowCount >= {window_index} then
-                tell window {window_index}
-                    set selected tab to tab 1
-                end tell
-                tell application "System Events"
-                    tell process "Terminal"
-                        keystroke "{escaped_text}"
+    tell application "System Events"
+        tell process "Terminal"
+            set frontmost to true
+            repeat with w in windowList
+                set w to contents of w
+                if windowCount >= w then
+                    tell window w
                         keystroke return
                     end tell
-                end tell
-            end if
+                end if
+            end repeat
         end tell
-        '''
+    end tell
+end sendEnter
+'''
+
+@lru_cache(maxsize=1)
+def send_enter_statement(window_indices):
+    """Format the coprocess sendEnter call for the given windows.
+
+    Cached on the window tuple, so the statement is only rebuilt when the set
+    of active windows changes.
+    """
+    return SEND_ENTER_TPL.format(", ".join(map(str, window_indices)))
 
+class OsascriptSession:
+    """Long-lived `osascript -i` coprocess with AUTOMATION_HANDLERS preloaded.
+
+    The AppleScript handlers are compiled once at startup; each call afterwards
+    is a single line written to the coprocess stdin.
+    """
+
+    ACK = "__ack__"
+
+    def __init__(self):
+        self.proc = None
+
+    async def start(self):
+        self.proc = await asyncio.create_subprocess_exec(
+            'osascript', '-i',
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.DEVNULL
+        )
+        return await self._run(AUTOMATION_HANDLERS, timeout=10)
+
+    async def call(self, statement, timeout=10):
+        """Run one AppleScript statement, waiting for the coprocess to acknowledge it"""
+        return await self._run(statement + "\n", timeout=timeout)
+
+    async def _run(self, source, timeout):
+        if self.proc is None or self.proc.returncode is not None:
+            return False
+
+        # The trailing ACK literal is echoed back even if the statement fails
+        self.proc.stdin.write(f'{source}"{self.ACK}"\n'.encode('utf-8'))
+
+        try:
+            await self.proc.stdin.drain()
+            return await asyncio.wait_for(self._read_ack(), timeout=timeout)
+        except (asyncio.TimeoutError, ConnectionError):
+            return False
+
+    async def _read_ack(self):
+        while True:
+            line = await self.proc.stdout.readline()
+            if not line:
+                return False
+            if self.ACK.encode('utf-8') in line:
+                return True
+
+    async def close(self):
+        if self.proc is None or self.proc.returncode is not None:
+            return
+        self.proc.stdin.close()
+        try:
+            await asyncio.wait_for(self.proc.wait(), timeout=2)
+        except asyncio.TimeoutError:
+            self.proc.kill()
+            await self.proc.wait()
+
+async def count_windows():
+    """Number of open Terminal windows, or None if osascript fails"""
+    proc = await asyncio.create_subprocess_exec(
+        'osascript', '-e', WINDOW_COUNT_SCRIPT,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.DEVNULL
+    )
+    stdout, _ = await proc.communicate()
     try:
-        subprocess.run(['osascript', '-e', script], check=True)
-        return True
-    except Exception as e:
-        print(f"Error sending to terminal {window_index}: {e}")
-        return False
+        return int(stdout.strip())
+    except ValueError:
+        return None
 
-def send_enter_to_terminal(window_index):
-    """Send Enter key to keep session alive"""
-    script = f'''
-    tell application "Terminal"
-        set windowCount to count of windows
-        if windowCount >= {window_index} then
-            tell application "System Events"
-                tell process "Terminal"
-                    set frontmost to true
-                    tell window {window_index}
-                        keystroke return
-                    end tell
-                end tell
-            end tell
-        end if
-    end tell
-    '''
+async def run_keep_alive(session, windows, duration_minutes=30):
+    """Keep all (window_index, task_name) terminals alive by pressing Enter every 2 seconds"""
+    loop = asyncio.get_running_loop()
+    interrupted = asyncio.Event()
+    done = asyncio.Event()
+
+    def interrupt():
+        interrupted.set()
+        done.set()
+
+    # Both Ctrl+C and the duration timer end the run through the same event
+    loop.add_signal_handler(signal.SIGINT, interrupt)
+    deadline = loop.call_later(duration_minutes * 60, done.set)
+
+    active_windows = {window_index for window_index, _ in windows}
+    task_names = dict(windows)
+    for window_index, task_name in windows:
+        print(f"[{task_name}] Keep-alive started for window {window_index}")
+
+    iteration = 0
+
+    try:
+        while active_windows:
+            try:
+                # Returns early as soon as done is set, otherwise times out after 2s
+                await asyncio.wait_for(done.wait(), timeout=2.0)
+                break
+            except asyncio.TimeoutError:
+                pass
+
+            iteration += 1
+            if not await session.call(send_enter_statement(tuple(sorted(active_windows)))):
+                print("⚠️  osascript coprocess stopped responding, ending keep-alive")
+                break
+
+            if iteration % 30 == 0:  # Log every minute
+                # Stop pressing Enter in windows that have been closed since
+                window_count = await count_windows()
+                if window_count is not None:
+                    for window_index in sorted(w for w in active_windows if w > window_count):
+                        active_windows.discard(window_index)
+                        print(f"[{task_names[window_index]}] Window {window_index} closed, keep-alive stopped")
+
+                elapsed = iteration * 2
+                print(f"📊 Keep-alive: {elapsed}s elapsed, {len(active_windows)}/{len(windows)} agents still being monitored")
+    finally:
+        deadline.cancel()
+        loop.remove_signal_handler(signal.SIGINT)
+
+    for window_index, task_name in windows:
+        print(f"[{task_name}] Keep-alive completed for window {window_index}")
+
+    return interrupted.is_set()
+
+async def send_prompt(window_index, prompt):
+    """Send a prompt to a Terminal window; safe to run concurrently for different windows"""
+    # Join the lines, or each one would be submitted to the agent separately
+    prompt = " ".join(line.strip() for line in prompt.splitlines() if line.strip())
 
     try:
-        subprocess.run(['osascript', '-e', script], check=True, capture_output=True)
-        return True
+        proc = await asyncio.create_subprocess_exec(
+            'osascript', *SEND_PROMPT_ARGS, str(window_index), prompt,
+            stdout=asyncio.subprocess.DEVNULL,
+            stderr=asyncio.subprocess.PIPE
+        )
+        _, stderr = await proc.communicate()
     except Exception as e:
+        print(f"Error sending to terminal {window_index}: {e}")
         return False
 
-def keep_alive_monitor(window_index, task_name, duration_minutes=30):
-    """Keep terminal alive by pressing Enter every 2 seconds"""
-    print(f"[{task_name}] Keep-alive started for window {window_index}")
+    if proc.returncode != 0:
+        print(f"Error sending to terminal {window_index}: {stderr.decode('utf-8', 'replace').strip()}")
+        return False
+    return True
 
-    end_time = time.time() + (duration_minutes * 60)
-    iteration = 0
+async def automate(windows):
+    """Paste prompts and keep all terminals alive through one osascript coprocess
 
-    while time.time() < end_time:
-        time.sleep(2)  # Wait 2 seconds
-        iteration += 1
+    windows is a list of (window_index, task_name, prompt) tuples.
+    """
+    session = OsascriptSession()
+    if not await session.start():
+        print("❌ Could not start osascript coprocess")
+        return False
 
-        success = send_enter_to_terminal(window_index)
+    try:
+        # Each prompt targets its own window, so all sends can run at once
+        results = await asyncio.gather(*(
+            send_prompt(window_index, prompt) for window_index, _, prompt in windows
+        ))
+        for (window_index, task_name, _), sent in zip(windows, results):
+            if sent:
+                print(f"[{task_name}] ✅ Prompt sent to window {window_index}")
 
-        if iteration % 30 == 0:  # Log every minute
-            elapsed = iteration * 2
-            print(f"[{task_name}] Keep-alive: {elapsed}s elapsed, window {window_index}")
+        print()
+        print("=" * 80)
+        print("✅ All 12 agents have been sent their prompts!")
+        print("🔄 Keep-alive monitoring active (Enter every 2 seconds)")
+        print("⏱️  Will monitor for 30 minutes or until Ctrl+C")
+        print("=" * 80)
+        print()
 
-    print(f"[{task_name}] Keep-alive completed for window {window_index}")
+        # Keep all terminals alive from a single event loop
+        return await run_keep_alive(session, [(w, name) for w, name, _ in windows], duration_minutes=30)
+    finally:
+        await session.close()
 
 def main():
     print("=" * 80)
@@ -107,13 +258,7 @@ def main():
     time.sleep(5)
 
     # Get terminal window count
-    check_script = '''
-    tell application "Terminal"
-        count of windows
-    end tell
-    '''
-
-    result = subprocess.run(['osascript', '-e', check_script],
+    result = subprocess.run(['osascript', '-e', WINDOW_COUNT_SCRIPT],
                           capture_output=True, text=True)
     window_count = int(result.stdout.strip())
 
@@ -141,75 +286,17 @@ def main():
         ("task_12", "📱 PWA"),
     ]
 
-    threads = []
+    windows = []
 
     print("📤 Sending prompts to all agents...")
     print()
 
     for i, (task_key, task_name) in enumerate(tasks):
         window_index = i + 1  # Terminal windows are 1-indexed
-        prompt = prompts[task_key]["prompt"]
-
-        print(f"[{task_name}] Sending to window {window_index}...")
-
-        # Send prompt to terminal
-        # Use simple echo approach since direct keystroke can be complex
-        escaped_prompt = prompt.replace("'", "'\\''")
-        send_cmd = f"echo '{escaped_prompt}' && sleep 0.5"
-
-        # Actually, let's write to a temp file and paste
-        temp_file = f"/tmp/claude_task_{i+1}.txt"
-        with open(temp_file, 'w') as f:
-            f.write(prompt)
-
-        # Copy to clipboard and paste (more reliable)
-        subprocess.run(['osascript', '-e', f'''
-            tell application "Terminal"
-                activate
-                set frontmost to true
-                set selected of window {window_index} to true
-            end tell
-
-            do shell script "cat {temp_file} | pbcopy"
-
-            tell application "System Events"
-                tell process "Terminal"
-                    keystroke "v" using command down
-                    delay 0.3
-                    keystroke return
-                end tell
-            end tell
-        '''])
-
-        time.sleep(1)
-
-        # Start keep-alive thread for this terminal
-        thread = threading.Thread(
-            target=keep_alive_monitor,
-            args=(window_index, task_name, 30),  # 30 minute timeout
-            daemon=True
-        )
-        thread.start()
-        threads.append(thread)
-
-        print(f"[{task_name}] ✅ Prompt sent, keep-alive started")
-        time.sleep(2)  # Stagger the sends
+        windows.append((window_index, task_name, prompts[task_key]["prompt"]))
 
-    print()
-    print("=" * 80)
-    print("✅ All 12 agents have been sent their prompts!")
-    print("🔄 Keep-alive monitoring active (Enter every 2 seconds)")
-    print("⏱️  Will monitor for 30 minutes or until Ctrl+C")
-    print("=" * 80)
-    print()
-
-    # Monitor all threads
-    try:
-        while any(t.is_alive() for t in threads):
-            time.sleep(10)
-            alive_count = sum(1 for t in threads if t.is_alive())
-            print(f"📊 Status: {alive_count}/12 agents still being monitored")
-    except KeyboardInterrupt:
+    interrupted = asyncio.run(automate(windows))
+    if interrupted:
         print()
         print("⚠️  Interrupted by user. Stopping keep-alive monitoring...")
         print("The Claude agents will continue running in their terminals.")
@@ -0,0 +1,37 @@
+"""Configuration settings for AI Avatar Platform"""
+import os
+from pathlib import Path
+from typing import NamedTuple, Optional
+
+BASE_DIR = Path(__file__).parent.parent
+
+
+class Settings(NamedTuple):
+    """Immutable settings; attribute reads are plain tuple indexing"""
+    # API Keys
+    ELEVENLABS_API_KEY: Optional[str]
+    HF_TOKEN: Optional[str]
+
+    # Paths
+    BASE_DIR: Path = BASE_DIR
+    DATA_DIR: Path = BASE_DIR / "data"
+    TEMP_DIR: Path = BASE_DIR / "temp"
+
+    # Model Configuration
+    WAV2LIP_MODEL: str = "wav2lip_gan.pth"
+    FACE_DETECTOR: str = "mediapipe"
+
+    # Processing
+    VIDEO_QUALITY: str = "high"
+    GPU_ENABLED: bool = True
+    BATCH_SIZE: int = 8
+
+    # Server
+    HOST: str = "0.0.0.0"
+    PORT: int = 8000
+
+
+settings = Settings(
+    ELEVENLABS_API_KEY=os.getenv("ELEVENLABS_API_KEY"),
+    HF_TOKEN=os.getenv("HF_TOKEN"),
+)
@@ -4,11 +4,9 @@ Centralized configuration for all components
 """
 
 import os
+import shutil
+from functools import lru_cache
 from pathlib import Path
-from dotenv import load_dotenv
-
-# Load environment variables
-load_dotenv()
 
 # Base paths
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -17,10 +15,31 @@ MODELS_DIR = DATA_DIR / "models"
 AVATARS_DIR = DATA_DIR / "avatars"
 TEMP_DIR = DATA_DIR / "temp"
 OUTPUT_DIR = DATA_DIR / "output"
+CACHE_DIR = DATA_DIR / "cache"
+JOBS_DB_PATH = DATA_DIR / "jobs.db"
+
+# Load environment variables (only if there is a .env file to read)
+ENV_FILE = BASE_DIR / ".env"
+if ENV_FILE.exists():
+    from dotenv import load_dotenv
+    load_dotenv(ENV_FILE)
+
+# Job intermediates (speech, per-job avatar clips) are written once, read once and
+# deleted, so keep them on tmpfs when there is room; CACHE_DIR stays on disk
+SHM_DIR = Path("/dev/shm")
+SHM_MIN_FREE_BYTES = 1024 ** 3
+USE_SHM_TEMP = os.getenv("USE_SHM_TEMP", "true").lower() == "true"
+if USE_SHM_TEMP and SHM_DIR.is_dir():
+    try:
+        if shutil.disk_usage(SHM_DIR).free >= SHM_MIN_FREE_BYTES:
+            (SHM_DIR / "heygen_temp").mkdir(exist_ok=True)
+            TEMP_DIR = SHM_DIR / "heygen_temp"
+    except OSError:
+        pass
 
 # Create directories
-for dir_path in [DATA_DIR, MODELS_DIR, AVATARS_DIR, TEMP_DIR, OUTPUT_DIR]:
-    dir_path.mkdir(parents=True, exist_ok=True)
+for dir_path in [MODELS_DIR, AVATARS_DIR, TEMP_DIR, OUTPUT_DIR, CACHE_DIR]:
+    os.makedirs(dir_path, exist_ok=True)
 
 # API Configuration
 ELEVENLABS_API_KEY = os.getenv("ELEVENLABS_API_KEY", "")
@@ -30,11 +49,13 @@ HUGGINGFACE_TOKEN = os.getenv("HUGGINGFACE_TOKEN", "")
 WAV2LIP_MODEL_PATH = MODELS_DIR / "wav2lip_gan.pth"
 WAV2LIP_MODEL_URL = "https://huggingface.co/spaces/fffiloni/Wav2Lip-HD/resolve/main/checkpoints/wav2lip_gan.pth"
 WAV2LIP_MODEL_NAME = "numz/wav2lip_288x288"
+WAV2LIP_ONNX_PATH = MODELS_DIR / "wav2lip_gan.onnx"  # Exported on first CPU load when USE_ONNX_RUNTIME is set
 
 # Face Detection Configuration
 FACE_DETECTOR = "mediapipe"  # Options: mediapipe, dlib, retinaface
 FACE_DETECTION_CONFIDENCE = 0.5
 MIN_FACE_SIZE = 96
+FACE_REDETECT_INTERVAL = 15  # Frames between face re-detections in lip sync
 
 # Video Processing Configuration
 VIDEO_QUALITY = "high"  # Options: low, medium, high, ultra
@@ -51,6 +72,13 @@ MEL_STEP_SIZE = 16
 # Lip Sync Configuration
 LIP_SYNC_MODEL = "Wav2Lip"  # Options: Wav2Lip, SadTalker
 BATCH_SIZE = 128
+USE_FP16 = True  # Run Wav2Lip in half precision on GPU
+HALF_PRECISION_DTYPE = "auto"  # Options: auto (float16, for the fused cuDNN conv path), bfloat16 (unfused), float16
+USE_CHANNELS_LAST = True  # Keep Wav2Lip weights/activations NHWC on GPU for cuDNN Tensor Core kernels
+COMPILE_MODEL = True  # torch.compile Wav2Lip on GPU (PyTorch >= 2.0)
+TORCH_COMPILE_CACHE_DIR = CACHE_DIR / "torch_compile"  # Inductor artifacts, reused across restarts
+USE_CUDA_GRAPH = True  # Replay Wav2Lip as a captured CUDA graph when it isn't compiled
+CUDNN_BENCHMARK = True  # cuDNN autotuning + TF32 for Wav2Lip on GPU (process-wide torch flags)
 FACE_DETECT_BATCH = 8
 WAV2LIP_RESIZE_FACTOR = 1
 
@@ -59,16 +87,25 @@ DEFAULT_VOICE_ID = "21m00Tcm4TlvDq8ikWAM"  # ElevenLabs default voice
 VOICE_STABILITY = 0.5
 VOICE_SIMILARITY_BOOST = 0.75
 VOICE_MODEL = "eleven_monolingual_v1"
+TTS_MAX_CONCURRENCY = 8  # Concurrent ElevenLabs requests when synthesizing a batch
 
 # GPU Configuration
 USE_GPU = True
 GPU_DEVICE = 0
 ALLOW_CPU_FALLBACK = True
+USE_ONNX_RUNTIME = False  # Run Wav2Lip through ONNX Runtime when on CPU
+USE_HW_VIDEO_DECODE = True  # Decode input video with NVDEC (decord) when available
 
 # Processing Configuration
 MAX_WORKERS = 4
+MAX_CONCURRENT_JOBS = 2  # Video jobs processed at once; the rest wait in the job queue
+TRAINING_PROCESSES = 1  # Warm worker processes running avatar training for the API
 QUEUE_MAX_SIZE = 100
 JOB_TIMEOUT = 3600  # seconds
+BATCH_QUEUE_MAX_SIZE = 10000  # /api/v1/batch jobs waiting to be inserted
+BATCH_WORKERS = 2  # Coroutines draining the batch queue
+BATCH_MAX_JOBS = 64  # Jobs inserted per transaction
+BATCH_MAX_WAIT = 0.005  # seconds a worker waits to fill a batch
 
 # API Configuration
 API_HOST = "0.0.0.0"
@@ -76,6 +113,9 @@ API_PORT = 8000
 API_WORKERS = 4
 API_RELOAD = False
 MAX_UPLOAD_SIZE = 500 * 1024 * 1024  # 500MB
+# Internal nginx location mapped to OUTPUT_DIR; when set, video downloads are
+# handed to nginx (sendfile) via X-Accel-Redirect instead of streamed by Python
+VIDEO_ACCEL_REDIRECT_PREFIX = os.getenv("VIDEO_ACCEL_REDIRECT_PREFIX", "")
 
 # Security Configuration
 API_KEY_HEADER = "X-API-Key"
@@ -91,6 +131,12 @@ LOG_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
 ENABLE_CACHE = True
 CACHE_TTL = 3600  # seconds
 CACHE_MAX_SIZE = 1000
+AVATAR_VIDEO_CACHE_SIZE = 64  # Encoded avatar base clips kept in CACHE_DIR
+TTS_CACHE_SIZE = 64  # Synthesized speech files kept in CACHE_DIR
+AVATARS_RESPONSE_TTL = 30  # seconds /api/v1/avatars is served from memory
+VOICES_RESPONSE_TTL = 60  # seconds /api/v1/voices is served from memory
+VOICES_STALE_IF_ERROR = 600  # seconds clients may reuse a voice list while ElevenLabs errors
+JOBS_RESPONSE_TTL = 5  # seconds /api/v1/jobs is served from memory
 
 # Cleanup Configuration
 AUTO_CLEANUP_TEMP = True
@@ -155,27 +201,34 @@ SENTRY_DSN = os.getenv("SENTRY_DSN", "")
 ENABLE_METRICS = True
 METRICS_PORT = 9090
 
+@lru_cache(maxsize=1)
+def gpu_available():
+    """Check CUDA availability, importing torch on first call only"""
+    try:
+        import torch
+    except ImportError:
+        return None
+    return torch.cuda.is_available()
+
+
 def validate_config():
-    """Validate critical configuration settings"""
+    """Validate critical configuration settings
+
+    Not run on import; API/CLI entry points call this once at startup.
+    """
     errors = []
 
     if not ELEVENLABS_API_KEY:
         errors.append("ELEVENLABS_API_KEY is not set")
 
     if USE_GPU:
-        try:
-            import torch
-            if not torch.cuda.is_available():
-                if not ALLOW_CPU_FALLBACK:
-                    errors.append("GPU enabled but CUDA is not available")
-        except ImportError:
+        cuda_available = gpu_available()
+        if cuda_available is None:
             errors.append("PyTorch is not installed")
+        elif not cuda_available and not ALLOW_CPU_FALLBACK:
+            errors.append("GPU enabled but CUDA is not available")
 
     if errors:
         raise ValueError(f"Configuration errors: {', '.join(errors)}")
 
     return True
-
-# Validate on import
-if __name__ != "__main__":
-    validate_config()
@@ -0,0 +1,54 @@
+"""
+Frame Quality Kernels
+Batched Laplacian-variance sharpness for avatar frame selection, JIT-compiled with Numba when available
+"""
+
+import numpy as np
+
+try:
+    from numba import njit, prange
+except ImportError:
+    njit = None
+
+
+def _batch_laplacian_var_numpy(gray_stack: np.ndarray) -> np.ndarray:
+    """Variance of the 4-neighbour Laplacian for each image in an (N, H, W) uint8 stack"""
+    g = gray_stack.astype(np.int16)
+    laplacian = (
+        g[:, :-2, 1:-1] + g[:, 2:, 1:-1] + g[:, 1:-1, :-2] + g[:, 1:-1, 2:]
+        - 4 * g[:, 1:-1, 1:-1]
+    )
+    return laplacian.var(axis=(1, 2))
+
+
+if njit is not None:
+    @njit(parallel=True, fastmath=True, cache=True)
+    def _batch_laplacian_var_numba(gray_stack):
+        n, h, w = gray_stack.shape
+        out = np.empty(n, dtype=np.float64)
+        count = (h - 2) * (w - 2)
+
+        for i in prange(n):
+            g = gray_stack[i]
+            total = 0.0
+            total_sq = 0.0
+
+            # Single pass: stencil plus running sum and sum of squares
+            for y in range(1, h - 1):
+                for x in range(1, w - 1):
+                    lap = (
+                        np.int32(g[y, x + 1]) + np.int32(g[y, x - 1])
+                        + np.int32(g[y + 1, x]) + np.int32(g[y - 1, x])
+                        - 4 * np.int32(g[y, x])
+                    )
+                    total += lap
+                    total_sq += lap * lap
+
+            mean = total / count
+            out[i] = total_sq / count - mean * mean
+
+        return out
+
+    batch_laplacian_var = _batch_laplacian_var_numba
+else:
+    batch_laplacian_var = _batch_laplacian_var_numpy
@@ -12,11 +12,50 @@ from typing import Dict, List, Tuple, Optional, Any
 from pathlib import Path
 from datetime import datetime
 import hashlib
+from concurrent.futures import ThreadPoolExecutor
 
 from config import settings
+from core._quality_numba import batch_laplacian_var
+
+try:
+    import xxhash
+except ImportError:
+    xxhash = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 logger = logging.getLogger(__name__)
 
+# Face crops are resized to this square before batched quality scoring
+QUALITY_CROP_SIZE = 128
+
+# Metadata serialisation: orjson when installed, stdlib json otherwise
+if orjson is not None:
+    def _dump_json(data: Dict[str, Any]) -> bytes:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY)
+
+    _load_json = orjson.loads
+else:
+    def _dump_json(data: Dict[str, Any]) -> bytes:
+        return json.dumps(data, indent=2).encode('utf-8')
+
+    _load_json = json.loads
+
+
+def write_metadata(metadata_path: Path, metadata: Dict[str, Any]):
+    """Write metadata JSON atomically, so readers never see a partial file"""
+    tmp_path = metadata_path.with_suffix('.json.tmp')
+    tmp_path.write_bytes(_dump_json(metadata))
+    os.replace(tmp_path, metadata_path)
+
+
+# Sampling steps of at least this many frames seek instead of decoding through
+# (roughly one GOP; below that, seeking re-decodes more than it skips)
+SEEK_MIN_STEP = 30
+
 
 class AvatarTrainer:
     """Main class for avatar training operations"""
@@ -24,6 +63,8 @@ class AvatarTrainer:
     def __init__(self):
         self.avatars_dir = settings.AVATARS_DIR
         self.avatars_dir.mkdir(parents=True, exist_ok=True)
+        # avatar_id -> (metadata.json st_mtime_ns, metadata) for list_avatars
+        self._list_cache: Dict[str, Tuple[int, Dict[str, Any]]] = {}
 
     def train_avatar(
         self,
@@ -79,9 +120,7 @@ class AvatarTrainer:
             }
 
             # Save metadata
-            metadata_path = avatar_dir / "metadata.json"
-            with open(metadata_path, 'w') as f:
-                json.dump(avatar_metadata, f, indent=2)
+            write_metadata(avatar_dir / "metadata.json", avatar_metadata)
 
             logger.info(f"Avatar '{name}' trained successfully")
 
@@ -95,7 +134,7 @@ class AvatarTrainer:
         self,
         video_path: str,
         max_frames: Optional[int] = None
-    ) -> Tuple[List[np.ndarray], Dict[str, Any]]:
+    ) -> Tuple[np.ndarray, Dict[str, Any]]:
         """
         Extract frames from video
 
@@ -104,10 +143,12 @@ class AvatarTrainer:
             max_frames: Maximum number of frames to extract
 
         Returns:
-            Tuple of (frames list, video info dict)
+            Tuple of (frames array of shape (N, H, W, 3), video info dict)
         """
         try:
-            video_stream = cv2.VideoCapture(video_path)
+            from core.lip_sync_engine import get_engine
+
+            video_stream = get_engine().open_video(video_path)
 
             fps = video_stream.get(cv2.CAP_PROP_FPS)
             frame_count = int(video_stream.get(cv2.CAP_PROP_FRAME_COUNT))
@@ -127,21 +168,39 @@ class AvatarTrainer:
             max_frames = max_frames or settings.AVATAR_TRAINING_PARAMS["max_frames"]
             step = max(1, frame_count // max_frames)
 
-            frames = []
+            # Sampled frames go straight into one contiguous (n, H, W, 3) buffer,
+            # allocated on the first frame so its shape matches what the decoder returns
+            n = min(max_frames, frame_count // step + 1) if frame_count > 0 else max_frames
+            frames = None
+            live = 0
             frame_idx = 0
+            seek = frame_count > 0 and step >= SEEK_MIN_STEP
+
+            while live < n:
+                if seek:
+                    # Jump to the next sample (decodes from the preceding keyframe)
+                    if frame_idx >= frame_count:
+                        break
+                    video_stream.set(cv2.CAP_PROP_POS_FRAMES, frame_idx)
+                elif frame_idx % step != 0:
+                    # Skip without the colour conversion read() would do
+                    if not video_stream.grab():
+                        break
+                    frame_idx += 1
+                    continue
 
-            while True:
                 ret, frame = video_stream.read()
                 if not ret:
                     break
 
-                if frame_idx % step == 0:
-                    frames.append(frame)
+                if frames is None:
+                    frames = np.empty((n,) + frame.shape, dtype=np.uint8)
+                np.copyto(frames[live], frame)
+                live += 1
 
-                frame_idx += 1
+                frame_idx += step if seek else 1
 
-                if len(frames) >= max_frames:
-                    break
+            frames = frames[:live] if frames is not None else np.empty((0, height, width, 3), dtype=np.uint8)
 
             video_stream.release()
 
@@ -153,14 +212,14 @@ class AvatarTrainer:
 
     def _select_best_frames(
         self,
-        frames: List[np.ndarray],
+        frames: np.ndarray,
         min_frames: Optional[int] = None
     ) -> List[np.ndarray]:
         """
         Select best quality frames based on various metrics
 
         Args:
-            frames: List of frames
+            frames: Frames array of shape (N, H, W, 3)
             min_frames: Minimum number of frames to select
 
         Returns:
@@ -171,10 +230,7 @@ class AvatarTrainer:
             quality_threshold = settings.AVATAR_TRAINING_PARAMS["quality_threshold"]
 
             # Analyze frame quality
-            frame_scores = []
-            for frame in frames:
-                score = self._calculate_frame_quality(frame)
-                frame_scores.append(score)
+            frame_scores = self._calculate_frame_qualities(frames)
 
             # Sort by quality
             sorted_indices = np.argsort(frame_scores)[::-1]
@@ -202,70 +258,78 @@ class AvatarTrainer:
             logger.error(f"Error selecting best frames: {e}")
             raise
 
-    def _calculate_frame_quality(self, frame: np.ndarray) -> float:
+    def _calculate_frame_qualities(self, frames: List[np.ndarray]) -> np.ndarray:
         """
-        Calculate quality score for a frame
+        Calculate quality scores for a batch of frames
+
+        Faces are detected for all frames in one pass, then the largest face
+        of each frame is converted to gray and resized to a common
+        QUALITY_CROP_SIZE square so sharpness, brightness and contrast can be
+        computed for the whole stack at once.
 
         Args:
-            frame: Input frame
+            frames: Input frames
 
         Returns:
-            Quality score (0-1)
+            Quality scores (0-1), one per frame
         """
+        scores = np.zeros(len(frames), dtype=np.float64)
+
         try:
-            # Import face detection
             from core.lip_sync_engine import get_engine
 
-            engine = get_engine()
-
             # Detect faces
-            faces = engine.detect_faces(frame)
+            detections = get_engine().detect_faces_batch(frames)
+
+            crop_size = QUALITY_CROP_SIZE
+            face_min = settings.AVATAR_TRAINING_PARAMS["face_size_min"]
+
+            indices = []
+            size_scores = []
+            crops = []
+            for i, faces in enumerate(detections):
+                if not faces:
+                    continue
 
-            if not faces:
-                return 0.0
+                # Get largest face
+                x, y, w, h = max(faces, key=lambda f: f[2] * f[3])
+                face_region = frames[i][y:y+h, x:x+w]
+                if face_region.size == 0:
+                    continue
 
-            # Get largest face
-            largest_face = max(faces, key=lambda f: f[2] * f[3])
-            x, y, w, h = largest_face
+                gray = cv2.cvtColor(face_region, cv2.COLOR_BGR2GRAY)
+                crops.append(cv2.resize(gray, (crop_size, crop_size), interpolation=cv2.INTER_AREA))
+                size_scores.append(min(w * h / face_min ** 2, 1.0))
+                indices.append(i)
 
-            # Extract face region
-            face_region = frame[y:y+h, x:x+w]
+            if not crops:
+                return scores
 
-            # Calculate quality metrics
-            scores = []
+            gray_stack = np.stack(crops)
 
             # 1. Face size score
-            face_size = w * h
-            size_score = min(
-                face_size / settings.AVATAR_TRAINING_PARAMS["face_size_min"] ** 2,
-                1.0
-            )
-            scores.append(size_score)
+            size_score = np.asarray(size_scores)
 
-            # 2. Sharpness score (Laplacian variance)
-            gray = cv2.cvtColor(face_region, cv2.COLOR_BGR2GRAY)
-            laplacian_var = cv2.Laplacian(gray, cv2.CV_64F).var()
-            sharpness_score = min(laplacian_var / 1000, 1.0)
-            scores.append(sharpness_score)
+            # 2. Sharpness score (variance of the 4-neighbour Laplacian per crop)
+            laplacian_var = batch_laplacian_var(gray_stack)
+            sharpness_score = np.minimum(laplacian_var / 1000, 1.0)
 
             # 3. Brightness score
-            brightness = np.mean(gray)
-            brightness_score = 1.0 - abs(brightness - 127.5) / 127.5
-            scores.append(brightness_score)
+            brightness = gray_stack.mean(axis=(1, 2))
+            brightness_score = 1.0 - np.abs(brightness - 127.5) / 127.5
 
             # 4. Contrast score
-            contrast = gray.std()
-            contrast_score = min(contrast / 64, 1.0)
-            scores.append(contrast_score)
+            contrast = gray_stack.std(axis=(1, 2))
+            contrast_score = np.minimum(contrast / 64, 1.0)
 
             # Calculate overall score
-            overall_score = np.mean(scores)
+            scores[indices] = (size_score + sharpness_score + brightness_score + contrast_score) / 4
 
-            return overall_score
+            return scores
 
         except Exception as e:
             logger.error(f"Error calculating frame quality: {e}")
-            return 0.0
+            return scores
 
     def _save_reference_frames(
         self,
@@ -286,13 +350,19 @@ class AvatarTrainer:
             frames_dir = avatar_dir / "frames"
             frames_dir.mkdir(parents=True, exist_ok=True)
 
-            frame_paths = []
-            for i, frame in enumerate(frames):
-                frame_path = frames_dir / f"frame_{i:04d}.jpg"
-                cv2.imwrite(str(frame_path), frame, [cv2.IMWRITE_JPEG_QUALITY, 95])
-                frame_paths.append(str(frame_path.relative_to(avatar_dir)))
+            frame_paths = [frames_dir / f"frame_{i:04d}.jpg" for i in range(len(frames))]
+
+            # JPEG encoding releases the GIL inside OpenCV, so writes run in parallel
+            def write_frame(frame_path: Path, frame: np.ndarray) -> bool:
+                return cv2.imwrite(str(frame_path), frame, [cv2.IMWRITE_JPEG_QUALITY, 95])
+
+            with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+                written = list(executor.map(write_frame, frame_paths, frames))
+
+            if not all(written):
+                raise IOError(f"Failed to write {written.count(False)} reference frames to {frames_dir}")
 
-            return frame_paths
+            return [str(frame_path.relative_to(avatar_dir)) for frame_path in frame_paths]
 
         except Exception as e:
             logger.error(f"Error saving reference frames: {e}")
@@ -315,10 +385,7 @@ class AvatarTrainer:
             if not metadata_path.exists():
                 raise FileNotFoundError(f"Avatar {avatar_id} not found")
 
-            with open(metadata_path, 'r') as f:
-                metadata = json.load(f)
-
-            return metadata
+            return _load_json(metadata_path.read_bytes())
 
         except Exception as e:
             logger.error(f"Error loading avatar: {e}")
@@ -333,14 +400,28 @@ class AvatarTrainer:
         """
         try:
             avatars = []
+            seen = set()
 
             for avatar_dir in self.avatars_dir.iterdir():
                 if avatar_dir.is_dir():
+                    avatar_id = avatar_dir.name
                     try:
-                        metadata = self.load_avatar(avatar_dir.name)
-                        avatars.append(metadata)
+                        mtime_ns = (avatar_dir / "metadata.json").stat().st_mtime_ns
+                        cached = self._list_cache.get(avatar_id)
+
+                        # Only re-parse metadata that changed since the last listing
+                        if cached is None or cached[0] != mtime_ns:
+                            cached = (mtime_ns, self.load_avatar(avatar_id))
+                            self._list_cache[avatar_id] = cached
+
+                        avatars.append(cached[1])
+                        seen.add(avatar_id)
                     except Exception as e:
-                        logger.warning(f"Error loading avatar {avatar_dir.name}: {e}")
+                        logger.warning(f"Error loading avatar {avatar_id}: {e}")
+
+            # Drop avatars removed from disk behind our back
+            for avatar_id in self._list_cache.keys() - seen:
+                del self._list_cache[avatar_id]
 
             return avatars
 
@@ -364,6 +445,7 @@ class AvatarTrainer:
             # Delete avatar directory
             import shutil
             shutil.rmtree(avatar_dir)
+            self._list_cache.pop(avatar_id, None)
 
             logger.info(f"Avatar {avatar_id} deleted")
 
@@ -418,11 +500,8 @@ class AvatarTrainer:
             metadata.update(metadata_update)
             metadata["updated_at"] = datetime.now().isoformat()
 
-            avatar_dir = self.avatars_dir / avatar_id
-            metadata_path = avatar_dir / "metadata.json"
-
-            with open(metadata_path, 'w') as f:
-                json.dump(metadata, f, indent=2)
+            write_metadata(self.avatars_dir / avatar_id / "metadata.json", metadata)
+            self._list_cache.pop(avatar_id, None)
 
             logger.info(f"Avatar {avatar_id} metadata updated")
 
@@ -443,8 +522,11 @@ class AvatarTrainer:
         """
         timestamp = datetime.now().isoformat()
         hash_input = f"{name}_{timestamp}".encode()
-        avatar_id = hashlib.md5(hash_input).hexdigest()[:12]
-        return avatar_id
+
+        # Not security sensitive; use the fastest available non-MD5 hash
+        if xxhash is not None:
+            return xxhash.xxh3_64(hash_input).hexdigest()[:12]
+        return hashlib.blake2s(hash_input, digest_size=6).hexdigest()
 
 
 # Global trainer instance
@@ -5,6 +5,10 @@ Handles lip synchronization using Wav2Lip model and face detection
 
 import os
 import logging
+import queue
+import subprocess
+import threading
+from functools import lru_cache
 import numpy as np
 import cv2
 import torch
@@ -12,21 +16,162 @@ from typing import Optional, Tuple, List
 from pathlib import Path
 import mediapipe as mp
 from scipy.io import wavfile
-import librosa
+import torchaudio
 
 from config import settings
 
+try:
+    import decord
+except ImportError:
+    decord = None
+
 logger = logging.getLogger(__name__)
 
 
+class DecordCapture:
+    """
+    cv2.VideoCapture-compatible wrapper around a decord VideoReader
+    With a GPU context decord decodes on NVDEC instead of the CPU
+    """
+
+    def __init__(self, reader):
+        self._reader = reader
+        self._pos = 0
+        height, width, _ = reader[0].shape
+        reader.seek(0)
+        self._props = {
+            cv2.CAP_PROP_FPS: reader.get_avg_fps(),
+            cv2.CAP_PROP_FRAME_COUNT: len(reader),
+            cv2.CAP_PROP_FRAME_WIDTH: width,
+            cv2.CAP_PROP_FRAME_HEIGHT: height,
+        }
+
+    def get(self, prop_id: int) -> float:
+        if prop_id == cv2.CAP_PROP_POS_FRAMES:
+            return self._pos
+        return self._props.get(prop_id, 0)
+
+    def set(self, prop_id: int, value: float) -> bool:
+        if prop_id != cv2.CAP_PROP_POS_FRAMES:
+            return False
+        self._pos = int(value)
+        # seek() lands on the nearest keyframe; seek_accurate() decodes up to the exact frame
+        if self._pos < len(self._reader):
+            self._reader.seek_accurate(self._pos)
+        return True
+
+    def grab(self) -> bool:
+        if self._pos >= len(self._reader):
+            return False
+        self._reader.skip_frames(1)
+        self._pos += 1
+        return True
+
+    def read(self) -> Tuple[bool, Optional[np.ndarray]]:
+        if self._pos >= len(self._reader):
+            return False, None
+        rgb = self._reader.next().asnumpy()
+        self._pos += 1
+        return True, cv2.cvtColor(rgb, cv2.COLOR_RGB2BGR)
+
+    def isOpened(self) -> bool:
+        return True
+
+    def release(self):
+        self._reader = None
+
+
+@lru_cache(maxsize=None)
+def probe_h264_encoder(prefer_nvenc: bool) -> str:
+    """Return h264_nvenc if ffmpeg can use it on this machine, else settings.VIDEO_CODEC"""
+    if prefer_nvenc:
+        try:
+            result = subprocess.run(
+                [
+                    'ffmpeg', '-hide_banner', '-loglevel', 'error',
+                    '-f', 'lavfi', '-i', 'color=c=black:s=256x256:d=0.1',
+                    '-c:v', 'h264_nvenc', '-f', 'null', '-'
+                ],
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+                timeout=30
+            )
+            if result.returncode == 0:
+                return 'h264_nvenc'
+        except (OSError, subprocess.TimeoutExpired):
+            pass
+
+    return settings.VIDEO_CODEC
+
+
+class FFmpegWriter:
+    """
+    Encode raw BGR frames and mux an audio track in a single ffmpeg process
+    Exposes the write/release subset of cv2.VideoWriter
+    """
+
+    def __init__(
+        self,
+        output_path: str,
+        audio_path: str,
+        fps: float,
+        size: Tuple[int, int],
+        codec: str
+    ):
+        width, height = size
+        preset = ['-preset', 'p4'] if codec == 'h264_nvenc' else []
+
+        self.output_path = output_path
+        self.proc = subprocess.Popen(
+            [
+                'ffmpeg', '-y', '-hide_banner', '-loglevel', 'error',
+                '-f', 'rawvideo', '-pix_fmt', 'bgr24',
+                '-s', f'{width}x{height}', '-r', str(fps),
+                '-i', '-',
+                '-i', str(audio_path),
+                '-map', '0:v:0', '-map', '1:a:0',
+                '-c:v', codec, *preset,
+                '-b:v', settings.VIDEO_BITRATE,
+                '-pix_fmt', 'yuv420p',
+                '-c:a', 'aac',
+                '-shortest',
+                str(output_path)
+            ],
+            stdin=subprocess.PIPE,
+            stderr=subprocess.PIPE
+        )
+
+    def write(self, frame: np.ndarray):
+        self.proc.stdin.write(memoryview(np.ascontiguousarray(frame)))
+
+    def release(self):
+        if self.proc.stdin and not self.proc.stdin.closed:
+            self.proc.stdin.close()
+        stderr = self.proc.stderr.read()
+        if self.proc.wait() != 0:
+            raise RuntimeError(
+                f"ffmpeg failed writing {self.output_path}: {stderr.decode('utf-8', 'replace').strip()}"
+            )
+
+
 class LipSyncEngine:
     """Main class for lip synchronization operations"""
 
     def __init__(self):
         self.device = self._setup_device()
+        self.use_fp16 = settings.USE_FP16 and self.device.type == 'cuda'
+        self.dtype = self._half_dtype() if self.use_fp16 else torch.float32
         self.model = None
+        self._compiled = False
         self.face_detector = self._setup_face_detector()
+        self._detect_lock = threading.Lock()
+        # Concurrent jobs share the model; CUDA graph replays use static buffers
+        self._infer_lock = threading.Lock()
+        self._rgb_buffer: Optional[np.ndarray] = None
+        self._warm_up_face_detector()
         self.model_loaded = False
+        self._copy_stream = torch.cuda.Stream(device=self.device) if self.device.type == 'cuda' else None
+        self.mel_transform = self._setup_mel_transform()
 
     def _setup_device(self) -> torch.device:
         """Setup compute device (GPU/CPU)"""
@@ -39,6 +184,49 @@ class LipSyncEngine:
 
         return device
 
+    def _half_dtype(self) -> torch.dtype:
+        """Reduced-precision dtype for inference: float16 unless bfloat16 is asked for"""
+        # cuDNN's fused conv + bias + add + ReLU kernels take FP16/FP32 only
+        if settings.HALF_PRECISION_DTYPE == "bfloat16":
+            return torch.bfloat16
+        return torch.float16
+
+    def _alloc_face_strip(self, face_size: int = 96) -> Tuple[np.ndarray, Optional[torch.Tensor]]:
+        """
+        Allocate the face strip that one video's batched face crops are resized into
+
+        Each generate_lip_sync_video call gets its own strip, so concurrent jobs
+        never write into each other's batches. On CUDA the strip is pinned, so a
+        whole batch goes to the device in one async H2D transfer.
+
+        Returns:
+            (face_strip, faces_pinned): the strip as a numpy array and, on CUDA,
+            the pinned tensor backing it (None on CPU)
+        """
+        shape = (settings.BATCH_SIZE, face_size, face_size, 3)
+        if self.device.type != 'cuda':
+            return np.empty(shape, dtype=np.uint8), None
+
+        faces_pinned = torch.empty(shape, dtype=torch.uint8).pin_memory()
+        return faces_pinned.numpy(), faces_pinned
+
+    def _setup_mel_transform(self) -> torchaudio.transforms.MelSpectrogram:
+        """Build the mel filterbank on the compute device, matching librosa's defaults"""
+        params = settings.MEL_SPECTROGRAM_PARAMS
+        return torchaudio.transforms.MelSpectrogram(
+            sample_rate=settings.AUDIO_SAMPLE_RATE,
+            n_fft=params["n_fft"],
+            win_length=params["win_length"],
+            hop_length=params["hop_length"],
+            f_min=params["fmin"],
+            f_max=params["fmax"],
+            n_mels=params["n_mels"],
+            power=2.0,
+            pad_mode="constant",
+            norm="slaney",
+            mel_scale="slaney"
+        ).to(self.device)
+
     def _setup_face_detector(self):
         """Setup face detection model"""
         if settings.FACE_DETECTOR == "mediapipe":
@@ -52,6 +240,38 @@ class LipSyncEngine:
                 min_detection_confidence=settings.FACE_DETECTION_CONFIDENCE
             )
 
+    def _warm_up_face_detector(self, size: int = 256):
+        """Run one detection on a blank frame so MediaPipe allocates its graph up front"""
+        try:
+            self.face_detector.process(np.zeros((size, size, 3), dtype=np.uint8))
+        except Exception as e:
+            logger.warning(f"Face detector warm-up failed: {e}")
+
+    def open_video(self, video_path: str):
+        """
+        Open a video for sequential decoding
+
+        Uses decord with NVDEC when running on GPU, falling back to
+        cv2.VideoCapture. Both return BGR frames through the same interface.
+
+        Args:
+            video_path: Path to video file
+
+        Returns:
+            cv2.VideoCapture-compatible reader
+        """
+        if decord is not None and settings.USE_HW_VIDEO_DECODE and self.device.type == 'cuda':
+            try:
+                reader = decord.VideoReader(
+                    str(video_path),
+                    ctx=decord.gpu(self.device.index or 0)
+                )
+                return DecordCapture(reader)
+            except Exception as e:
+                logger.warning(f"Hardware video decode unavailable, using OpenCV: {e}")
+
+        return cv2.VideoCapture(str(video_path))
+
     def load_model(self, model_path: Optional[str] = None):
         """
         Load Wav2Lip model
@@ -67,7 +287,10 @@ class LipSyncEngine:
                 self._download_model(model_path)
 
             # Import model architecture
-            from models.wav2lip import Wav2Lip
+            from models.wav2lip import Wav2Lip, configure_cuda_backends, fuse_bn
+
+            if settings.CUDNN_BENCHMARK and self.device.type == 'cuda':
+                configure_cuda_backends()
 
             # Load model
             logger.info(f"Loading Wav2Lip model from {model_path}")
@@ -75,8 +298,19 @@ class LipSyncEngine:
 
             self.model = Wav2Lip()
             self.model.load_state_dict(checkpoint["state_dict"])
-            self.model = self.model.to(self.device)
+            # Fold BatchNorm into the convolutions in FP32, before any casting
             self.model.eval()
+            fuse_bn(self.model)
+            self.model = self.model.to(self.device)
+            if settings.USE_CHANNELS_LAST and self.device.type == 'cuda':
+                # NHWC weights; the face strip is NHWC already, so its permuted view matches
+                self.model = self.model.to(memory_format=torch.channels_last)
+            if self.use_fp16:
+                self.model = self.model.to(dtype=self.dtype)
+            if settings.USE_ONNX_RUNTIME and self.device.type == 'cpu':
+                self.model = self._load_onnx_model(self.model)
+            else:
+                self.model = self._compile_model(self.model)
 
             self.model_loaded = True
             logger.info("Wav2Lip model loaded successfully")
@@ -85,6 +319,72 @@ class LipSyncEngine:
             logger.error(f"Error loading model: {e}")
             raise
 
+    def _compile_model(self, model: torch.nn.Module):
+        """Compile the model with torch.compile for fused kernels, falling back to a CUDA graph or eager"""
+        if not settings.COMPILE_MODEL or self.device.type != 'cuda' or not hasattr(torch, 'compile'):
+            return self._capture_graph(model)
+
+        from models.wav2lip import warm_up
+
+        # Keep Inductor's compiled kernels across restarts
+        os.environ.setdefault("TORCHINDUCTOR_CACHE_DIR", str(settings.TORCH_COMPILE_CACHE_DIR))
+
+        try:
+            # reduce-overhead captures CUDA graphs; each input shape is specialized and reused
+            compiled = torch.compile(model, mode='reduce-overhead', fullgraph=True)
+
+            # Compilation is lazy; compile for the full batch shape now, so the
+            # first job doesn't pay for it and failures fall back to eager here
+            with torch.autocast(device_type=self.device.type, dtype=self.dtype, enabled=self.use_fp16):
+                warm_up(compiled, settings.BATCH_SIZE, self.device, self.dtype)
+            logger.info("Wav2Lip model compiled with torch.compile")
+            self._compiled = True
+            return compiled
+        except Exception as e:
+            logger.warning(f"torch.compile unavailable, using eager model: {e}")
+            return self._capture_graph(model)
+
+    def _load_onnx_model(self, model: torch.nn.Module):
+        """Run the model through ONNX Runtime, exporting it on first use, falling back to eager"""
+        from models.wav2lip import OnnxWav2Lip, export_onnx
+
+        try:
+            onnx_path = settings.WAV2LIP_ONNX_PATH
+            if not os.path.exists(onnx_path):
+                logger.info(f"Exporting Wav2Lip to ONNX at {onnx_path}")
+                export_onnx(model, onnx_path)
+
+            session = OnnxWav2Lip(onnx_path, providers=["CPUExecutionProvider"])
+            logger.info("Wav2Lip running on ONNX Runtime")
+            return session
+        except Exception as e:
+            logger.warning(f"ONNX Runtime unavailable, using eager model: {e}")
+            return model
+
+    def _capture_graph(self, model: torch.nn.Module):
+        """Wrap the eager model in a CUDA graph replayed per batch, if enabled"""
+        if self.device.type != 'cuda':
+            return model
+
+        if not settings.USE_CUDA_GRAPH:
+            # Still let cuDNN benchmark the full batch shape up front
+            from models.wav2lip import warm_up
+
+            with torch.autocast(device_type=self.device.type, dtype=self.dtype, enabled=self.use_fp16):
+                warm_up(model, settings.BATCH_SIZE, self.device, self.dtype)
+            return model
+
+        from models.wav2lip import Wav2LipGraphRunner
+
+        try:
+            with torch.autocast(device_type=self.device.type, dtype=self.dtype, enabled=self.use_fp16):
+                runner = Wav2LipGraphRunner(model, settings.BATCH_SIZE, self.dtype)
+            logger.info("Wav2Lip forward captured as a CUDA graph")
+            return runner
+        except Exception as e:
+            logger.warning(f"CUDA graph capture failed, using eager model: {e}")
+            return model
+
     def _download_model(self, model_path: str):
         """Download Wav2Lip model from HuggingFace"""
         try:
@@ -112,11 +412,16 @@ class LipSyncEngine:
             List of face bounding boxes (x, y, w, h)
         """
         try:
-            # Convert to RGB for MediaPipe
-            rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+            # The MediaPipe graph and the RGB scratch buffer are shared, so
+            # detections from concurrent jobs are serialized
+            with self._detect_lock:
+                # Convert to RGB for MediaPipe, reusing the buffer while the frame size is unchanged
+                if self._rgb_buffer is None or self._rgb_buffer.shape != frame.shape:
+                    self._rgb_buffer = np.empty(frame.shape, dtype=np.uint8)
+                rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB, dst=self._rgb_buffer)
 
-            # Detect faces
-            results = self.face_detector.process(rgb_frame)
+                # Detect faces
+                results = self.face_detector.process(rgb_frame)
 
             faces = []
             if results.detections:
@@ -138,11 +443,28 @@ class LipSyncEngine:
             logger.error(f"Error detecting faces: {e}")
             return []
 
+    def detect_faces_batch(
+        self,
+        frames: List[np.ndarray]
+    ) -> List[List[Tuple[int, int, int, int]]]:
+        """
+        Detect faces in a batch of frames with the same detector session
+
+        Args:
+            frames: Input frames (BGR format)
+
+        Returns:
+            List of face bounding box lists, one per frame
+        """
+        detect = self.detect_faces
+        return [detect(frame) for frame in frames]
+
     def extract_face(
         self,
         frame: np.ndarray,
         bbox: Tuple[int, int, int, int],
-        size: int = 96
+        size: int = 96,
+        out: Optional[np.ndarray] = None
     ) -> np.ndarray:
         """
         Extract and resize face from frame
@@ -151,6 +473,7 @@ class LipSyncEngine:
             frame: Input frame
             bbox: Face bounding box (x, y, w, h)
             size: Output size
+            out: Optional contiguous (size, size, 3) uint8 buffer to resize into
 
         Returns:
             Extracted face image
@@ -169,38 +492,42 @@ class LipSyncEngine:
             face = frame[y1:y2, x1:x2]
 
             # Resize to model input size
-            face = cv2.resize(face, (size, size))
-
-            return face
+            return cv2.resize(face, (size, size), dst=out, interpolation=cv2.INTER_AREA)
 
         except Exception as e:
             logger.error(f"Error extracting face: {e}")
             raise
 
-    def get_mel_spectrogram(self, audio_path: str) -> np.ndarray:
+    def get_mel_spectrogram(self, audio_path: str) -> torch.Tensor:
         """
-        Generate mel spectrogram from audio
+        Generate mel spectrogram from audio on the compute device
 
         Args:
             audio_path: Path to audio file
 
         Returns:
-            Mel spectrogram array
+            Mel spectrogram tensor of shape (frames, n_mels)
         """
         try:
-            # Load audio
-            audio, sr = librosa.load(audio_path, sr=settings.AUDIO_SAMPLE_RATE)
+            # Load audio as mono at the model sample rate
+            audio, sr = torchaudio.load(audio_path)
+            audio = audio.mean(dim=0).to(self.device)
+            if sr != settings.AUDIO_SAMPLE_RATE:
+                audio = torchaudio.functional.resample(audio, sr, settings.AUDIO_SAMPLE_RATE)
 
             # Generate mel spectrogram
-            mel = librosa.feature.melspectrogram(
-                y=audio,
-                sr=sr,
-                **settings.MEL_SPECTROGRAM_PARAMS
+            mel = self.mel_transform(audio)
+
+            # Convert to log scale relative to the peak (librosa.power_to_db(ref=np.max))
+            amin = 1e-10
+            mel = torchaudio.functional.amplitude_to_DB(
+                mel,
+                multiplier=10.0,
+                amin=amin,
+                db_multiplier=float(torch.log10(mel.max().clamp(min=amin))),
+                top_db=80.0
             )
 
-            # Convert to log scale
-            mel = librosa.power_to_db(mel, ref=np.max)
-
             return mel.T
 
         except Exception as e:
@@ -233,12 +560,13 @@ class LipSyncEngine:
             logger.info(f"Generating lip sync video: {video_path} + {audio_path}")
 
             # Load video
-            video_stream = cv2.VideoCapture(video_path)
+            video_stream = self.open_video(video_path)
             fps = video_stream.get(cv2.CAP_PROP_FPS)
             frame_count = int(video_stream.get(cv2.CAP_PROP_FRAME_COUNT))
 
             # Get mel spectrogram
             mel = self.get_mel_spectrogram(audio_path)
+            mel_windows = self._get_mel_windows(mel)
 
             # Prepare output video writer
             output_path = Path(output_path)
@@ -247,70 +575,110 @@ class LipSyncEngine:
             frame_h = int(video_stream.get(cv2.CAP_PROP_FRAME_HEIGHT))
             frame_w = int(video_stream.get(cv2.CAP_PROP_FRAME_WIDTH))
 
-            out = cv2.VideoWriter(
+            # Encode and mux audio in one ffmpeg pass, on NVENC when available
+            out = FFmpegWriter(
                 str(output_path),
-                cv2.VideoWriter_fourcc(*'mp4v'),
-                fps,
-                (frame_w, frame_h)
+                audio_path,
+                fps or settings.VIDEO_FPS,
+                (frame_w, frame_h),
+                probe_h264_encoder(self.device.type == 'cuda')
             )
 
-            # Process frames
-            batch_frames = []
+            # Decode and encode on their own threads so they overlap with inference
+            read_q = queue.Queue(maxsize=2 * settings.BATCH_SIZE)
+            write_q = queue.Queue(maxsize=2 * settings.BATCH_SIZE)
+            stop_reading = threading.Event()
+            write_errors = []
+
+            reader = threading.Thread(
+                target=self._read_frames,
+                args=(video_stream, read_q, stop_reading),
+                daemon=True
+            )
+            writer = threading.Thread(
+                target=self._write_frames,
+                args=(out, write_q, write_errors),
+                daemon=True
+            )
+            reader.start()
+            writer.start()
+
+            # Frames in decode order as (frame, bbox); bbox is None for frames without a face
+            # Faces of the current batch are resized straight into face_strip
+            face_strip, faces_pinned = self._alloc_face_strip()
+            pending = []
+            batch_size = 0
             batch_mels = []
             frame_idx = 0
+            cached_bbox = None
+            since_detect = 0
+
+            try:
+                while True:
+                    frame = read_q.get()
+                    if frame is None:
+                        break
+
+                    # Detect face if bbox not provided, re-detecting only every
+                    # FACE_REDETECT_INTERVAL frames while a face is being tracked
+                    if face_bbox is None:
+                        if cached_bbox is None or since_detect >= settings.FACE_REDETECT_INTERVAL:
+                            faces = self.detect_faces(frame)
+                            cached_bbox = faces[0] if faces else None  # Use first detected face
+                            since_detect = 0
+                        since_detect += 1
+
+                        if cached_bbox is None:
+                            logger.warning(f"No face detected in frame {frame_idx}")
+                            pending.append((frame, None))
+                            frame_idx += 1
+                            continue
+                        current_bbox = cached_bbox
+                    else:
+                        current_bbox = face_bbox
+
+                    # Extract face into the next slot of the face strip
+                    self.extract_face(frame, current_bbox, out=face_strip[batch_size])
+
+                    # Get corresponding mel spectrogram chunk, centred on the frame
+                    mel_idx = int(frame_idx * len(mel) / frame_count)
+                    mel_start = min(max(0, mel_idx - settings.MEL_STEP_SIZE // 2), len(mel) - 1)
+                    mel_chunk = mel_windows[mel_start]
+
+                    pending.append((frame, current_bbox))
+                    batch_size += 1
+                    batch_mels.append(mel_chunk)
+
+                    # Process batch
+                    if batch_size >= settings.BATCH_SIZE:
+                        self._flush_batch(
+                            face_strip, faces_pinned, pending, batch_size, batch_mels, write_q
+                        )
+                        pending, batch_size, batch_mels = [], 0, []
 
-            while True:
-                ret, frame = video_stream.read()
-                if not ret:
-                    break
+                    frame_idx += 1
 
-                # Detect face if bbox not provided
-                if face_bbox is None:
-                    faces = self.detect_faces(frame)
-                    if not faces:
-                        logger.warning(f"No face detected in frame {frame_idx}")
-                        out.write(frame)
-                        frame_idx += 1
-                        continue
-                    current_bbox = faces[0]  # Use first detected face
-                else:
-                    current_bbox = face_bbox
-
-                # Extract face
-                face = self.extract_face(frame, current_bbox)
-
-                # Get corresponding mel spectrogram chunk
-                mel_idx = int(frame_idx * len(mel) / frame_count)
-                mel_chunk = self._get_mel_chunk(mel, mel_idx)
-
-                batch_frames.append(face)
-                batch_mels.append(mel_chunk)
-
-                # Process batch
-                if len(batch_frames) >= settings.BATCH_SIZE or frame_idx == frame_count - 1:
-                    synced_faces = self._process_batch(batch_frames, batch_mels)
-
-                    # Reconstruct frames
-                    for i, synced_face in enumerate(synced_faces):
-                        output_frame = frame.copy()
-                        output_frame = self._blend_face(
-                            output_frame,
-                            synced_face,
-                            current_bbox
-                        )
-                        out.write(output_frame)
+                self._flush_batch(face_strip, faces_pinned, pending, batch_size, batch_mels, write_q)
 
-                    batch_frames = []
-                    batch_mels = []
+            finally:
+                stop_reading.set()
+                write_q.put(None)
+                writer.join()
 
-                frame_idx += 1
+                # Unblock the reader if it is waiting on a full queue
+                while reader.is_alive():
+                    try:
+                        read_q.get(timeout=0.1)
+                    except queue.Empty:
+                        pass
+                reader.join()
 
-            # Release resources
-            video_stream.release()
-            out.release()
+                # Release resources
+                video_stream.release()
+                out.release()
 
-            # Add audio to video
-            output_path = self._add_audio_to_video(str(output_path), audio_path)
+            if write_errors:
+                raise write_errors[0]
 
             logger.info(f"Lip sync video generated: {output_path}")
             return str(output_path)
@@ -319,51 +687,133 @@ class LipSyncEngine:
             logger.error(f"Error generating lip sync video: {e}")
             raise
 
-    def _get_mel_chunk(self, mel: np.ndarray, idx: int) -> np.ndarray:
-        """Get mel spectrogram chunk for a frame"""
-        start_idx = max(0, idx - settings.MEL_STEP_SIZE // 2)
-        end_idx = min(len(mel), start_idx + settings.MEL_STEP_SIZE)
+    def _read_frames(
+        self,
+        video_stream,
+        read_q: queue.Queue,
+        stop: threading.Event
+    ):
+        """Reader stage: decode frames into read_q, followed by a None sentinel"""
+        try:
+            while not stop.is_set():
+                ret, frame = video_stream.read()
+                if not ret:
+                    break
+                read_q.put(frame)
+        finally:
+            read_q.put(None)
+
+    def _write_frames(self, out: FFmpegWriter, write_q: queue.Queue, errors: list):
+        """Writer stage: encode frames from write_q until a None sentinel
+
+        Write errors are collected in errors and the queue keeps draining,
+        so the producer never blocks on a dead writer.
+        """
+        while True:
+            frame = write_q.get()
+            if frame is None:
+                break
+            if errors:
+                continue
+            try:
+                out.write(frame)
+            except Exception as e:
+                errors.append(e)
+
+    def _flush_batch(
+        self,
+        face_strip: np.ndarray,
+        faces_pinned: Optional[torch.Tensor],
+        pending: List[Tuple[np.ndarray, Optional[Tuple[int, int, int, int]]]],
+        batch_size: int,
+        batch_mels: List[torch.Tensor],
+        write_q: queue.Queue
+    ):
+        """Run Wav2Lip on the batched faces and queue all pending frames for writing in order"""
+        synced_faces = (
+            iter(self._process_batch(face_strip, faces_pinned, batch_size, batch_mels))
+            if batch_size else iter(())
+        )
+
+        # Reconstruct frames
+        for frame, bbox in pending:
+            if bbox is None:
+                write_q.put(frame)
+                continue
+
+            # Each decoded frame is its own array, so blend in place instead of copying
+            write_q.put(self._blend_face(frame, next(synced_faces), bbox))
+
+    def _get_mel_windows(self, mel: torch.Tensor) -> torch.Tensor:
+        """
+        Build every MEL_STEP_SIZE-long mel window as one strided view
 
-        chunk = mel[start_idx:end_idx]
+        The spectrogram is padded once at the end by repeating its last row,
+        so window i is mel[i:i + MEL_STEP_SIZE] with edge padding past the end.
 
-        # Pad if needed
-        if len(chunk) < settings.MEL_STEP_SIZE:
-            chunk = np.pad(
-                chunk,
-                ((0, settings.MEL_STEP_SIZE - len(chunk)), (0, 0)),
-                mode='edge'
-            )
+        Args:
+            mel: Mel spectrogram of shape (frames, n_mels)
 
-        return chunk
+        Returns:
+            View of shape (frames, MEL_STEP_SIZE, n_mels)
+        """
+        step = settings.MEL_STEP_SIZE
+        mel_padded = torch.cat([mel, mel[-1:].expand(step - 1, -1)])
+        return mel_padded.unfold(0, step, 1).transpose(1, 2)
 
     def _process_batch(
         self,
-        frames: List[np.ndarray],
-        mels: List[np.ndarray]
+        face_strip: np.ndarray,
+        faces_pinned: Optional[torch.Tensor],
+        n: int,
+        mels: List[torch.Tensor]
     ) -> List[np.ndarray]:
-        """Process a batch of frames with Wav2Lip model"""
+        """Process the first n faces of a face strip with Wav2Lip model"""
         try:
             # Prepare inputs
-            frames_tensor = torch.FloatTensor(
-                np.array(frames)
-            ).permute(0, 3, 1, 2).to(self.device)
+            if faces_pinned is not None:
+                # The strip is pinned; copy it on a side stream so the DMA runs asynchronously
+                with torch.cuda.stream(self._copy_stream):
+                    faces = faces_pinned[:n].to(self.device, non_blocking=True)
 
-            mels_tensor = torch.FloatTensor(
-                np.array(mels)
-            ).unsqueeze(1).to(self.device)
+                compute_stream = torch.cuda.current_stream(self.device)
+                compute_stream.wait_stream(self._copy_stream)
+                faces.record_stream(compute_stream)
+            else:
+                # Zero-copy view of the strip on CPU
+                faces = torch.from_numpy(face_strip[:n]).to(self.device)
 
-            # Normalize
-            frames_tensor = frames_tensor / 255.0
+            # Mel chunks are already on the device
+            mels_t = torch.stack(mels).to(self.dtype)
 
-            # Generate lip-synced faces
-            with torch.no_grad():
+            # Normalize
+            frames_tensor = faces.permute(0, 3, 1, 2).to(self.dtype) / 255.0
+            mels_tensor = mels_t.unsqueeze(1)
+
+            # Generate lip-synced faces; inference_mode also skips version
+            # counters and view tracking, but compiled graphs need no_grad
+            # The lock is held until the output is on the host, since a CUDA
+            # graph replay writes into the same static output for every caller
+            grad_mode = torch.no_grad() if self._compiled else torch.inference_mode()
+            with self._infer_lock, grad_mode, torch.autocast(
+                device_type=self.device.type,
+                dtype=self.dtype,
+                enabled=self.use_fp16
+            ):
                 pred = self.model(mels_tensor, frames_tensor)
 
-            # Convert back to numpy
-            pred = pred.cpu().numpy().transpose(0, 2, 3, 1) * 255.0
-            pred = pred.astype(np.uint8)
+                # Scale, quantize and reorder on the device so only uint8 NHWC bytes cross to the host
+                pred = (
+                    pred.mul(255.0)
+                    .clamp_(0, 255)
+                    .to(torch.uint8)
+                    .permute(0, 2, 3, 1)
+                    .contiguous()
+                    .cpu()
+                    .numpy()
+                )
 
-            return [pred[i] for i in range(len(pred))]
+            return list(pred)
 
         except Exception as e:
             logger.error(f"Error processing batch: {e}")
@@ -391,39 +841,6 @@ class LipSyncEngine:
             logger.error(f"Error blending face: {e}")
             return frame
 
-    def _add_audio_to_video(self, video_path: str, audio_path: str) -> str:
-        """Add audio track to video"""
-        try:
-            from moviepy.editor import VideoFileClip, AudioFileClip
-
-            video = VideoFileClip(video_path)
-            audio = AudioFileClip(audio_path)
-
-            # Set audio
-            final_video = video.set_audio(audio)
-
-            # Save with audio
-            output_path = str(Path(video_path).with_stem(
-                f"{Path(video_path).stem}_final"
-            ))
-
-            final_video.write_videofile(
-                output_path,
-                codec=settings.VIDEO_CODEC,
-                audio_codec='aac',
-                fps=video.fps
-            )
-
-            # Cleanup
-            video.close()
-            audio.close()
-
-            return output_path
-
-        except Exception as e:
-            logger.error(f"Error adding audio to video: {e}")
-            return video_path
-
 
 # Global engine instance
 _engine = None
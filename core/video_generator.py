@@ -4,17 +4,28 @@ Main orchestration pipeline for avatar video generation
 """
 
 import os
+import asyncio
+import atexit
 import logging
 import uuid
 import json
-from typing import Optional, Dict, Any, List
+import sqlite3
+from typing import Optional, Dict, Any, List, Tuple
 from pathlib import Path
 from datetime import datetime
 from enum import Enum
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import partial
 import threading
-from queue import Queue
+import shutil
+import subprocess
+import time
+import numpy as np
+from queue import Full, Queue
 
 from config import settings
+from core.voice_synthesis import AudioHandle
 
 logger = logging.getLogger(__name__)
 
@@ -28,14 +39,129 @@ class JobStatus(Enum):
     CANCELLED = "cancelled"
 
 
+# Statuses a job can still leave; jobs in them are kept in memory
+ACTIVE_STATUSES = (JobStatus.PENDING.value, JobStatus.PROCESSING.value)
+
+JOBS_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    job_id TEXT PRIMARY KEY,
+    status TEXT NOT NULL,
+    created_at TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    owner TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_jobs_status_created ON jobs (status, created_at DESC);
+CREATE INDEX IF NOT EXISTS idx_jobs_created ON jobs (created_at DESC);
+"""
+
+
+BOOT_ID_PATH = Path("/proc/sys/kernel/random/boot_id")
+
+
+def _boot_id() -> str:
+    """Identifier of the current boot, or "" where the OS doesn't expose one"""
+    try:
+        return BOOT_ID_PATH.read_text().strip()
+    except OSError:
+        return ""
+
+
+def process_owner() -> str:
+    """Owner tag recorded on jobs: "<boot id>:<pid>" of the process running them"""
+    return f"{_boot_id()}:{os.getpid()}"
+
+
+def owner_alive(owner: Optional[str]) -> bool:
+    """Check whether the process that recorded an owner tag is still running"""
+    if not owner:
+        return False
+    boot_id, _, pid = owner.rpartition(":")
+    if boot_id != _boot_id():
+        return False
+    try:
+        os.kill(int(pid), 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
 class VideoGenerator:
     """Main orchestration class for video generation"""
 
     def __init__(self):
+        # Active (pending/processing) jobs only; every job is persisted in the jobs database
         self.jobs: Dict[str, Dict[str, Any]] = {}
+        # Guards structural changes to jobs and all database access; progress ticks stay lock-free
+        self._jobs_lock = threading.RLock()
+        self._owner = process_owner()
+        self._db = self._open_jobs_db()
+        # One entry per admitted, unfinished job; bounds the backlog at QUEUE_MAX_SIZE
         self.job_queue: Queue = Queue(maxsize=settings.QUEUE_MAX_SIZE)
+        self._futures: Dict[str, Future] = {}
+
+        # (avatar_id, fps) -> encoded one-second base clip in CACHE_DIR, in LRU order
+        self._avatar_video_cache: "OrderedDict[Tuple[str, int], str]" = OrderedDict()
+        self._avatar_video_lock = threading.Lock()
+        settings.CACHE_DIR.mkdir(parents=True, exist_ok=True)
+
         self._init_components()
 
+    @staticmethod
+    def _open_jobs_db() -> sqlite3.Connection:
+        """Open the jobs database in WAL mode, failing jobs whose owning process has died
+
+        Several API workers share the database, so only jobs owned by a process
+        that is no longer running are recovered; live siblings keep theirs.
+        """
+        settings.JOBS_DB_PATH.parent.mkdir(parents=True, exist_ok=True)
+
+        db = sqlite3.connect(
+            str(settings.JOBS_DB_PATH),
+            check_same_thread=False,
+            isolation_level=None
+        )
+        db.execute("PRAGMA journal_mode=WAL")
+        db.execute("PRAGMA synchronous=NORMAL")
+        db.executescript(JOBS_SCHEMA)
+
+        # Databases created before jobs recorded their owner
+        columns = {row[1] for row in db.execute("PRAGMA table_info(jobs)")}
+        if "owner" not in columns:
+            try:
+                db.execute("ALTER TABLE jobs ADD COLUMN owner TEXT")
+            except sqlite3.OperationalError:
+                pass  # Another worker added it first
+
+        # Their worker threads died with the owning process
+        owners = db.execute(
+            "SELECT DISTINCT owner FROM jobs WHERE status IN (?, ?)", ACTIVE_STATUSES
+        ).fetchall()
+        for (owner,) in owners:
+            if owner_alive(owner):
+                continue
+            db.execute(
+                "UPDATE jobs SET status = ?, payload = json_set(payload, '$.status', ?, '$.error', ?) "
+                "WHERE status IN (?, ?) AND owner IS ?",
+                (
+                    JobStatus.FAILED.value, JobStatus.FAILED.value,
+                    "Interrupted by server restart", *ACTIVE_STATUSES, owner
+                )
+            )
+
+        return db
+
+    def _persist_job(self, job: Dict[str, Any]):
+        """Write a job's current state through to the jobs database"""
+        view = self._job_view(job)
+        with self._jobs_lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO jobs (job_id, status, created_at, payload, owner) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (view["job_id"], view["status"], view["created_at"], json.dumps(view), self._owner)
+            )
+
     def _init_components(self):
         """Initialize all components"""
         try:
@@ -47,6 +173,13 @@ class VideoGenerator:
             self.lip_sync_engine = get_engine()
             self.avatar_trainer = get_trainer()
 
+            # Fixed pool so GPU-bound jobs don't all run at once
+            self._executor = ThreadPoolExecutor(
+                max_workers=settings.MAX_CONCURRENT_JOBS,
+                thread_name_prefix="video-job"
+            )
+            atexit.register(partial(self._executor.shutdown, cancel_futures=True))
+
             logger.info("Video generator components initialized")
 
         except Exception as e:
@@ -60,7 +193,8 @@ class VideoGenerator:
         output_path: Optional[str] = None,
         voice_id: Optional[str] = None,
         video_settings: Optional[Dict[str, Any]] = None,
-        job_id: Optional[str] = None
+        job_id: Optional[str] = None,
+        audio_path: Optional[str] = None
     ) -> Dict[str, Any]:
         """
         Generate a lip-synced avatar video from script
@@ -72,46 +206,205 @@ class VideoGenerator:
             voice_id: ElevenLabs voice ID (uses default if not provided)
             video_settings: Additional video settings
             job_id: Optional job ID (generates new if not provided)
+            audio_path: Already synthesized speech for the script (generated if not provided)
 
         Returns:
             Job information dictionary
+
+        Raises:
+            queue.Full: If QUEUE_MAX_SIZE jobs are already queued or running
         """
         try:
             # Generate job ID
-            job_id = job_id or self._generate_job_id()
+            job_id = job_id or self.generate_job_id()
+
+            # Admit the job before creating it, so a full queue rejects it outright
+            self.job_queue.put_nowait(job_id)
 
             # Create job
-            job = {
-                "job_id": job_id,
-                "status": JobStatus.PENDING.value,
-                "script": script,
-                "avatar_id": avatar_id,
-                "voice_id": voice_id,
-                "output_path": output_path,
-                "video_settings": video_settings or {},
-                "created_at": datetime.now().isoformat(),
-                "updated_at": datetime.now().isoformat(),
-                "progress": 0,
-                "error": None,
-            }
-
-            self.jobs[job_id] = job
-
-            # Start processing in background
-            thread = threading.Thread(
-                target=self._process_job,
-                args=(job_id,)
+            job = self._new_job(
+                job_id, script, avatar_id, output_path, voice_id, video_settings, audio_path
             )
-            thread.start()
+
+            with self._jobs_lock:
+                self.jobs[job_id] = job
+                self._persist_job(job)
+
+            self._submit_job(job_id)
 
             logger.info(f"Video generation job created: {job_id}")
 
-            return job
+            return self._job_view(job)
 
         except Exception as e:
             logger.error(f"Error creating video generation job: {e}")
             raise
 
+    @staticmethod
+    def _new_job(
+        job_id: str,
+        script: str,
+        avatar_id: str,
+        output_path: Optional[str] = None,
+        voice_id: Optional[str] = None,
+        video_settings: Optional[Dict[str, Any]] = None,
+        audio_path: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Build a pending job dictionary"""
+        now_ns = time.time_ns()
+        job = {
+            "job_id": job_id,
+            "status": JobStatus.PENDING.value,
+            "script": script,
+            "avatar_id": avatar_id,
+            "voice_id": voice_id,
+            "output_path": output_path,
+            "video_settings": video_settings or {},
+            "created_at": datetime.fromtimestamp(now_ns / 1e9).isoformat(),
+            "updated_at_ns": now_ns,
+            "progress": 0,
+            "error": None,
+        }
+        if audio_path:
+            job["audio_path"] = audio_path
+
+        return job
+
+    def _submit_job(self, job_id: str):
+        """Hand an admitted job to the job pool"""
+        future = self._executor.submit(self._process_job, job_id)
+        self._futures[job_id] = future
+        future.add_done_callback(partial(self._release_job, job_id))
+
+    def insert_many(self, job_specs: List[Dict[str, Any]]) -> List[str]:
+        """
+        Admit and persist a batch of jobs in one database transaction, without starting them
+
+        Jobs that don't fit in the job queue are recorded as failed.
+
+        Args:
+            job_specs: List of job specifications, each optionally carrying a job_id
+
+        Returns:
+            IDs of the admitted jobs, in order
+        """
+        admitted = []
+        rejected = []
+        for spec in job_specs:
+            spec = dict(spec)
+            job = self._new_job(spec.pop("job_id", None) or self.generate_job_id(), **spec)
+            try:
+                self.job_queue.put_nowait(job["job_id"])
+                admitted.append(job)
+            except Full:
+                job["status"] = JobStatus.FAILED.value
+                job["error"] = "Job queue is full"
+                rejected.append(job)
+
+        rows = [
+            (view["job_id"], view["status"], view["created_at"], json.dumps(view), self._owner)
+            for view in map(self._job_view, admitted + rejected)
+        ]
+
+        with self._jobs_lock:
+            self._db.execute("BEGIN")
+            try:
+                self._db.executemany(
+                    "INSERT OR REPLACE INTO jobs (job_id, status, created_at, payload, owner) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    rows
+                )
+                self._db.execute("COMMIT")
+            except Exception:
+                self._db.execute("ROLLBACK")
+                for job in admitted:
+                    self.job_queue.get_nowait()
+                    self.job_queue.task_done()
+                raise
+
+            for job in admitted:
+                self.jobs[job["job_id"]] = job
+
+        if rejected:
+            logger.warning(f"Rejected {len(rejected)} batch jobs: job queue is full")
+
+        return [job["job_id"] for job in admitted]
+
+    def fail_many(self, job_specs: List[Dict[str, Any]], error: str):
+        """
+        Persist jobs that could not be admitted as failed, so their IDs still resolve
+
+        Args:
+            job_specs: List of job specifications, each carrying its job_id
+            error: Error recorded on every job
+        """
+        rows = []
+        for spec in job_specs:
+            spec = dict(spec)
+            job = self._new_job(spec.pop("job_id", None) or self.generate_job_id(), **spec)
+            job["status"] = JobStatus.FAILED.value
+            job["error"] = error
+            view = self._job_view(job)
+            rows.append(
+                (view["job_id"], view["status"], view["created_at"], json.dumps(view), self._owner)
+            )
+
+        with self._jobs_lock:
+            self._db.execute("BEGIN")
+            try:
+                self._db.executemany(
+                    "INSERT OR REPLACE INTO jobs (job_id, status, created_at, payload, owner) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    rows
+                )
+                self._db.execute("COMMIT")
+            except Exception:
+                self._db.execute("ROLLBACK")
+                raise
+
+    async def start_jobs(self, job_ids: List[str]):
+        """
+        Synthesize speech for admitted jobs concurrently, then start them
+
+        Args:
+            job_ids: IDs returned by insert_many
+        """
+        jobs = [job for job in map(self.jobs.get, job_ids) if job is not None]
+
+        # TTS is network-bound, so fire the whole batch at once instead of one per worker
+        try:
+            audio_paths = await self.synthesizer.batch_text_to_speech([
+                {
+                    "text": job["script"],
+                    "output_path": str(settings.TEMP_DIR / f"audio_{uuid.uuid4().hex}.wav"),
+                    "voice_id": job.get("voice_id"),
+                }
+                for job in jobs
+            ])
+        except Exception as e:
+            # Still start every job; each one synthesizes its own speech instead
+            logger.error(f"Error synthesizing batch speech: {e}")
+            audio_paths = [e] * len(jobs)
+
+        for job, audio_path in zip(jobs, audio_paths):
+            # A failed synthesis is retried by the job itself, so its failure is reported on the job
+            if not isinstance(audio_path, BaseException):
+                job["audio_path"] = audio_path
+
+            try:
+                self._submit_job(job["job_id"])
+            except Exception as e:
+                logger.error(f"Error starting batch job {job['job_id']}: {e}")
+                self._update_job_status(job["job_id"], JobStatus.FAILED, error=str(e))
+                self.job_queue.get_nowait()
+                self.job_queue.task_done()
+
+    def _release_job(self, job_id: str, future: Future):
+        """Free the job's queue slot once it finishes or is cancelled"""
+        self._futures.pop(job_id, None)
+        self.job_queue.get_nowait()
+        self.job_queue.task_done()
+
     def _process_job(self, job_id: str):
         """
         Process a video generation job
@@ -120,24 +413,40 @@ class VideoGenerator:
             job_id: Job ID
         """
         try:
-            job = self.jobs[job_id]
+            job = self.jobs.get(job_id)
+            if job is None or job["status"] == JobStatus.CANCELLED.value:
+                return
             self._update_job_status(job_id, JobStatus.PROCESSING, progress=0)
 
             logger.info(f"Processing job {job_id}")
 
-            # Step 1: Generate audio from script (20% progress)
-            logger.info(f"Job {job_id}: Generating audio from script")
-            audio_path = self._generate_audio(
-                job["script"],
-                job.get("voice_id")
-            )
-            self._update_job_status(job_id, JobStatus.PROCESSING, progress=20)
-            job["audio_path"] = audio_path
+            # Encode the avatar's base clip while speech is synthesized; only the
+            # final length-matching remux in step 2 has to wait for the audio
+            with ThreadPoolExecutor(max_workers=1) as prep:
+                base_future = prep.submit(self._get_avatar_base_video, job["avatar_id"])
+
+                # Step 1: Generate audio from script (20% progress), unless it was batch-synthesized
+                try:
+                    if job.get("audio_path"):
+                        audio = AudioHandle(job["audio_path"])
+                    else:
+                        logger.info(f"Job {job_id}: Generating audio from script")
+                        audio = self._generate_audio(
+                            job["script"],
+                            job.get("voice_id")
+                        )
+                except Exception:
+                    base_future.add_done_callback(self._discard_base_video)
+                    raise
+                self._set_progress(job, 20)
+
+                base_path = base_future.result()
+            job["audio_path"] = audio.path
 
             # Step 2: Load avatar (40% progress)
             logger.info(f"Job {job_id}: Loading avatar {job['avatar_id']}")
-            avatar_frame = self._get_avatar_video(job["avatar_id"])
-            self._update_job_status(job_id, JobStatus.PROCESSING, progress=40)
+            avatar_frame = self._get_avatar_video(job["avatar_id"], audio, base_path)
+            self._set_progress(job, 40)
             job["avatar_video_path"] = avatar_frame
 
             # Step 3: Generate lip-synced video (80% progress)
@@ -145,10 +454,10 @@ class VideoGenerator:
             output_path = job.get("output_path") or self._generate_output_path(job_id)
             video_path = self._generate_lip_sync_video(
                 avatar_frame,
-                audio_path,
+                audio,
                 output_path
             )
-            self._update_job_status(job_id, JobStatus.PROCESSING, progress=80)
+            self._set_progress(job, 80)
             job["video_path"] = video_path
 
             # Step 4: Post-processing (if enabled) (90% progress)
@@ -157,7 +466,7 @@ class VideoGenerator:
                 video_path = self._post_process_video(video_path)
                 job["video_path"] = video_path
 
-            self._update_job_status(job_id, JobStatus.PROCESSING, progress=90)
+            self._set_progress(job, 90)
 
             # Step 5: Finalize (100% progress)
             logger.info(f"Job {job_id}: Finalizing")
@@ -165,7 +474,7 @@ class VideoGenerator:
 
             # Cleanup temporary files
             if settings.AUTO_CLEANUP_TEMP:
-                self._cleanup_temp_files(job_id)
+                self._cleanup_temp_files(job)
 
             logger.info(f"Job {job_id} completed successfully")
 
@@ -181,7 +490,7 @@ class VideoGenerator:
         self,
         script: str,
         voice_id: Optional[str] = None
-    ) -> str:
+    ) -> AudioHandle:
         """
         Generate audio from script
 
@@ -190,71 +499,165 @@ class VideoGenerator:
             voice_id: Voice ID
 
         Returns:
-            Path to generated audio file
+            Handle to the generated audio file
         """
         try:
             # Generate temp audio path
             audio_path = settings.TEMP_DIR / f"audio_{uuid.uuid4().hex}.wav"
 
             # Generate speech
-            self.synthesizer.text_to_speech(
+            wav_path = self.synthesizer.text_to_speech(
                 text=script,
                 output_path=str(audio_path),
                 voice_id=voice_id
             )
 
-            return str(audio_path)
+            return AudioHandle(wav_path)
 
         except Exception as e:
             logger.error(f"Error generating audio: {e}")
             raise
 
-    def _get_avatar_video(self, avatar_id: str) -> str:
+    def _get_avatar_video(self, avatar_id: str, audio: AudioHandle, base_path: str) -> str:
         """
         Get or create avatar video
 
         Args:
             avatar_id: Avatar ID
+            audio: Job audio; the video is made as long as it
+            base_path: Job's copy of the avatar base clip from _get_avatar_base_video;
+                removed once the video is made
 
         Returns:
             Path to avatar video
         """
         try:
-            # Load avatar metadata
-            avatar = self.avatar_trainer.load_avatar(avatar_id)
-
-            # Get reference frame
-            frame = self.avatar_trainer.get_avatar_frame(avatar_id)
-
-            # Create a short video from the frame (for lip sync)
+            # Loop the cached clip over the audio duration; stream copy, no re-encode
             video_path = settings.TEMP_DIR / f"avatar_{avatar_id}_{uuid.uuid4().hex}.mp4"
-
-            import cv2
-            height, width = frame.shape[:2]
-            fourcc = cv2.VideoWriter_fourcc(*'mp4v')
-            out = cv2.VideoWriter(
-                str(video_path),
-                fourcc,
-                settings.VIDEO_FPS,
-                (width, height)
+            duration = audio.duration
+
+            subprocess.run(
+                [
+                    'ffmpeg', '-y', '-hide_banner', '-loglevel', 'error',
+                    '-stream_loop', '-1', '-i', base_path,
+                    '-t', f"{duration:.3f}",
+                    '-c', 'copy',
+                    str(video_path)
+                ],
+                check=True,
+                capture_output=True
             )
 
-            # Write same frame multiple times to create video
-            for _ in range(settings.VIDEO_FPS * 2):  # 2 second video
-                out.write(frame)
-
-            out.release()
-
             return str(video_path)
 
         except Exception as e:
             logger.error(f"Error getting avatar video: {e}")
             raise
+        finally:
+            Path(base_path).unlink(missing_ok=True)
+
+    @staticmethod
+    def _discard_base_video(future: Future):
+        """Remove a job's base clip copy once its prefetch finishes, for jobs that failed first"""
+        if not future.cancelled() and future.exception() is None:
+            Path(future.result()).unlink(missing_ok=True)
+
+    def _get_avatar_base_video(self, avatar_id: str) -> str:
+        """
+        Get the encoded one-second still clip for an avatar, encoding it on first use
+
+        The cached clip can be evicted (and unlinked) by another job at any time,
+        so the caller gets its own hard link (or copy, across filesystems) in
+        TEMP_DIR, made while the cache lock is held, and must remove it when done.
+
+        Args:
+            avatar_id: Avatar ID
+
+        Returns:
+            Path to the job's copy of the base clip
+        """
+        fps = settings.VIDEO_FPS
+        key = (avatar_id, fps)
+        video_path = settings.CACHE_DIR / f"avatar_{avatar_id}_{fps}.mp4"
+        job_path = settings.TEMP_DIR / f"avatar_base_{avatar_id}_{uuid.uuid4().hex}.mp4"
+
+        with self._avatar_video_lock:
+            cached = self._avatar_video_cache.get(key)
+            if cached is not None and Path(cached).exists():
+                self._avatar_video_cache.move_to_end(key)
+                self._link_job_copy(Path(cached), job_path)
+                return str(job_path)
+
+            # The path is deterministic, so a clip from a previous run is still valid
+            if not (settings.ENABLE_CACHE and video_path.exists()):
+                self._encode_avatar_base_video(avatar_id, video_path)
+
+            self._link_job_copy(video_path, job_path)
+
+            if settings.ENABLE_CACHE:
+                self._avatar_video_cache[key] = str(video_path)
+                self._avatar_video_cache.move_to_end(key)
+
+                while len(self._avatar_video_cache) > settings.AVATAR_VIDEO_CACHE_SIZE:
+                    _, evicted = self._avatar_video_cache.popitem(last=False)
+                    Path(evicted).unlink(missing_ok=True)
+
+        return str(job_path)
+
+    @staticmethod
+    def _link_job_copy(src: Path, dst: Path):
+        """Hard-link src to dst, copying instead when they are on different filesystems"""
+        try:
+            os.link(src, dst)
+        except OSError:
+            shutil.copyfile(src, dst)
+
+    def _encode_avatar_base_video(self, avatar_id: str, video_path: Path):
+        """
+        Encode the avatar reference frame into a one-second, single-GOP still clip
+
+        Args:
+            avatar_id: Avatar ID
+            video_path: Path to save the clip
+        """
+        # Load avatar metadata
+        avatar = self.avatar_trainer.load_avatar(avatar_id)
+
+        # Get reference frame
+        frame = self.avatar_trainer.get_avatar_frame(avatar_id)
+
+        fps = settings.VIDEO_FPS
+        height, width = frame.shape[:2]
+        tmp_path = video_path.with_name(f"{video_path.stem}.{uuid.uuid4().hex}.tmp.mp4")
+
+        # Pipe the raw BGR frame once and let ffmpeg's loop filter repeat it,
+        # so there is one colour conversion and no intermediate image file
+        try:
+            subprocess.run(
+                [
+                    'ffmpeg', '-y', '-hide_banner', '-loglevel', 'error',
+                    '-f', 'rawvideo', '-pix_fmt', 'bgr24',
+                    '-s', f'{width}x{height}', '-r', str(fps),
+                    '-i', '-',
+                    '-vf', f'format=yuv420p,loop=loop={fps - 1}:size=1:start=0',
+                    '-g', str(fps),
+                    '-c:v', settings.VIDEO_CODEC, '-tune', 'stillimage',
+                    '-preset', 'ultrafast',
+                    '-pix_fmt', 'yuv420p',
+                    str(tmp_path)
+                ],
+                input=memoryview(np.ascontiguousarray(frame)),
+                check=True,
+                capture_output=True
+            )
+            os.replace(tmp_path, video_path)
+        finally:
+            tmp_path.unlink(missing_ok=True)
 
     def _generate_lip_sync_video(
         self,
         video_path: str,
-        audio_path: str,
+        audio: AudioHandle,
         output_path: str
     ) -> str:
         """
@@ -262,7 +665,7 @@ class VideoGenerator:
 
         Args:
             video_path: Path to avatar video
-            audio_path: Path to audio file
+            audio: Job audio
             output_path: Path to save output
 
         Returns:
@@ -271,7 +674,7 @@ class VideoGenerator:
         try:
             return self.lip_sync_engine.generate_lip_sync_video(
                 video_path=video_path,
-                audio_path=audio_path,
+                audio_path=audio.path,
                 output_path=output_path
             )
 
@@ -300,29 +703,25 @@ class VideoGenerator:
             logger.error(f"Error post-processing video: {e}")
             return video_path
 
-    def _cleanup_temp_files(self, job_id: str):
+    def _cleanup_temp_files(self, job: Dict[str, Any]):
         """
         Clean up temporary files for a job
 
         Args:
-            job_id: Job ID
+            job: Job dictionary
         """
         try:
-            job = self.jobs.get(job_id)
-            if not job:
-                return
+            job_id = job["job_id"]
 
-            # Clean up temp audio
-            if "audio_path" in job:
-                audio_path = Path(job["audio_path"])
-                if audio_path.exists() and audio_path.parent == settings.TEMP_DIR:
-                    audio_path.unlink()
+            # Clean up temp audio and temp avatar video
+            names = []
+            for key in ("audio_path", "avatar_video_path"):
+                if key in job:
+                    path = Path(job[key])
+                    if path.parent == settings.TEMP_DIR:
+                        names.append(path.name)
 
-            # Clean up temp avatar video
-            if "avatar_video_path" in job:
-                video_path = Path(job["avatar_video_path"])
-                if video_path.exists() and video_path.parent == settings.TEMP_DIR:
-                    video_path.unlink()
+            unlink_temp_files(names)
 
             logger.info(f"Cleaned up temp files for job {job_id}")
 
@@ -345,18 +744,37 @@ class VideoGenerator:
             progress: Progress percentage (0-100)
             error: Error message if failed
         """
-        if job_id not in self.jobs:
-            return
+        with self._jobs_lock:
+            job = self.jobs.get(job_id)
+            if job is None:
+                return
 
-        job = self.jobs[job_id]
-        job["status"] = status.value
-        job["updated_at"] = datetime.now().isoformat()
+            job["status"] = status.value
+            job["updated_at_ns"] = time.time_ns()  # Formatted only when the job is read
 
-        if progress is not None:
-            job["progress"] = progress
+            if progress is not None:
+                job["progress"] = progress
 
-        if error is not None:
-            job["error"] = error
+            if error is not None:
+                job["error"] = error
+
+            # Status changes are written through; finished jobs then live only in the database
+            self._persist_job(job)
+            if status.value not in ACTIVE_STATUSES:
+                del self.jobs[job_id]
+
+    @staticmethod
+    def _set_progress(job: Dict[str, Any], progress: int):
+        """Record progress on an already-fetched job without touching its status"""
+        job["progress"] = progress
+        job["updated_at_ns"] = time.time_ns()
+
+    @staticmethod
+    def _job_view(job: Dict[str, Any]) -> Dict[str, Any]:
+        """Copy of a job for callers, with updated_at_ns formatted as updated_at"""
+        view = dict(job)
+        view["updated_at"] = datetime.fromtimestamp(view.pop("updated_at_ns") / 1e9).isoformat()
+        return view
 
     def get_job_status(self, job_id: str) -> Optional[Dict[str, Any]]:
         """
@@ -368,7 +786,16 @@ class VideoGenerator:
         Returns:
             Job information dictionary
         """
-        return self.jobs.get(job_id)
+        job = self.jobs.get(job_id)
+        if job is not None:
+            return self._job_view(job)
+
+        with self._jobs_lock:
+            row = self._db.execute(
+                "SELECT payload FROM jobs WHERE job_id = ?", (job_id,)
+            ).fetchone()
+
+        return json.loads(row[0]) if row else None
 
     def list_jobs(
         self,
@@ -385,15 +812,26 @@ class VideoGenerator:
         Returns:
             List of job dictionaries
         """
-        jobs = list(self.jobs.values())
-
-        if status:
-            jobs = [j for j in jobs if j["status"] == status.value]
-
-        # Sort by created_at (newest first)
-        jobs.sort(key=lambda j: j["created_at"], reverse=True)
-
-        return jobs[:limit]
+        # Newest first by created_at (ISO-8601, so it orders lexicographically), from the index
+        with self._jobs_lock:
+            if status:
+                rows = self._db.execute(
+                    "SELECT job_id, payload FROM jobs WHERE status = ? ORDER BY created_at DESC LIMIT ?",
+                    (status.value, limit)
+                ).fetchall()
+            else:
+                rows = self._db.execute(
+                    "SELECT job_id, payload FROM jobs ORDER BY created_at DESC LIMIT ?",
+                    (limit,)
+                ).fetchall()
+
+            # Active jobs have newer progress in memory than in their last persisted row
+            live = {job_id: self.jobs.get(job_id) for job_id, _ in rows}
+
+        return [
+            self._job_view(live[job_id]) if live[job_id] is not None else json.loads(payload)
+            for job_id, payload in rows
+        ]
 
     def cancel_job(self, job_id: str):
         """
@@ -402,9 +840,13 @@ class VideoGenerator:
         Args:
             job_id: Job ID
         """
-        if job_id in self.jobs:
-            job = self.jobs[job_id]
-            if job["status"] in [JobStatus.PENDING.value, JobStatus.PROCESSING.value]:
+        job = self.jobs.get(job_id)
+        if job is not None:
+            if job["status"] in ACTIVE_STATUSES:
+                # Jobs still waiting for a worker are dropped from the pool
+                future = self._futures.get(job_id)
+                if future is not None:
+                    future.cancel()
                 self._update_job_status(job_id, JobStatus.CANCELLED)
                 logger.info(f"Job {job_id} cancelled")
 
@@ -415,13 +857,16 @@ class VideoGenerator:
         Args:
             job_id: Job ID
         """
-        if job_id in self.jobs:
-            self._cleanup_temp_files(job_id)
-            del self.jobs[job_id]
+        job = self.get_job_status(job_id)
+        if job is not None:
+            self._cleanup_temp_files(job)
+            with self._jobs_lock:
+                self.jobs.pop(job_id, None)
+                self._db.execute("DELETE FROM jobs WHERE job_id = ?", (job_id,))
             logger.info(f"Job {job_id} deleted")
 
     @staticmethod
-    def _generate_job_id() -> str:
+    def generate_job_id() -> str:
         """Generate unique job ID"""
         return f"job_{uuid.uuid4().hex[:12]}"
 
@@ -445,16 +890,58 @@ class VideoGenerator:
         Returns:
             List of created job dictionaries
         """
-        created_jobs = []
+        return asyncio.run(self.batch_generate_async(jobs))
 
-        for job_spec in jobs:
-            try:
-                job = self.generate_video(**job_spec)
-                created_jobs.append(job)
-            except Exception as e:
-                logger.error(f"Error creating batch job: {e}")
+    async def batch_generate_async(
+        self,
+        jobs: List[Dict[str, Any]]
+    ) -> List[Dict[str, Any]]:
+        """
+        Generate multiple videos in batch: one transactional insert, then all scripts
+        synthesized concurrently before the jobs start
+
+        Args:
+            jobs: List of job specifications
+
+        Returns:
+            List of created job dictionaries
+        """
+        job_ids = self.insert_many(jobs)
+        await self.start_jobs(job_ids)
+
+        return [
+            self.get_job_status(job_id)
+            for job_id in job_ids
+        ]
+
+
+def unlink_temp_files(names: List[str]):
+    """
+    Unlink files in TEMP_DIR by name, ignoring ones that are already gone
 
-        return created_jobs
+    Uses one directory descriptor and unlinkat, so each removal skips the
+    path walk and the separate exists() check.
+
+    Args:
+        names: File names relative to TEMP_DIR
+    """
+    if not names:
+        return
+
+    if os.unlink not in os.supports_dir_fd:
+        for name in names:
+            (settings.TEMP_DIR / name).unlink(missing_ok=True)
+        return
+
+    dir_fd = os.open(settings.TEMP_DIR, os.O_RDONLY | getattr(os, 'O_DIRECTORY', 0))
+    try:
+        for name in names:
+            try:
+                os.unlink(name, dir_fd=dir_fd)
+            except FileNotFoundError:
+                pass
+    finally:
+        os.close(dir_fd)
 
 
 # Global generator instance
@@ -4,25 +4,107 @@ Handles text-to-speech generation and voice cloning using ElevenLabs API
 """
 
 import os
+import asyncio
 import logging
-from typing import Optional, Dict, Any, List
+import hashlib
+import shutil
+import subprocess
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Optional, Dict, Any, List, Iterable, Tuple, Union
 from pathlib import Path
+import httpx
 import numpy as np
 import soundfile as sf
-from elevenlabs import generate, clone, Voice, VoiceSettings, set_api_key
-from elevenlabs.api import Voices
-from pydub import AudioSegment
+from elevenlabs import clone, set_api_key
 import tempfile
+from fractions import Fraction
+from scipy import signal
 
 from config import settings
 
+try:
+    import soxr
+except ImportError:
+    soxr = None
+
 logger = logging.getLogger(__name__)
 
+# ElevenLabs endpoints, called directly over pooled keep-alive connections
+ELEVENLABS_API_URL = "https://api.elevenlabs.io/v1"
+ELEVENLABS_STREAM_URL = ELEVENLABS_API_URL + "/text-to-speech/{voice_id}/stream"
+
+# Number of locks that TTS cache keys are striped over
+TTS_KEY_LOCK_STRIPES = 64
+
 # Set ElevenLabs API key
 if settings.ELEVENLABS_API_KEY:
     set_api_key(settings.ELEVENLABS_API_KEY)
 
 
+def probe_duration(audio_path: str) -> float:
+    """Read a file's duration from its container header with ffprobe, without decoding"""
+    result = subprocess.run(
+        [
+            'ffprobe', '-v', 'error',
+            '-show_entries', 'format=duration',
+            '-of', 'csv=p=0',
+            audio_path
+        ],
+        check=True,
+        capture_output=True,
+        text=True
+    )
+    return float(result.stdout.strip())
+
+
+@dataclass
+class AudioHandle:
+    """
+    Audio file whose header and samples are read lazily, at most once
+
+    Passed between pipeline steps so each one reuses what earlier steps
+    already read instead of reopening the file.
+    """
+    path: str
+    _duration: Optional[float] = field(default=None, repr=False)
+    _sample_rate: Optional[int] = field(default=None, repr=False)
+    _samples: Optional[np.ndarray] = field(default=None, repr=False)
+
+    def _read_header(self):
+        try:
+            info = sf.info(self.path)
+            self._duration = info.duration
+            self._sample_rate = info.samplerate
+        except RuntimeError:
+            # Formats libsndfile can't parse (e.g. MP3 on older builds)
+            self._duration = probe_duration(self.path)
+
+    @property
+    def duration(self) -> float:
+        """Duration in seconds"""
+        if self._duration is None:
+            self._read_header()
+        return self._duration
+
+    @property
+    def sample_rate(self) -> int:
+        """Native sample rate"""
+        if self._sample_rate is None:
+            self._read_header()
+        if self._sample_rate is None:
+            self._samples, self._sample_rate = sf.read(self.path, dtype='float32')
+        return self._sample_rate
+
+    @property
+    def samples(self) -> np.ndarray:
+        """Decoded float32 samples at the native sample rate"""
+        if self._samples is None:
+            self._samples, self._sample_rate = sf.read(self.path, dtype='float32')
+        return self._samples
+
+
 class VoiceSynthesizer:
     """Main class for voice synthesis operations"""
 
@@ -36,9 +118,23 @@ class VoiceSynthesizer:
         self.stability = settings.VOICE_STABILITY
         self.similarity_boost = settings.VOICE_SIMILARITY_BOOST
 
+        # Persistent client, so TTS and voice listing reuse warm TLS connections
+        self._http = httpx.Client(
+            headers={"xi-api-key": self.api_key},
+            timeout=httpx.Timeout(60.0),
+            limits=httpx.Limits(max_connections=32, max_keepalive_connections=16)
+        )
+
         # Cache for voice metadata
         self._voice_cache: Dict[str, Any] = {}
 
+        # (text hash, voice_id, model, stability, similarity_boost) -> WAV in CACHE_DIR, in LRU order
+        self._tts_cache: "OrderedDict[Tuple, str]" = OrderedDict()
+        self._tts_lock = threading.Lock()
+        # Striped per-key locks, so concurrent requests for one script synthesize it once
+        self._tts_key_locks = [threading.Lock() for _ in range(TTS_KEY_LOCK_STRIPES)]
+        settings.CACHE_DIR.mkdir(parents=True, exist_ok=True)
+
     def text_to_speech(
         self,
         text: str,
@@ -71,35 +167,355 @@ class VoiceSynthesizer:
             similarity_boost = similarity_boost if similarity_boost is not None else self.similarity_boost
             model = model or self.voice_model
 
-            # Generate audio
-            audio = generate(
-                text=text,
-                voice=Voice(
-                    voice_id=voice_id,
-                    settings=VoiceSettings(
-                        stability=stability,
-                        similarity_boost=similarity_boost
-                    )
-                ),
-                model=model
-            )
+            output_path = Path(output_path)
+            output_path.parent.mkdir(parents=True, exist_ok=True)
+
+            # Reuse identical earlier syntheses instead of calling the API again
+            key = self._tts_key(text, voice_id, model, stability, similarity_boost)
+            with self._tts_key_lock(key):
+                cached_path = self._get_cached_speech(key)
+                if cached_path is not None:
+                    return self._link_cached_speech(cached_path, output_path)
+
+                # Generate audio as a stream of encoded chunks
+                with self._http.stream(
+                    "POST",
+                    ELEVENLABS_STREAM_URL.format(voice_id=voice_id),
+                    json=self._tts_payload(text, model, stability, similarity_boost)
+                ) as response:
+                    response.raise_for_status()
+
+                    # Decode straight into a WAV with the correct sample rate for lip sync
+                    wav_path = self._stream_to_wav(response.iter_bytes(), output_path)
+
+                logger.info(f"Audio generated successfully: {wav_path}")
+
+                self._cache_speech(key, wav_path)
+
+            return wav_path
+
+        except Exception as e:
+            logger.error(f"Error generating speech: {e}")
+            raise
+
+    async def text_to_speech_async(
+        self,
+        text: str,
+        output_path: str,
+        voice_id: Optional[str] = None,
+        stability: Optional[float] = None,
+        similarity_boost: Optional[float] = None,
+        model: Optional[str] = None,
+        client: Optional[httpx.AsyncClient] = None,
+    ) -> str:
+        """
+        Convert text to speech with a non-blocking streaming ElevenLabs request
+
+        Args:
+            text: Text to convert to speech
+            output_path: Path to save audio file
+            voice_id: ElevenLabs voice ID (uses default if not provided)
+            stability: Voice stability (0-1)
+            similarity_boost: Voice similarity boost (0-1)
+            model: ElevenLabs model to use
+            client: Shared HTTP client (a temporary one is used if not provided)
+
+        Returns:
+            Path to generated audio file
+        """
+        try:
+            logger.info(f"Generating speech for text: {text[:50]}...")
+
+            # Use defaults if not provided
+            voice_id = voice_id or self.default_voice_id
+            stability = stability if stability is not None else self.stability
+            similarity_boost = similarity_boost if similarity_boost is not None else self.similarity_boost
+            model = model or self.voice_model
 
-            # Save audio to file
             output_path = Path(output_path)
             output_path.parent.mkdir(parents=True, exist_ok=True)
 
-            with open(output_path, 'wb') as f:
-                f.write(audio)
+            key = self._tts_key(text, voice_id, model, stability, similarity_boost)
+            key_lock = self._tts_key_lock(key)
+            await self._acquire_key_lock_async(key_lock)
+
+            try:
+                cached_path = self._get_cached_speech(key)
+                if cached_path is not None:
+                    return await asyncio.to_thread(self._link_cached_speech, cached_path, output_path)
+
+                owns_client = client is None
+                client = client or httpx.AsyncClient(timeout=httpx.Timeout(60.0))
+                wav_path = str(output_path.with_suffix('.wav'))
+                tmp_path = str(output_path.with_suffix('.tmp.wav'))
+                proc = await asyncio.create_subprocess_exec(
+                    *self._wav_ffmpeg_args('pipe:0', tmp_path),
+                    stdin=asyncio.subprocess.PIPE,
+                    stdout=asyncio.subprocess.DEVNULL,
+                    stderr=asyncio.subprocess.PIPE
+                )
+
+                try:
+                    async with client.stream(
+                        "POST",
+                        ELEVENLABS_STREAM_URL.format(voice_id=voice_id),
+                        headers={"xi-api-key": self.api_key},
+                        json=self._tts_payload(text, model, stability, similarity_boost),
+                    ) as response:
+                        response.raise_for_status()
+
+                        # Feed chunks to ffmpeg as they arrive, decoding while the download runs
+                        async for chunk in response.aiter_bytes():
+                            proc.stdin.write(chunk)
+                            await proc.stdin.drain()
+                finally:
+                    proc.stdin.close()
+                    _, stderr = await proc.communicate()
+                    if owns_client:
+                        await client.aclose()
+
+                if proc.returncode != 0:
+                    raise RuntimeError(
+                        f"ffmpeg failed decoding speech: {stderr.decode('utf-8', 'replace').strip()}"
+                    )
+                os.replace(tmp_path, wav_path)
 
-            logger.info(f"Audio generated successfully: {output_path}")
+                logger.info(f"Audio generated successfully: {wav_path}")
+                self._cache_speech(key, wav_path)
+            finally:
+                key_lock.release()
 
-            # Convert to WAV format with correct sample rate for lip sync
-            return self._convert_to_wav(str(output_path))
+            return wav_path
 
         except Exception as e:
             logger.error(f"Error generating speech: {e}")
             raise
 
+    async def batch_text_to_speech(
+        self,
+        requests: List[Dict[str, Any]],
+        max_concurrency: Optional[int] = None
+    ) -> List[Union[str, BaseException]]:
+        """
+        Synthesize several texts concurrently over one HTTP client
+
+        Args:
+            requests: text_to_speech_async keyword arguments, one dict per text
+            max_concurrency: Maximum requests in flight (uses TTS_MAX_CONCURRENCY if not provided)
+
+        Returns:
+            Audio path or raised exception for each request, in order
+        """
+        semaphore = asyncio.Semaphore(max_concurrency or settings.TTS_MAX_CONCURRENCY)
+
+        async with httpx.AsyncClient(timeout=httpx.Timeout(60.0)) as client:
+            async def synthesize(request: Dict[str, Any]) -> str:
+                async with semaphore:
+                    return await self.text_to_speech_async(**request, client=client)
+
+            return await asyncio.gather(
+                *(synthesize(request) for request in requests),
+                return_exceptions=True
+            )
+
+    @staticmethod
+    def _tts_payload(
+        text: str,
+        model: str,
+        stability: float,
+        similarity_boost: float
+    ) -> Dict[str, Any]:
+        """Request body for the ElevenLabs text-to-speech endpoint"""
+        return {
+            "text": text,
+            "model_id": model,
+            "voice_settings": {
+                "stability": stability,
+                "similarity_boost": similarity_boost,
+            },
+        }
+
+    @staticmethod
+    def _tts_key(
+        text: str,
+        voice_id: str,
+        model: str,
+        stability: float,
+        similarity_boost: float
+    ) -> Tuple:
+        """TTS cache key for a fully resolved synthesis request"""
+        return (
+            hashlib.blake2s(text.encode('utf-8')).hexdigest(),
+            voice_id, model, stability, similarity_boost
+        )
+
+    @staticmethod
+    def _tts_cache_path(key: Tuple) -> Path:
+        """Content-addressed CACHE_DIR/tts path for a TTS cache key"""
+        digest = hashlib.sha256("|".join(map(str, key)).encode('utf-8')).hexdigest()
+        return settings.CACHE_DIR / "tts" / f"{digest}.wav"
+
+    def _tts_key_lock(self, key: Tuple) -> threading.Lock:
+        """Lock serializing synthesis of one TTS cache key"""
+        return self._tts_key_locks[hash(key) % len(self._tts_key_locks)]
+
+    @staticmethod
+    async def _acquire_key_lock_async(key_lock: threading.Lock):
+        """
+        Acquire a TTS key lock from a coroutine without blocking the event loop
+
+        The acquire runs in a worker thread that can't be interrupted, so if the
+        awaiting task is cancelled the lock is released as soon as that thread
+        gets it; otherwise the stripe would stay locked for good.
+        """
+        acquire = asyncio.ensure_future(asyncio.to_thread(key_lock.acquire))
+        try:
+            await asyncio.shield(acquire)
+        except asyncio.CancelledError:
+            def release_if_acquired(future: asyncio.Future):
+                if not future.cancelled() and future.exception() is None and future.result():
+                    key_lock.release()
+
+            acquire.add_done_callback(release_if_acquired)
+            raise
+
+    @staticmethod
+    def _fast_copy(src: str, dst: str):
+        """Copy src to dst in the kernel with sendfile, without a userspace buffer"""
+        with open(src, 'rb') as fsrc, open(dst, 'wb') as fdst:
+            size = os.fstat(fsrc.fileno()).st_size
+            offset = 0
+            while offset < size:
+                sent = os.sendfile(fdst.fileno(), fsrc.fileno(), offset, size - offset)
+                if sent == 0:
+                    break
+                offset += sent
+
+    @classmethod
+    def _link_file(cls, src: str, dst: str):
+        """Hard-link src to dst, replacing dst; falls back to a copy across filesystems"""
+        tmp_path = f"{dst}.tmp"
+        try:
+            os.link(src, tmp_path)
+        except FileExistsError:
+            os.remove(tmp_path)
+            os.link(src, tmp_path)
+        except OSError:
+            if hasattr(os, 'sendfile'):
+                cls._fast_copy(src, tmp_path)
+            else:
+                shutil.copyfile(src, tmp_path)
+        os.replace(tmp_path, dst)
+
+    def _link_cached_speech(self, cached_path: str, output_path: Path) -> str:
+        """Materialize a cached WAV at the caller's output path"""
+        wav_path = str(output_path.with_suffix('.wav'))
+        self._link_file(cached_path, wav_path)
+        logger.info(f"Audio served from cache: {wav_path}")
+        return wav_path
+
+    def _get_cached_speech(self, key: Tuple) -> Optional[str]:
+        """
+        Look up a previously synthesized WAV
+
+        Args:
+            key: TTS cache key
+
+        Returns:
+            Path to the cached WAV, or None on a miss
+        """
+        if not settings.ENABLE_CACHE:
+            return None
+
+        with self._tts_lock:
+            cached = self._tts_cache.get(key)
+            if cached is None:
+                # The path is deterministic, so a file from a previous run is still valid
+                cache_path = self._tts_cache_path(key)
+                if cache_path.exists():
+                    cached = str(cache_path)
+                    self._tts_cache[key] = cached
+
+            if cached is None or not Path(cached).exists():
+                self._tts_cache.pop(key, None)
+                return None
+
+            self._tts_cache.move_to_end(key)
+            return cached
+
+    def _cache_speech(self, key: Tuple, wav_path: str):
+        """
+        Store a synthesized WAV in the TTS cache, evicting the least recently used
+
+        Args:
+            key: TTS cache key
+            wav_path: Path to the synthesized WAV
+        """
+        if not settings.ENABLE_CACHE:
+            return
+
+        try:
+            cache_path = self._tts_cache_path(key)
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            self._link_file(wav_path, str(cache_path))
+
+            with self._tts_lock:
+                self._tts_cache[key] = str(cache_path)
+                self._tts_cache.move_to_end(key)
+
+                while len(self._tts_cache) > settings.TTS_CACHE_SIZE:
+                    _, evicted = self._tts_cache.popitem(last=False)
+                    Path(evicted).unlink(missing_ok=True)
+
+        except Exception as e:
+            logger.warning(f"Error caching synthesized speech: {e}")
+
+    @staticmethod
+    def _wav_ffmpeg_args(input_path: str, wav_path: str) -> List[str]:
+        """ffmpeg command decoding any input to a mono WAV at AUDIO_SAMPLE_RATE"""
+        return [
+            'ffmpeg', '-y', '-hide_banner', '-loglevel', 'error',
+            '-i', input_path,
+            '-ac', '1', '-ar', str(settings.AUDIO_SAMPLE_RATE),
+            '-f', 'wav', wav_path
+        ]
+
+    def _stream_to_wav(self, chunks: Iterable[bytes], output_path: Path) -> str:
+        """
+        Decode streamed encoded audio into a WAV through ffmpeg's stdin
+
+        Args:
+            chunks: Encoded audio chunks (MP3 from ElevenLabs)
+            output_path: Requested output path; the WAV is written alongside with a .wav suffix
+
+        Returns:
+            Path to the WAV file
+        """
+        wav_path = str(output_path.with_suffix('.wav'))
+        tmp_path = str(output_path.with_suffix('.tmp.wav'))
+
+        proc = subprocess.Popen(
+            self._wav_ffmpeg_args('pipe:0', tmp_path),
+            stdin=subprocess.PIPE,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE
+        )
+
+        try:
+            for chunk in chunks:
+                proc.stdin.write(chunk)
+        finally:
+            proc.stdin.close()
+            stderr = proc.stderr.read()
+
+        if proc.wait() != 0:
+            raise RuntimeError(
+                f"ffmpeg failed decoding speech: {stderr.decode('utf-8', 'replace').strip()}"
+            )
+
+        os.replace(tmp_path, wav_path)
+        return wav_path
+
     def _convert_to_wav(self, audio_path: str) -> str:
         """
         Convert audio file to WAV format with correct sample rate
@@ -111,16 +527,18 @@ class VoiceSynthesizer:
             Path to converted WAV file
         """
         try:
-            # Load audio
-            audio = AudioSegment.from_file(audio_path)
+            wav_path = str(Path(audio_path).with_suffix('.wav'))
+            tmp_path = str(Path(audio_path).with_suffix('.tmp.wav'))
 
-            # Convert to correct format
-            audio = audio.set_frame_rate(settings.AUDIO_SAMPLE_RATE)
-            audio = audio.set_channels(1)  # Mono
+            # Decode, downmix to mono and resample in a single ffmpeg pass
+            subprocess.run(
+                self._wav_ffmpeg_args(audio_path, tmp_path),
+                check=True,
+                capture_output=True
+            )
 
-            # Save as WAV
-            wav_path = str(Path(audio_path).with_suffix('.wav'))
-            audio.export(wav_path, format='wav')
+            # The input may already be named .wav, so write aside and swap in
+            os.replace(tmp_path, wav_path)
 
             # Remove original if different
             if wav_path != audio_path:
@@ -182,26 +600,27 @@ class VoiceSynthesizer:
             List of voice metadata dictionaries
         """
         try:
-            voices = Voices.from_api()
+            response = self._http.get(f"{ELEVENLABS_API_URL}/voices")
+            response.raise_for_status()
 
             voice_list = []
-            for voice in voices.voices:
+            for voice in response.json().get("voices", []):
                 voice_list.append({
-                    "voice_id": voice.voice_id,
-                    "name": voice.name,
-                    "category": voice.category,
-                    "description": getattr(voice, 'description', ''),
+                    "voice_id": voice["voice_id"],
+                    "name": voice.get("name"),
+                    "category": voice.get("category"),
+                    "description": voice.get("description") or '',
                 })
 
             return voice_list
 
         except Exception as e:
             logger.error(f"Error fetching voices: {e}")
-            return []
+            raise
 
     def process_audio(
         self,
-        audio_path: str,
+        audio_path: Union[str, AudioHandle],
         target_sample_rate: Optional[int] = None,
         normalize: bool = True
     ) -> np.ndarray:
@@ -209,7 +628,7 @@ class VoiceSynthesizer:
         Process audio file for lip sync
 
         Args:
-            audio_path: Path to audio file
+            audio_path: Path or handle of the audio file
             target_sample_rate: Target sample rate (uses config default if not provided)
             normalize: Whether to normalize audio
 
@@ -219,24 +638,32 @@ class VoiceSynthesizer:
         try:
             target_sample_rate = target_sample_rate or settings.AUDIO_SAMPLE_RATE
 
-            # Load audio
-            audio, sr = sf.read(audio_path)
-
-            # Resample if needed
-            if sr != target_sample_rate:
-                from scipy import signal
-                audio = signal.resample(
-                    audio,
-                    int(len(audio) * target_sample_rate / sr)
-                )
+            # Load audio as float32 so downmix, resample and normalize stay in single precision
+            if isinstance(audio_path, AudioHandle):
+                # Copy, since normalization below works in place on the handle's cached samples
+                audio, sr = audio_path.samples.copy(), audio_path.sample_rate
+            else:
+                audio, sr = sf.read(audio_path, dtype='float32')
 
-            # Convert to mono if stereo
-            if len(audio.shape) > 1:
-                audio = audio.mean(axis=1)
+            # Convert to mono if stereo (before resampling, so only one channel is resampled)
+            if audio.ndim > 1:
+                audio = audio.mean(axis=1, dtype=np.float32)
 
-            # Normalize
+            # Resample if needed (polyphase/soxr in float32 rather than a full-signal FFT)
+            if sr != target_sample_rate:
+                if soxr is not None:
+                    audio = soxr.resample(audio, sr, target_sample_rate)
+                else:
+                    ratio = Fraction(target_sample_rate, sr).limit_denominator(1000)
+                    audio = signal.resample_poly(
+                        audio, ratio.numerator, ratio.denominator
+                    ).astype(np.float32, copy=False)
+
+            # Normalize in place
             if normalize:
-                audio = audio / np.max(np.abs(audio))
+                peak = np.abs(audio).max()
+                if peak > 0:
+                    audio *= np.float32(1.0 / peak)
 
             return audio
 
@@ -244,19 +671,21 @@ class VoiceSynthesizer:
             logger.error(f"Error processing audio: {e}")
             raise
 
-    def get_audio_duration(self, audio_path: str) -> float:
+    def get_audio_duration(self, audio_path: Union[str, AudioHandle]) -> float:
         """
         Get duration of audio file in seconds
 
         Args:
-            audio_path: Path to audio file
+            audio_path: Path or handle of the audio file
 
         Returns:
             Duration in seconds
         """
         try:
-            audio = AudioSegment.from_file(audio_path)
-            return len(audio) / 1000.0  # Convert milliseconds to seconds
+            # Read the duration from the header instead of decoding
+            if isinstance(audio_path, AudioHandle):
+                return audio_path.duration
+            return AudioHandle(audio_path).duration
 
         except Exception as e:
             logger.error(f"Error getting audio duration: {e}")
@@ -278,20 +707,23 @@ class VoiceSynthesizer:
             List of paths to audio chunks
         """
         try:
-            audio = AudioSegment.from_file(audio_path)
-            duration_ms = len(audio)
-            chunk_ms = int(chunk_duration * 1000)
-
             chunks = []
-            for i in range(0, duration_ms, chunk_ms):
-                chunk = audio[i:i + chunk_ms]
 
-                # Save chunk
-                chunk_path = str(Path(audio_path).with_stem(
-                    f"{Path(audio_path).stem}_chunk_{i // chunk_ms}"
-                ))
-                chunk.export(chunk_path, format='wav')
-                chunks.append(chunk_path)
+            # Stream one chunk at a time so memory stays bounded by the chunk size
+            with sf.SoundFile(audio_path) as f:
+                sr = f.samplerate
+                chunk_frames = int(chunk_duration * sr)
+
+                for i, start in enumerate(range(0, f.frames, chunk_frames)):
+                    f.seek(start)
+                    data = f.read(chunk_frames, dtype='float32')
+
+                    # Save chunk
+                    chunk_path = str(Path(audio_path).with_stem(
+                        f"{Path(audio_path).stem}_chunk_{i}"
+                    ))
+                    sf.write(chunk_path, data, sr, format='WAV')
+                    chunks.append(chunk_path)
 
             return chunks
 
@@ -311,13 +743,29 @@ class VoiceSynthesizer:
             Path to merged audio file
         """
         try:
-            combined = AudioSegment.empty()
-
-            for audio_path in audio_paths:
-                audio = AudioSegment.from_file(audio_path)
-                combined += audio
-
-            combined.export(output_path, format='wav')
+            # Concatenate with ffmpeg's concat demuxer, without loading samples into Python
+            with tempfile.NamedTemporaryFile(
+                'w', suffix='.txt', dir=settings.TEMP_DIR, delete=False
+            ) as list_file:
+                for audio_path in audio_paths:
+                    escaped = str(Path(audio_path).resolve()).replace("'", "'\\''")
+                    list_file.write(f"file '{escaped}'\n")
+
+            # Matching PCM WAVs are stream-copied; anything else is re-encoded once
+            codec = ['-c', 'copy'] if self._same_wav_format(audio_paths) else ['-c:a', 'pcm_s16le']
+
+            try:
+                subprocess.run(
+                    [
+                        'ffmpeg', '-y', '-hide_banner', '-loglevel', 'error',
+                        '-f', 'concat', '-safe', '0', '-i', list_file.name,
+                        *codec, '-f', 'wav', output_path
+                    ],
+                    check=True,
+                    capture_output=True
+                )
+            finally:
+                os.remove(list_file.name)
 
             return output_path
 
@@ -325,6 +773,19 @@ class VoiceSynthesizer:
             logger.error(f"Error merging audio: {e}")
             raise
 
+    @staticmethod
+    def _same_wav_format(audio_paths: List[str]) -> bool:
+        """Whether all files are WAVs with identical sample rate, channels and sample format"""
+        try:
+            formats = {
+                (info.format, info.samplerate, info.channels, info.subtype)
+                for info in map(sf.info, audio_paths)
+            }
+        except Exception:
+            return False
+
+        return len(formats) == 1 and next(iter(formats))[0] == 'WAV'
+
     def adjust_audio_speed(
         self,
         audio_path: str,
@@ -343,20 +804,35 @@ class VoiceSynthesizer:
             Path to adjusted audio file
         """
         try:
-            audio = AudioSegment.from_file(audio_path)
-
-            # Change speed without changing pitch
-            adjusted = audio._spawn(
-                audio.raw_data,
-                overrides={"frame_rate": int(audio.frame_rate * speed_factor)}
-            )
-            adjusted = adjusted.set_frame_rate(audio.frame_rate)
+            if speed_factor <= 0:
+                raise ValueError(f"speed_factor must be positive, got {speed_factor}")
+
+            # Change speed without changing pitch: ffmpeg's atempo is a WSOLA
+            # time-stretch, limited to 0.5-2.0 per stage, so chain stages as needed
+            stages = []
+            remaining = speed_factor
+            while remaining > 2.0:
+                stages.append(2.0)
+                remaining /= 2.0
+            while remaining < 0.5:
+                stages.append(0.5)
+                remaining /= 0.5
+            stages.append(remaining)
 
             output_path = output_path or str(
                 Path(audio_path).with_stem(f"{Path(audio_path).stem}_adjusted")
             )
 
-            adjusted.export(output_path, format='wav')
+            subprocess.run(
+                [
+                    'ffmpeg', '-y', '-hide_banner', '-loglevel', 'error',
+                    '-i', audio_path,
+                    '-filter:a', ",".join(f"atempo={stage:.6f}" for stage in stages),
+                    '-f', 'wav', output_path
+                ],
+                check=True,
+                capture_output=True
+            )
 
             return output_path
 
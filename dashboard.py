@@ -6,10 +6,25 @@ Visual monitoring and control interface
 import asyncio
 import curses
 import logging
-from datetime import datetime
+import re
+import sys
+import time
 from pathlib import Path
 from typing import Dict, List
 import json
+from collections import deque
+
+import numpy as np
+
+STATUSES = np.array(["idle", "working", "completed"])
+
+# All log-level keywords in one pattern, with their precedence (lower wins)
+LOG_LEVEL_RE = re.compile(r"ERROR|FAILED|WARNING|Completed|SUCCESS")
+LOG_LEVEL_RANK = {"ERROR": 0, "FAILED": 0, "WARNING": 1, "Completed": 2, "SUCCESS": 2}
+
+# First row of each section: header, agent grid, build progress, stats, logs.
+# The last terminal row is always the footer.
+SECTION_ROWS = (0, 4, 26, 34, 42)
 
 
 class Dashboard:
@@ -38,13 +53,66 @@ class Dashboard:
         self.MAGENTA = curses.color_pair(5)
         self.WHITE = curses.color_pair(6)
 
+        # Log line colors by LOG_LEVEL_RANK
+        self._level_colors = (self.RED, self.YELLOW, self.GREEN)
+
         # Hide cursor
         curses.curs_set(0)
 
+        # Box chrome never changes, so build it once
+        self._box_top = "┌" + "─" * 21 + "┐"
+        self._box_bot = "└" + "─" * 21 + "┘"
+        self._box_side = "│"
+
+        # Composed progress bar rows per label, keyed on (current, total, width)
+        self._pb_cache: Dict[str, tuple] = {}
+
+        # Every possible bar string per width, indexed by the filled cell count
+        self._bars: Dict[int, List[str]] = {}
+
+        # Composed box rows per agent id, keyed on (status, tasks_completed)
+        self._agent_render_cache: Dict[int, tuple] = {}
+
+        # Shadow frame of (char, attr) cells; only cells that differ from the
+        # previous frame are sent to the terminal
+        self._size = self.stdscr.getmaxyx()
+        self._frame = self._blank_frame()
+        self._prev_frame = None
+        self._layout_windows()
+
+        # Last (line, attr) pairs of orchestrator.log, tailed incrementally off
+        # the render path
+        self._log_tail = deque(maxlen=10)
+        self._log_fh = None
+        self._log_pos = 0
+        self._log_partial = b""
+
+        # Bumped whenever displayed data changes; render() is skipped while
+        # it matches the version (and clock second) last drawn
+        self._state_version = 0
+        self._rendered_version = -1
+        self._rendered_second = -1
+        self._dirty = None  # asyncio.Event, created inside the running loop
+        self._quit = None
+        self._clock_handle = None
+
+        # Header clock string, reformatted only when the second changes
+        self._last_ts_sec = -1
+        self._last_ts_str = ""
+
+        # One generator for all simulated activity
+        self._rng = np.random.default_rng()
+
         # Agent data
         self.agents = self.initialize_agents()
         self.tasks = self.load_tasks()
 
+        # Aggregates kept in step with agent updates so panels don't rescan agents
+        agents = self.agents.values()
+        self._n_working = sum(1 for a in agents if a["status"] == "working")
+        self._n_completed_any = sum(1 for a in agents if a["tasks_completed"] > 0)
+        self._total_completed = sum(a["tasks_completed"] for a in agents)
+
     def initialize_agents(self) -> Dict[int, Dict]:
         """Initialize agent tracking data"""
         agent_names = [
@@ -85,6 +153,94 @@ class Dashboard:
             # ... more tasks
         }
 
+    def _blank_frame(self) -> List[List[tuple]]:
+        """Frame of blank cells matching the current terminal size"""
+        height, width = self._size
+        return [[(" ", 0)] * width for _ in range(height)]
+
+    def _layout_windows(self):
+        """Create one curses window per dashboard section for the current size"""
+        height, width = self._size
+        bounds = [min(r, height - 1) for r in SECTION_ROWS] + [height - 1, height]
+
+        self._windows = []
+        self._row_window = [None] * height
+        for top, bottom in zip(bounds, bounds[1:]):
+            if bottom <= top:
+                continue
+
+            win = curses.newwin(bottom - top, width, top, 0)
+            self._windows.append(win)
+            for row in range(top, bottom):
+                self._row_window[row] = (win, top)
+
+    def _put(self, row: int, col: int, text: str, attr: int = 0):
+        """Write text into the shadow frame, clipped to the terminal"""
+        height, width = self._size
+        if row < 0 or row >= height or col >= width:
+            return
+
+        cells = self._frame[row]
+        for i, ch in enumerate(text[:width - col]):
+            cells[col + i] = (ch, attr)
+
+    def _put_row(self, row: int, col: int, segments: List[tuple]):
+        """Write consecutive (text, attr) segments, merging neighbours that share an attr"""
+        merged = []
+        for text, attr in segments:
+            if merged and merged[-1][1] == attr:
+                merged[-1][0] += text
+            else:
+                merged.append([text, attr])
+
+        for text, attr in merged:
+            self._put(row, col, text, attr)
+            col += len(text)
+
+    def _flush_frame(self):
+        """Emit the cells that changed since the last frame, one addstr per same-attr run"""
+        height, width = self._size
+        prev = self._prev_frame
+        touched = {}
+
+        for row in range(height):
+            cells = self._frame[row]
+            prev_cells = prev[row] if prev is not None else None
+            if cells == prev_cells:
+                continue
+
+            win, top = self._row_window[row]
+            touched[id(win)] = win
+
+            col = 0
+            while col < width:
+                if prev_cells is not None and cells[col] == prev_cells[col]:
+                    col += 1
+                    continue
+
+                # Extend the run while cells keep changing with the same attribute
+                attr = cells[col][1]
+                start = col
+                while (
+                    col < width
+                    and cells[col][1] == attr
+                    and (prev_cells is None or cells[col] != prev_cells[col])
+                ):
+                    col += 1
+
+                run = "".join(ch for ch, _ in cells[start:col])
+                try:
+                    win.addstr(row - top, start, run, attr)
+                except curses.error:
+                    # Writing a window's bottom-right cell moves the cursor past its end
+                    pass
+
+        # Only sections that changed are copied to the virtual screen
+        for win in touched.values():
+            win.noutrefresh()
+
+        self._prev_frame = self._frame
+
     def draw_header(self):
         """Draw dashboard header"""
         height, width = self.stdscr.getmaxyx()
@@ -94,24 +250,23 @@ class Dashboard:
         subtitle = "║         MULTI-AGENT ORCHESTRATOR - AI AVATAR PLATFORM BUILDER            ║"
         separator = "╚════════════════════════════════════════════════════════════════════════════╝"
 
-        self.stdscr.attron(self.CYAN | curses.A_BOLD)
-        self.stdscr.addstr(0, 0, title[:width-1])
-        self.stdscr.addstr(1, 0, subtitle[:width-1])
-        self.stdscr.addstr(2, 0, separator[:width-1])
-        self.stdscr.attroff(self.CYAN | curses.A_BOLD)
+        self._put(0, 0, title[:width-1], self.CYAN | curses.A_BOLD)
+        self._put(1, 0, subtitle[:width-1], self.CYAN | curses.A_BOLD)
+        self._put(2, 0, separator[:width-1], self.CYAN | curses.A_BOLD)
 
         # Timestamp
-        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        self.stdscr.addstr(1, width - 22, f" {timestamp} ", self.WHITE)
+        sec = int(time.time())
+        if sec != self._last_ts_sec:
+            self._last_ts_sec = sec
+            self._last_ts_str = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(sec))
+        self._put(1, width - 22, f" {self._last_ts_str} ", self.WHITE)
 
     def draw_agent_grid(self, start_row: int):
         """Draw agent status grid"""
         height, width = self.stdscr.getmaxyx()
 
         # Section title
-        self.stdscr.attron(self.YELLOW | curses.A_BOLD)
-        self.stdscr.addstr(start_row, 2, "AGENT STATUS (12 Agents)")
-        self.stdscr.attroff(self.YELLOW | curses.A_BOLD)
+        self._put(start_row, 2, "AGENT STATUS (12 Agents)", self.YELLOW | curses.A_BOLD)
 
         row = start_row + 2
         col = 2
@@ -131,6 +286,20 @@ class Dashboard:
 
     def draw_agent_box(self, row: int, col: int, agent: Dict):
         """Draw individual agent status box"""
+        key = (agent["status"], agent["tasks_completed"])
+        cached = self._agent_render_cache.get(agent["id"])
+        if cached is None or cached[0] != key:
+            cached = (key, self._compose_agent_box(agent))
+            self._agent_render_cache[agent["id"]] = cached
+
+        name_row, tasks_row = cached[1]
+        self._put(row, col, self._box_top, self.WHITE)
+        self._put_row(row + 1, col, name_row)
+        self._put_row(row + 2, col, tasks_row)
+        self._put(row + 3, col, self._box_bot, self.WHITE)
+
+    def _compose_agent_box(self, agent: Dict) -> tuple:
+        """Build the two (text, attr) content rows of an agent box"""
         status = agent["status"]
         name = agent["name"][:20]  # Truncate long names
         tasks = agent["tasks_completed"]
@@ -149,28 +318,42 @@ class Dashboard:
             color = self.RED
             symbol = "✗"
 
-        # Draw box
-        self.stdscr.addstr(row, col, "┌" + "─" * 21 + "┐", self.WHITE)
-        self.stdscr.addstr(row + 1, col, "│", self.WHITE)
-        self.stdscr.addstr(row + 1, col + 1, f"{symbol} {name[:18]}", color | curses.A_BOLD)
-        self.stdscr.addstr(row + 1, col + 22, "│", self.WHITE)
-
-        self.stdscr.addstr(row + 2, col, "│", self.WHITE)
-        self.stdscr.addstr(row + 2, col + 1, f"Tasks: {tasks:2d}  ", self.WHITE)
-        self.stdscr.addstr(row + 2, col + 13, status.upper()[:8], color)
-        self.stdscr.addstr(row + 2, col + 22, "│", self.WHITE)
+        side = self._box_side
+        name_row = [
+            (side, self.WHITE),
+            (f"{symbol} {name[:18]}".ljust(21), color | curses.A_BOLD),
+            (side, self.WHITE),
+        ]
+        tasks_row = [
+            (side + f"Tasks: {tasks:2d}  ".ljust(12), self.WHITE),
+            (status.upper()[:8].ljust(9), color),
+            (side, self.WHITE),
+        ]
 
-        self.stdscr.addstr(row + 3, col, "└" + "─" * 21 + "┘", self.WHITE)
+        return name_row, tasks_row
 
     def draw_progress_bar(self, row: int, col: int, label: str, current: int, total: int, width: int = 40):
         """Draw a progress bar"""
+        key = (current, total, width)
+        cached = self._pb_cache.get(label)
+        if cached is None or cached[0] != key:
+            cached = (key, self._compose_progress_bar(label, current, total, width))
+            self._pb_cache[label] = cached
+
+        self._put_row(row, col, cached[1])
+
+    def _compose_progress_bar(self, label: str, current: int, total: int, width: int) -> List[tuple]:
+        """Build the (text, attr) segments of a progress bar row"""
         if total == 0:
             percentage = 0
         else:
             percentage = (current / total) * 100
 
         filled = int((current / total) * width) if total > 0 else 0
-        bar = "█" * filled + "░" * (width - filled)
+        bars = self._bars.get(width)
+        if bars is None:
+            bars = self._bars[width] = ["█" * f + "░" * (width - f) for f in range(width + 1)]
+        bar = bars[min(max(filled, 0), width)]
 
         # Color based on progress
         if percentage >= 100:
@@ -180,26 +363,25 @@ class Dashboard:
         else:
             color = self.RED
 
-        self.stdscr.addstr(row, col, f"{label:20s}", self.WHITE)
-        self.stdscr.addstr(row, col + 21, "[", self.WHITE)
-        self.stdscr.addstr(row, col + 22, bar, color | curses.A_BOLD)
-        self.stdscr.addstr(row, col + 22 + width, "]", self.WHITE)
-        self.stdscr.addstr(row, col + 24 + width, f"{percentage:5.1f}% ({current}/{total})", self.WHITE)
+        # Only the bar itself differs in colour from the rest of the row
+        return [
+            (f"{label:20s} [", self.WHITE),
+            (bar, color | curses.A_BOLD),
+            (f"] {percentage:5.1f}% ({current}/{total})", self.WHITE),
+        ]
 
     def draw_task_progress(self, start_row: int):
         """Draw task progress section"""
         height, width = self.stdscr.getmaxyx()
 
         # Section title
-        self.stdscr.attron(self.YELLOW | curses.A_BOLD)
-        self.stdscr.addstr(start_row, 2, "BUILD PROGRESS")
-        self.stdscr.attroff(self.YELLOW | curses.A_BOLD)
+        self._put(start_row, 2, "BUILD PROGRESS", self.YELLOW | curses.A_BOLD)
 
         row = start_row + 2
 
         # Overall progress
         total_tasks = 20  # Total tasks from PDF
-        completed_tasks = sum(1 for a in self.agents.values() if a["tasks_completed"] > 0)
+        completed_tasks = self._n_completed_any
 
         self.draw_progress_bar(row, 2, "Overall Progress", completed_tasks, total_tasks)
         row += 2
@@ -221,51 +403,78 @@ class Dashboard:
         height, width = self.stdscr.getmaxyx()
 
         # Section title
-        self.stdscr.attron(self.YELLOW | curses.A_BOLD)
-        self.stdscr.addstr(start_row, 2, "RECENT ACTIVITY")
-        self.stdscr.attroff(self.YELLOW | curses.A_BOLD)
+        self._put(start_row, 2, "RECENT ACTIVITY", self.YELLOW | curses.A_BOLD)
 
         row = start_row + 2
 
-        # Read recent logs
-        log_file = Path("orchestrator.log")
-        if log_file.exists():
-            with open(log_file, 'r') as f:
-                lines = f.readlines()[-10:]  # Last 10 lines
-
-            for i, line in enumerate(lines):
-                if row + i >= height - 2:
-                    break
-
-                # Colorize based on log level
-                if "ERROR" in line or "FAILED" in line:
-                    color = self.RED
-                elif "WARNING" in line:
-                    color = self.YELLOW
-                elif "Completed" in line or "SUCCESS" in line:
-                    color = self.GREEN
-                else:
-                    color = self.WHITE
-
-                # Truncate line to fit
-                display_line = line.strip()[:width - 4]
-                self.stdscr.addstr(row + i, 2, display_line, color)
+        for i, (line, color) in enumerate(self._log_tail):
+            if row + i >= height - 2:
+                break
+
+            # Truncate line to fit
+            self._put(row + i, 2, line[:width - 4], color)
+
+    def _classify_log_line(self, line: str) -> int:
+        """Color attribute for a log line based on its level"""
+        # One scan for every keyword; the most severe match decides the color
+        matches = LOG_LEVEL_RE.findall(line)
+        if not matches:
+            return self.WHITE
+        return self._level_colors[min(LOG_LEVEL_RANK[m] for m in matches)]
+
+    def _read_new_lines(self) -> List[str]:
+        """Return complete lines appended to orchestrator.log since the last call"""
+        if self._log_fh is None:
+            log_file = Path("orchestrator.log")
+            if not log_file.exists():
+                return []
+
+            # Start from the last 4 KB; older history is never displayed
+            self._log_fh = open(log_file, 'rb')
+            size = self._log_fh.seek(0, 2)
+            self._log_pos = max(0, size - 4096)
+            self._log_partial = b""
+            if self._log_pos > 0:
+                # Drop the line cut in half by the seek
+                self._log_fh.seek(self._log_pos)
+                self._log_pos += len(self._log_fh.readline())
+
+        size = self._log_fh.seek(0, 2)
+        if size < self._log_pos:
+            # Log was truncated or rotated in place
+            self._log_pos = 0
+            self._log_partial = b""
+
+        self._log_fh.seek(self._log_pos)
+        data = self._log_fh.read()
+        self._log_pos += len(data)
+
+        *lines, self._log_partial = (self._log_partial + data).split(b"\n")
+        return [line.decode('utf-8', errors='replace') for line in lines]
+
+    async def _refresh_logs(self):
+        """Append newly logged lines to the tail, reading on a worker thread"""
+        lines = await asyncio.to_thread(self._read_new_lines)
+        if lines:
+            # Extend on the event loop so render() never sees the deque mid-update
+            # Lines are stripped and colorized once here, not on every render
+            for line in lines:
+                self._log_tail.append((line.strip(), self._classify_log_line(line)))
+            self._mark_dirty()
 
     def draw_stats(self, start_row: int):
         """Draw statistics panel"""
         height, width = self.stdscr.getmaxyx()
 
         # Section title
-        self.stdscr.attron(self.YELLOW | curses.A_BOLD)
-        self.stdscr.addstr(start_row, 2, "STATISTICS")
-        self.stdscr.attroff(self.YELLOW | curses.A_BOLD)
+        self._put(start_row, 2, "STATISTICS", self.YELLOW | curses.A_BOLD)
 
         row = start_row + 2
 
         # Calculate stats
         total_agents = len(self.agents)
-        working_agents = sum(1 for a in self.agents.values() if a["status"] == "working")
-        total_completed = sum(a["tasks_completed"] for a in self.agents.values())
+        working_agents = self._n_working
+        total_completed = self._total_completed
 
         stats = [
             ("Total Agents:", f"{total_agents}", self.CYAN),
@@ -275,8 +484,10 @@ class Dashboard:
         ]
 
         for label, value, color in stats:
-            self.stdscr.addstr(row, 2, f"{label:20s}", self.WHITE)
-            self.stdscr.addstr(row, 23, value, color | curses.A_BOLD)
+            self._put_row(row, 2, [
+                (f"{label:20s} ", self.WHITE),
+                (value, color | curses.A_BOLD),
+            ])
             row += 1
 
     def draw_footer(self):
@@ -288,9 +499,7 @@ class Dashboard:
         # Commands
         commands = "  [Q]uit  [R]efresh  [L]ogs  [A]gents  [H]elp  "
 
-        self.stdscr.attron(self.CYAN | curses.A_REVERSE)
-        self.stdscr.addstr(footer_row, 0, commands.ljust(width - 1))
-        self.stdscr.attroff(self.CYAN | curses.A_REVERSE)
+        self._put(footer_row, 0, commands.ljust(width - 1), self.CYAN | curses.A_REVERSE)
 
     async def update_data(self):
         """Update agent data from logs/state files"""
@@ -298,20 +507,51 @@ class Dashboard:
             await asyncio.sleep(2)
 
             # Update agent statuses (in real implementation, read from state files)
-            # For demo, simulate some activity
-            import random
+            # For demo, simulate some activity: draw every agent's trigger and
+            # new status in two RNG calls
+            agents = list(self.agents.values())
+            trigger = np.flatnonzero(self._rng.random(len(agents)) < 0.3)
+            new_statuses = STATUSES[self._rng.integers(0, len(STATUSES), trigger.size)]
+
+            for i, new_status in zip(trigger, new_statuses):
+                agent = agents[i]
+                new_status = str(new_status)
+                if new_status != agent["status"]:
+                    self._n_working += (new_status == "working") - (agent["status"] == "working")
+                    agent["status"] = new_status
+                    self._mark_dirty()
+                if new_status == "completed":
+                    if agent["tasks_completed"] == 0:
+                        self._n_completed_any += 1
+                    agent["tasks_completed"] += 1
+                    self._total_completed += 1
+                    self._mark_dirty()
+
+    async def _log_loop(self):
+        """Tail orchestrator.log on its own cadence"""
+        while self.running:
+            await self._refresh_logs()
+            await asyncio.sleep(1)
 
-            for agent in self.agents.values():
-                if random.random() < 0.3:
-                    agent["status"] = random.choice(["idle", "working", "completed"])
-                    if agent["status"] == "completed":
-                        agent["tasks_completed"] += 1
+    def _mark_dirty(self):
+        """Record a visible state change and wake the render loop"""
+        self._state_version += 1
+        if self._dirty is not None:
+            self._dirty.set()
 
     def render(self):
         """Render the dashboard"""
-        self.stdscr.clear()
-
-        height, width = self.stdscr.getmaxyx()
+        # Start over from a cleared screen only when the terminal is resized
+        size = self.stdscr.getmaxyx()
+        if size != self._size:
+            self._size = size
+            self._prev_frame = None
+            self.stdscr.clear()
+            self.stdscr.noutrefresh()
+            self._layout_windows()
+
+        self._frame = self._blank_frame()
+        height, width = self._size
 
         # Draw sections
         self.draw_header()
@@ -321,38 +561,97 @@ class Dashboard:
         self.draw_logs(42)
         self.draw_footer()
 
-        self.stdscr.refresh()
+        self._flush_frame()
+        curses.doupdate()
 
-    async def run(self):
-        """Main dashboard loop"""
-        # Start data update task
-        update_task = asyncio.create_task(self.update_data())
+    def _schedule_clock_tick(self):
+        """Wake the render loop at the start of the next clock second"""
+        loop = asyncio.get_running_loop()
+        self._clock_handle = loop.call_later(1 - time.time() % 1, self._on_clock_tick)
 
-        # Set non-blocking input
-        self.stdscr.nodelay(True)
+    def _on_clock_tick(self):
+        self._dirty.set()
+        self._schedule_clock_tick()
 
-        try:
-            while self.running:
-                # Render dashboard
+    async def _render_loop(self):
+        """Render whenever state changes, and at least once per clock second"""
+        self._schedule_clock_tick()
+        while self.running:
+            # Render only when data, the header clock or the terminal size changed
+            second = int(time.time())
+            if (
+                self._state_version != self._rendered_version
+                or second != self._rendered_second
+                or self.stdscr.getmaxyx() != self._size
+            ):
+                self._rendered_version = self._state_version
+                self._rendered_second = second
                 self.render()
 
-                # Check for key press
-                try:
-                    key = self.stdscr.getch()
+            # Sleep until a state change, key or clock tick sets the event
+            await self._dirty.wait()
+            self._dirty.clear()
+
+    def _on_key(self):
+        """Drain pending keys once stdin becomes readable"""
+        while True:
+            try:
+                key = self.stdscr.getch()
+            except curses.error:
+                break
+            if key == -1:
+                break
+
+            if key == ord('q') or key == ord('Q'):
+                self.running = False
+                self._quit.set()
+                self._dirty.set()
+            elif key == ord('r') or key == ord('R'):
+                # Force a full repaint
+                self._prev_frame = None
+                self._rendered_version = -1
+                self._dirty.set()
+            elif key == curses.KEY_RESIZE:
+                self._dirty.set()
+
+    async def _input_loop(self):
+        """Wake on stdin readiness instead of polling; returns when the user quits"""
+        loop = asyncio.get_running_loop()
+        fd = sys.stdin.fileno()
+        loop.add_reader(fd, self._on_key)
+        try:
+            await self._quit.wait()
+        finally:
+            loop.remove_reader(fd)
 
-                    if key == ord('q') or key == ord('Q'):
-                        self.running = False
-                    elif key == ord('r') or key == ord('R'):
-                        # Refresh
-                        pass
+    async def run(self):
+        """Main dashboard loop"""
+        self._dirty = asyncio.Event()
+        self._quit = asyncio.Event()
 
-                except:
-                    pass
+        # Set non-blocking input
+        self.stdscr.nodelay(True)
+
+        # Data updates, log tailing, rendering and input each run on their own cadence
+        tasks = [
+            asyncio.create_task(self.update_data()),
+            asyncio.create_task(self._log_loop()),
+            asyncio.create_task(self._render_loop()),
+            asyncio.create_task(self._input_loop()),
+        ]
 
-                await asyncio.sleep(0.5)
+        try:
+            await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
 
         finally:
-            update_task.cancel()
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            if self._clock_handle is not None:
+                self._clock_handle.cancel()
+
+            if self._log_fh is not None:
+                self._log_fh.close()
 
 
 def main(stdscr):
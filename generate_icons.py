@@ -1,98 +1,91 @@
 #!/usr/bin/env python3
 """Generate PWA icons with SVG-based graphics"""
 
+from functools import lru_cache
 from PIL import Image, ImageDraw
+import numpy as np
+import math
 import os
 
-def create_gradient_icon(size):
-    """Create an icon with gradient background and geometric shape"""
-    # Create image with transparent background
-    img = Image.new('RGBA', (size, size), (0, 0, 0, 0))
-    draw = ImageDraw.Draw(img)
-
-    # Draw rounded rectangle background with gradient simulation
-    # Using purple to pink gradient colors
-    colors = [
-        (139, 92, 246),   # Primary purple
-        (124, 58, 237),   # Mid purple
-        (219, 39, 119),   # Pink-purple
-        (236, 72, 153)    # Secondary pink
-    ]
-
-    # Create gradient effect by drawing multiple rectangles
-    for i in range(size):
-        ratio = i / size
-        if ratio < 0.33:
-            # Interpolate between color 0 and 1
-            r_ratio = ratio / 0.33
-            r = int(colors[0][0] * (1 - r_ratio) + colors[1][0] * r_ratio)
-            g = int(colors[0][1] * (1 - r_ratio) + colors[1][1] * r_ratio)
-            b = int(colors[0][2] * (1 - r_ratio) + colors[1][2] * r_ratio)
-        elif ratio < 0.66:
-            # Interpolate between color 1 and 2
-            r_ratio = (ratio - 0.33) / 0.33
-            r = int(colors[1][0] * (1 - r_ratio) + colors[2][0] * r_ratio)
-            g = int(colors[1][1] * (1 - r_ratio) + colors[2][1] * r_ratio)
-            b = int(colors[1][2] * (1 - r_ratio) + colors[2][2] * r_ratio)
-        else:
-            # Interpolate between color 2 and 3
-            r_ratio = (ratio - 0.66) / 0.34
-            r = int(colors[2][0] * (1 - r_ratio) + colors[3][0] * r_ratio)
-            g = int(colors[2][1] * (1 - r_ratio) + colors[3][1] * r_ratio)
-            b = int(colors[2][2] * (1 - r_ratio) + colors[3][2] * r_ratio)
-
-        draw.line([(0, i), (size, i)], fill=(r, g, b, 255))
-
-    # Draw rounded corners
+@lru_cache(maxsize=8)
+def _rounded_mask(size):
+    """Rounded-corner alpha (0-255) for an icon of the given size, as a float array"""
     corner_radius = int(size * 0.15)
 
-    # Create a mask for rounded corners
     mask = Image.new('L', (size, size), 0)
     mask_draw = ImageDraw.Draw(mask)
     mask_draw.rounded_rectangle([(0, 0), (size, size)], corner_radius, fill=255)
+    return np.asarray(mask, dtype=np.float32)
 
-    # Apply mask
-    img.putalpha(mask)
-
-    # Draw geometric shape (hexagon/diamond in center)
+@lru_cache(maxsize=8)
+def _hex_points(size):
+    """Vertices of the centered hexagon for an icon of the given size"""
     center = size // 2
     shape_size = size * 0.35
 
-    # Draw hexagon points
     points = []
-    import math
     for i in range(6):
         angle = math.pi / 3 * i - math.pi / 2
         x = center + shape_size * math.cos(angle)
         y = center + shape_size * math.sin(angle)
         points.append((x, y))
+    return tuple(points)
 
-    # Draw hexagon with white fill and opacity
-    overlay = Image.new('RGBA', (size, size), (0, 0, 0, 0))
+@lru_cache(maxsize=8)
+def _hex_alpha(size):
+    """Coverage (0-1) of the white hexagon overlay, as a float array"""
+    overlay = Image.new('L', (size, size), 0)
     overlay_draw = ImageDraw.Draw(overlay)
-    overlay_draw.polygon(points, fill=(255, 255, 255, 230))
+    overlay_draw.polygon(_hex_points(size), fill=230)
+    return np.asarray(overlay, dtype=np.float32) / 255.0
 
-    # Composite the overlay
-    img = Image.alpha_composite(img, overlay)
+def create_gradient_icon(size):
+    """Create an icon with gradient background and geometric shape"""
+    # Draw rounded rectangle background with gradient simulation
+    # Using purple to pink gradient colors
+    colors = np.array([
+        (139, 92, 246),   # Primary purple
+        (124, 58, 237),   # Mid purple
+        (219, 39, 119),   # Pink-purple
+        (236, 72, 153)    # Secondary pink
+    ], dtype=np.float64)
+
+    # Piecewise-linear vertical gradient, one row colour per scanline
+    ratios = np.arange(size) / size
+    stops = [0.0, 0.33, 0.66, 1.0]
+    rows = np.stack(
+        [np.interp(ratios, stops, colors[:, channel]) for channel in range(3)],
+        axis=-1
+    ).astype(np.uint8)
 
-    return img
+    # Blend the white hexagon over the gradient ("over" operator; the hexagon
+    # lies entirely inside the opaque part of the rounded mask)
+    hex_alpha = _hex_alpha(size)
+    mask = _rounded_mask(size)
+    a = hex_alpha[..., None]
+
+    pixels = np.empty((size, size, 4), dtype=np.uint8)
+    pixels[..., :3] = rows[:, None, :] * (1 - a) + 255 * a + 0.5
+    pixels[..., 3] = hex_alpha * 255 + mask * (1 - hex_alpha) + 0.5
+
+    return Image.fromarray(pixels, 'RGBA')
 
 def main():
     """Generate icon files"""
     os.chdir('/Users/lsd/msclaude/projects/heygen clone/public')
 
-    # Generate 192x192 icon
-    icon_192 = create_gradient_icon(192)
-    icon_192.save('icon-192.png', 'PNG')
-    print('✓ Created icon-192.png')
-
-    # Generate 512x512 icon
+    # Render the largest icon once; the smaller ones are downscaled from it
     icon_512 = create_gradient_icon(512)
     icon_512.save('icon-512.png', 'PNG')
     print('✓ Created icon-512.png')
 
+    # Generate 192x192 icon
+    icon_192 = icon_512.resize((192, 192), Image.LANCZOS)
+    icon_192.save('icon-192.png', 'PNG')
+    print('✓ Created icon-192.png')
+
     # Also create apple-touch-icon (180x180)
-    icon_180 = create_gradient_icon(180)
+    icon_180 = icon_512.resize((180, 180), Image.LANCZOS)
     icon_180.save('apple-touch-icon.png', 'PNG')
     print('✓ Created apple-touch-icon.png')
 
@@ -4,23 +4,104 @@ Ensures all agents stay running and automatically restarts failed agents
 """
 
 import asyncio
+import asyncio.subprocess
+import ctypes
+import ctypes.util
+import heapq
 import logging
+import os
+import random
+import struct
 import subprocess
 import signal
 import sys
-from datetime import datetime, timedelta
+import time
+from collections import OrderedDict
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple, Union
 from dataclasses import dataclass, field
 
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+try:
+    import pynvml
+except ImportError:
+    pynvml = None
+
+# ASCII sigils for log lines (alerts already carry their [LEVEL])
+OK = "[OK]"
+WARN = "[WARN]"
+FAIL = "[FAIL]"
+BEAT = "[HB]"
+RESTART = "[RESTART]"
+START = "[START]"
+STOP = "[STOP]"
+STATS = "[STATS]"
+
+# inotify(7) via libc; unavailable off Linux, where log mtimes are polled instead
+IN_MODIFY = 0x00000002
+IN_CREATE = 0x00000100
+IN_CLOEXEC = 0o2000000
+IN_NONBLOCK = 0o4000
+INOTIFY_EVENT = struct.Struct("iIII")
+
+try:
+    _libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+    _inotify_init1 = _libc.inotify_init1
+    _inotify_add_watch = _libc.inotify_add_watch
+    _inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+except (OSError, AttributeError):
+    _inotify_init1 = None
+
+
+class SpawnedProcess:
+    """asyncio.subprocess.Process stand-in for a child started with os.posix_spawn
+
+    Exit is noticed through a pidfd registered with the event loop, so waiting
+    costs no thread and no polling.
+    """
+
+    def __init__(self, pid: int):
+        self.pid = pid
+        self.returncode: Optional[int] = None
+        self._loop = asyncio.get_running_loop()
+        self._exited = self._loop.create_future()
+        self._pidfd = os.pidfd_open(pid)
+        self._loop.add_reader(self._pidfd, self._on_exit)
+
+    def _on_exit(self):
+        """Reap the child once its pidfd becomes readable"""
+        self._loop.remove_reader(self._pidfd)
+        os.close(self._pidfd)
+        _, status = os.waitpid(self.pid, 0)
+        self.returncode = os.waitstatus_to_exitcode(status)
+        self._exited.set_result(self.returncode)
+
+    async def wait(self) -> int:
+        return await asyncio.shield(self._exited)
+
+    def send_signal(self, sig: int):
+        if self.returncode is None:
+            os.kill(self.pid, sig)
+
+    def terminate(self):
+        self.send_signal(signal.SIGTERM)
+
+    def kill(self):
+        self.send_signal(signal.SIGKILL)
+
 
 @dataclass
 class AgentProcess:
     """Tracks an agent process"""
     id: int
     name: str
-    process: Optional[subprocess.Popen] = None
-    last_heartbeat: datetime = field(default_factory=datetime.now)
+    process: Optional[Union[asyncio.subprocess.Process, SpawnedProcess]] = None
+    watcher: Optional[asyncio.Task] = None
+    last_heartbeat: float = field(default_factory=time.time)  # epoch seconds, comparable with log mtimes
     restart_count: int = 0
     max_restarts: int = 5
     is_healthy: bool = True
@@ -38,6 +119,11 @@ class KeepAliveMonitor:
     def __init__(self, check_interval: int = 10):
         self.check_interval = check_interval
         self.agents: Dict[int, AgentProcess] = {}
+        self._log_names: Dict[int, str] = {}
+        self._agent_by_log: Dict[str, int] = {}
+        self._inotify_fd: Optional[int] = None
+        # (next check due, agent_id), so each tick only looks at agents that are due
+        self._check_heap: List[Tuple[float, int]] = []
         self.running = False
         self.setup_logging()
 
@@ -53,35 +139,125 @@ class KeepAliveMonitor:
         )
         self.logger = logging.getLogger('KeepAliveMonitor')
 
-    def register_agent(self, agent_id: int, agent_name: str, process: subprocess.Popen):
-        """Register an agent for monitoring"""
-        self.agents[agent_id] = AgentProcess(
+    def register_agent(
+        self,
+        agent_id: int,
+        agent_name: str,
+        process: Union[asyncio.subprocess.Process, SpawnedProcess]
+    ):
+        """Register an agent for monitoring (must be called from the running loop)"""
+        agent = AgentProcess(
             id=agent_id,
             name=agent_name,
             process=process
         )
-        self.logger.info(f"✓ Registered {agent_name} for monitoring (PID: {process.pid})")
+        self.agents[agent_id] = agent
+        self._log_names[agent_id] = f"{agent_name}.log"
+        self._agent_by_log[f"{agent_name}.log"] = agent_id
+        agent.watcher = asyncio.create_task(self._watch(agent))
+        heapq.heappush(self._check_heap, (self._next_check_time(time.time()), agent_id))
+        self.logger.info(f"{OK} Registered {agent_name} for monitoring (PID: {process.pid})")
+
+    def _next_check_time(self, now: float) -> float:
+        """Next health check deadline, jittered so agents don't all fall due together"""
+        return now + self.check_interval * random.uniform(1.0, 1.1)
+
+    async def _watch(self, agent: AgentProcess):
+        """Wait for the agent's process to exit and restart it"""
+        returncode = await agent.process.wait()
+        if not self.running:
+            return
+
+        self.logger.warning(f"{WARN} {agent.name} process exited with code {returncode}, restarting...")
+        await self.restart_agent(agent)
+
+    def _start_log_watch(self) -> bool:
+        """Watch logs/ with inotify so writes update heartbeats as they happen"""
+        if _inotify_init1 is None:
+            return False
+
+        fd = _inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if fd < 0:
+            return False
 
-    async def check_process_health(self, agent: AgentProcess) -> bool:
-        """Check if an agent process is healthy"""
+        if _inotify_add_watch(fd, b"logs", IN_MODIFY | IN_CREATE) < 0:
+            os.close(fd)
+            return False
+
+        self._inotify_fd = fd
+        asyncio.get_running_loop().add_reader(fd, self._on_log_events)
+        return True
+
+    def _stop_log_watch(self):
+        """Remove the inotify watch, if any"""
+        if self._inotify_fd is None:
+            return
+
+        asyncio.get_running_loop().remove_reader(self._inotify_fd)
+        os.close(self._inotify_fd)
+        self._inotify_fd = None
+
+    def _on_log_events(self):
+        """Record a heartbeat for every agent whose log was written"""
+        now = time.time()
+        while True:
+            try:
+                data = os.read(self._inotify_fd, 65536)
+            except BlockingIOError:
+                break
+            if not data:
+                break
+
+            offset = 0
+            while offset < len(data):
+                _, _, _, name_len = INOTIFY_EVENT.unpack_from(data, offset)
+                offset += INOTIFY_EVENT.size
+                name = data[offset:offset + name_len].rstrip(b"\0").decode(errors="replace")
+                offset += name_len
+
+                agent_id = self._agent_by_log.get(name)
+                if agent_id is not None:
+                    self.agents[agent_id].last_heartbeat = now
+
+    def _scan_log_mtimes(self) -> Dict[str, float]:
+        """Modification times of every log in logs/, from a single directory sweep"""
+        try:
+            with os.scandir("logs") as entries:
+                return {
+                    entry.name: entry.stat().st_mtime
+                    for entry in entries
+                    if entry.name.endswith(".log")
+                }
+        except FileNotFoundError:
+            return {}
+
+    async def check_process_health(
+        self,
+        agent: AgentProcess,
+        now: Optional[float] = None,
+        mtimes: Optional[Dict[str, float]] = None
+    ) -> bool:
+        """Check if an agent process is healthy (now is the tick's epoch time)"""
         if not agent.process:
             return False
 
-        # Check if process is still running
-        poll = agent.process.poll()
-        if poll is not None:
-            self.logger.warning(f"⚠ {agent.name} process exited with code {poll}")
+        # Exits are handled by the watcher task; returncode is set without a syscall
+        if agent.process.returncode is not None:
             return False
 
-        # Check log file for recent activity
-        log_file = Path(f"logs/{agent.name}.log")
-        if log_file.exists():
+        # Check log file for recent activity: heartbeats come from inotify when
+        # it's watching, otherwise from this tick's mtime sweep
+        if mtimes is None:
+            mtime = agent.last_heartbeat
+        else:
+            mtime = mtimes.get(self._log_names[agent.id])
+
+        if mtime is not None:
             # Check if log has been modified recently
-            mtime = datetime.fromtimestamp(log_file.stat().st_mtime)
-            time_since_update = datetime.now() - mtime
+            time_since_update = (now if now is not None else time.time()) - mtime
 
-            if time_since_update > timedelta(seconds=30):
-                self.logger.warning(f"⚠ {agent.name} no activity for {time_since_update.seconds}s")
+            if time_since_update > 30:
+                self.logger.warning(f"{WARN} {agent.name} no activity for {int(time_since_update)}s")
                 # Not necessarily dead, just quiet
                 return True
 
@@ -90,79 +266,132 @@ class KeepAliveMonitor:
     async def restart_agent(self, agent: AgentProcess):
         """Restart a failed agent"""
         if agent.restart_count >= agent.max_restarts:
-            self.logger.error(f"❌ {agent.name} exceeded max restarts ({agent.max_restarts})")
+            self.logger.error(f"{FAIL} {agent.name} exceeded max restarts ({agent.max_restarts})")
             agent.is_healthy = False
             return
 
-        self.logger.info(f"🔄 Restarting {agent.name} (attempt {agent.restart_count + 1})")
+        self.logger.info(f"{RESTART} Restarting {agent.name} (attempt {agent.restart_count + 1})")
 
-        # Kill old process if it exists
+        # Kill old process if it is still running
         if agent.process:
-            try:
-                agent.process.terminate()
-                agent.process.wait(timeout=5)
-            except:
-                agent.process.kill()
+            await self._stop_process(agent.process)
 
         # Start new process
         try:
-            process = subprocess.Popen(
-                ["python", "agent_worker.py", str(agent.id), agent.name],
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE
-            )
+            process = await self._spawn_agent(agent)
 
             agent.process = process
             agent.restart_count += 1
-            agent.last_heartbeat = datetime.now()
+            agent.last_heartbeat = time.time()
+            agent.watcher = asyncio.create_task(self._watch(agent))
 
-            self.logger.info(f"✓ {agent.name} restarted successfully (PID: {process.pid})")
+            self.logger.info(f"{OK} {agent.name} restarted successfully (PID: {process.pid})")
 
         except Exception as e:
-            self.logger.error(f"❌ Failed to restart {agent.name}: {e}")
+            self.logger.error(f"{FAIL} Failed to restart {agent.name}: {e}")
             agent.is_healthy = False
 
+    async def _spawn_agent(self, agent: AgentProcess) -> Union[asyncio.subprocess.Process, SpawnedProcess]:
+        """Start agent_worker.py with its stdout/stderr appended to logs/<name>.out
+
+        The worker writes its own logs/<name>.log (the heartbeat source), so
+        raw output such as crash tracebacks goes to a separate file instead of
+        duplicating every log line there.
+
+        Uses posix_spawn (vfork + exec in glibc) so the monitor's page tables
+        are never copied; falls back to asyncio's subprocess support where
+        posix_spawn or pidfds are unavailable.
+        """
+        argv = ["python", "agent_worker.py", str(agent.id), agent.name]
+        log_path = f"logs/{agent.name}.out"
+
+        if hasattr(os, "posix_spawnp") and hasattr(os, "pidfd_open"):
+            pid = os.posix_spawnp(
+                argv[0], argv, os.environ,
+                file_actions=[
+                    (os.POSIX_SPAWN_OPEN, 1, log_path, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644),
+                    (os.POSIX_SPAWN_DUP2, 1, 2),
+                ]
+            )
+            return SpawnedProcess(pid)
+
+        with open(log_path, "ab") as log_file:
+            return await asyncio.create_subprocess_exec(
+                *argv,
+                stdout=log_file,
+                stderr=asyncio.subprocess.STDOUT
+            )
+
+    async def _stop_process(self, process: Union[asyncio.subprocess.Process, SpawnedProcess]):
+        """Terminate a process, killing it if it doesn't exit within 5 seconds"""
+        if process.returncode is not None:
+            return
+
+        try:
+            process.terminate()
+            await asyncio.wait_for(process.wait(), timeout=5)
+        except ProcessLookupError:
+            pass
+        except asyncio.TimeoutError:
+            process.kill()
+            await process.wait()
+
     async def monitor_loop(self):
         """Main monitoring loop"""
         self.running = True
-        self.logger.info("🚀 Keep-Alive Monitor started")
+        self.logger.info(f"{START} Keep-Alive Monitor started")
 
-        while self.running:
-            await asyncio.sleep(self.check_interval)
+        watching = self._start_log_watch()
+        if not watching:
+            self.logger.info("inotify unavailable, polling log modification times")
 
-            # Check all agents
-            for agent in self.agents.values():
-                if not agent.is_healthy:
+        heap = self._check_heap
+        next_summary = time.time() + self.check_interval
+        while self.running:
+            # Sleep until the next agent is due or the summary is
+            wake = min(heap[0][0], next_summary) if heap else next_summary
+            delay = wake - time.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+
+            # One clock read per tick, shared by every due agent's check; exited
+            # processes are restarted by their watcher tasks as soon as they exit
+            now = time.time()
+            mtimes = None
+            while heap and heap[0][0] <= now:
+                _, agent_id = heapq.heappop(heap)
+                agent = self.agents.get(agent_id)
+                if agent is None or not agent.is_healthy:
                     continue
 
-                is_healthy = await self.check_process_health(agent)
-
-                if not is_healthy:
-                    self.logger.warning(f"⚠ {agent.name} is unhealthy, restarting...")
-                    await self.restart_agent(agent)
+                if mtimes is None and not watching:
+                    mtimes = self._scan_log_mtimes()
+                await self.check_process_health(agent, now, mtimes)
+                heapq.heappush(heap, (self._next_check_time(now), agent_id))
 
             # Print status summary
-            healthy_count = sum(1 for a in self.agents.values() if a.is_healthy)
-            total_count = len(self.agents)
+            if now >= next_summary:
+                next_summary = now + self.check_interval
+                healthy_count = sum(1 for a in self.agents.values() if a.is_healthy)
+                total_count = len(self.agents)
 
-            self.logger.info(f"💚 Health Check: {healthy_count}/{total_count} agents healthy")
+                self.logger.info(f"{BEAT} Health Check: {healthy_count}/{total_count} agents healthy")
 
     async def shutdown(self):
         """Graceful shutdown"""
-        self.logger.info("🛑 Shutting down Keep-Alive Monitor...")
+        self.logger.info(f"{STOP} Shutting down Keep-Alive Monitor...")
         self.running = False
+        self._stop_log_watch()
 
         # Terminate all agent processes
         for agent in self.agents.values():
+            if agent.watcher:
+                agent.watcher.cancel()
             if agent.process:
-                try:
-                    self.logger.info(f"  Stopping {agent.name}...")
-                    agent.process.terminate()
-                    agent.process.wait(timeout=5)
-                except:
-                    agent.process.kill()
+                self.logger.info(f"  Stopping {agent.name}...")
+                await self._stop_process(agent.process)
 
-        self.logger.info("✓ All agents stopped")
+        self.logger.info(f"{OK} All agents stopped")
 
 
 class SystemMonitor:
@@ -173,6 +402,23 @@ class SystemMonitor:
     def __init__(self):
         self.setup_logging()
 
+        # Prime the CPU counters so later non-blocking reads return the
+        # utilisation since the previous call
+        if psutil is not None:
+            psutil.cpu_percent(interval=None)
+
+        # NVML device handles; None means fall back to nvidia-smi
+        self._gpu_handles = None
+        if pynvml is not None:
+            try:
+                pynvml.nvmlInit()
+                self._gpu_handles = [
+                    pynvml.nvmlDeviceGetHandleByIndex(i)
+                    for i in range(pynvml.nvmlDeviceGetCount())
+                ]
+            except pynvml.NVMLError:
+                self._gpu_handles = None
+
     def setup_logging(self):
         """Setup logging"""
         self.logger = logging.getLogger('SystemMonitor')
@@ -183,19 +429,24 @@ class SystemMonitor:
             await asyncio.sleep(30)
 
             try:
-                # Get CPU and memory usage
-                import psutil
+                if psutil is None:
+                    raise ImportError("psutil is not installed")
 
-                cpu_percent = psutil.cpu_percent(interval=1)
+                # Get CPU and memory usage (CPU averaged since the last tick)
+                cpu_percent = psutil.cpu_percent(interval=None)
                 memory = psutil.virtual_memory()
                 disk = psutil.disk_usage('/')
 
-                self.logger.info(f"📊 System Resources:")
+                self.logger.info(f"{STATS} System Resources:")
                 self.logger.info(f"  CPU: {cpu_percent}%")
                 self.logger.info(f"  Memory: {memory.percent}% ({memory.used / (1024**3):.1f}GB / {memory.total / (1024**3):.1f}GB)")
                 self.logger.info(f"  Disk: {disk.percent}% ({disk.used / (1024**3):.1f}GB / {disk.total / (1024**3):.1f}GB)")
 
                 # Check GPU if available
+                if self._gpu_handles is not None:
+                    self.log_gpu_nvml()
+                    continue
+
                 try:
                     result = subprocess.run(
                         ['nvidia-smi', '--query-gpu=utilization.gpu,memory.used,memory.total', '--format=csv,noheader,nounits'],
@@ -214,36 +465,75 @@ class SystemMonitor:
             except Exception as e:
                 self.logger.error(f"Error monitoring resources: {e}")
 
+    def log_gpu_nvml(self):
+        """Log GPU utilisation and memory through NVML library calls"""
+        for handle in self._gpu_handles:
+            util = pynvml.nvmlDeviceGetUtilizationRates(handle).gpu
+            mem = pynvml.nvmlDeviceGetMemoryInfo(handle)
+            self.logger.info(f"  GPU: {util}% util, {mem.used // (1024**2)}MB / {mem.total // (1024**2)}MB")
+
 
 class AlertSystem:
     """
     Alert system for critical events
     """
 
-    def __init__(self):
+    def __init__(self, flush_interval: float = 1.0, dedup_window: float = 5.0, dedup_size: int = 1024):
+        self.flush_interval = flush_interval
         self.setup_logging()
 
+        # (level, message) -> monotonic time last sent, oldest first
+        self._dedup: OrderedDict = OrderedDict()
+        self._window = dedup_window
+        self._dedup_size = dedup_size
+
+        # One buffered append handle; lines reach disk in batches
+        self._alerts_fh = open("logs/alerts.log", "a", buffering=65536)
+
     def setup_logging(self):
         """Setup logging"""
         self.logger = logging.getLogger('AlertSystem')
 
-    async def send_alert(self, level: str, message: str):
-        """Send alert (can be extended to email, Slack, etc.)"""
-        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    async def flush_loop(self):
+        """Flush buffered alerts to disk every flush_interval seconds"""
+        while not self._alerts_fh.closed:
+            await asyncio.sleep(self.flush_interval)
+            if not self._alerts_fh.closed:
+                self._alerts_fh.flush()
+
+    def close(self):
+        """Flush and close the alerts file"""
+        if not self._alerts_fh.closed:
+            self._alerts_fh.close()
+
+    async def send_alert(self, level: str, message: str, timestamp: Optional[str] = None):
+        """Send alert (can be extended to email, Slack, etc.); timestamp defaults to now"""
+        # Drop repeats of the same alert within the dedup window
+        key = (level, message)
+        now = time.monotonic()
+        last_sent = self._dedup.get(key)
+        if last_sent is not None and now - last_sent < self._window:
+            return
+
+        self._dedup[key] = now
+        self._dedup.move_to_end(key)
+        while len(self._dedup) > self._dedup_size:
+            self._dedup.popitem(last=False)
+
+        if timestamp is None:
+            timestamp = time.strftime("%Y-%m-%d %H:%M:%S")
 
         alert_msg = f"[{level}] {timestamp} - {message}"
 
         if level == "CRITICAL":
-            self.logger.critical(f"🚨 {alert_msg}")
+            self.logger.critical(alert_msg)
         elif level == "WARNING":
-            self.logger.warning(f"⚠️  {alert_msg}")
+            self.logger.warning(alert_msg)
         else:
-            self.logger.info(f"ℹ️  {alert_msg}")
+            self.logger.info(alert_msg)
 
-        # Write to alerts file
-        alerts_file = Path("logs/alerts.log")
-        with open(alerts_file, "a") as f:
-            f.write(f"{alert_msg}\n")
+        # Write to alerts file (flushed by flush_loop or close)
+        self._alerts_fh.write(f"{alert_msg}\n")
 
 
 async def main():
@@ -255,6 +545,7 @@ async def main():
     # Handle graceful shutdown
     def signal_handler(sig, frame):
         asyncio.create_task(monitor.shutdown())
+        alert_system.close()
         sys.exit(0)
 
     signal.signal(signal.SIGINT, signal_handler)
@@ -266,7 +557,8 @@ async def main():
     # Run monitoring tasks
     tasks = [
         monitor.monitor_loop(),
-        system_monitor.monitor_resources()
+        system_monitor.monitor_resources(),
+        alert_system.flush_loop()
     ]
 
     await asyncio.gather(*tasks)
@@ -4,19 +4,29 @@ Complete REST API for video generation
 """
 
 import os
+import asyncio
+import json
 import logging
-from typing import Optional, List, Dict, Any
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial, wraps
+from typing import Optional, List, Dict, Any, Callable, Tuple
 from pathlib import Path
+import orjson
 import uvicorn
 from fastapi import FastAPI, File, UploadFile, Form, HTTPException, BackgroundTasks
-from fastapi.responses import FileResponse, JSONResponse
+from fastapi.responses import FileResponse, ORJSONResponse, Response
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter
+from fastapi.concurrency import run_in_threadpool
+import shutil
 import tempfile
+from queue import Full
 
 from config import settings
 from core.video_generator import get_generator, JobStatus
-from core.avatar_trainer import get_trainer
+from core.avatar_trainer import get_trainer, train_avatar as run_avatar_training
 from core.voice_synthesis import get_synthesizer
 
 # Setup logging
@@ -32,7 +42,8 @@ app = FastAPI(
     description="HeyGen-like platform for AI avatar video generation",
     version="1.0.0",
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    default_response_class=ORJSONResponse
 )
 
 # Add CORS middleware
@@ -44,15 +55,145 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Initialize components
-generator = get_generator()
-trainer = get_trainer()
-synthesizer = get_synthesizer()
+# Components are built in startup_event rather than at import: spawned
+# processes (uvicorn and training workers) re-run this file as __mp_main__,
+# and must not each load the lip sync engine and voice synthesizer
+generator = None
+trainer = None
+synthesizer = None
+
+# Short-lived in-process cache for read-mostly list endpoints.
+# Keys are (namespace, *params); values are (expires_at, result).
+_response_cache: Dict[Tuple, Tuple[float, Any]] = {}
+
+
+def cached_response(key: Tuple, ttl: float, producer: Callable[[], Any], stale_on_error: bool = False) -> Any:
+    """
+    Return a cached result for key, calling producer on a miss or expiry
+
+    Args:
+        key: Cache key; the first element is the namespace used for invalidation
+        ttl: Seconds the result stays fresh
+        producer: Zero-argument callable computing the result
+        stale_on_error: Serve the expired entry if producer raises
+
+    Returns:
+        Cached or freshly produced result
+    """
+    if not settings.ENABLE_CACHE:
+        return producer()
+
+    now = time.monotonic()
+    entry = _response_cache.get(key)
+    if entry is not None and entry[0] > now:
+        return entry[1]
+
+    try:
+        value = producer()
+    except Exception as e:
+        if stale_on_error and entry is not None:
+            logger.warning(f"Serving stale {key[0]} response: {e}")
+            return entry[1]
+        raise
+
+    _response_cache[key] = (now + ttl, value)
+    return value
+
+
+def _open_scratch(suffix: str) -> Tuple[Any, str]:
+    """Open an anonymous scratch file in TEMP_DIR and return it with a path to it
+
+    On Linux the file is created with O_TMPFILE, so it never has a directory
+    entry and disappears when closed; other processes (the training pool,
+    ffmpeg) reach it through /proc/<pid>/fd. Elsewhere this falls back to a
+    NamedTemporaryFile that deletes itself on close.
+    """
+    if hasattr(os, "O_TMPFILE"):
+        try:
+            fd = os.open(settings.TEMP_DIR, os.O_TMPFILE | os.O_RDWR, 0o600)
+        except OSError:
+            pass
+        else:
+            return os.fdopen(fd, "w+b"), f"/proc/{os.getpid()}/fd/{fd}"
+    tmp = tempfile.NamedTemporaryFile(suffix=suffix, dir=settings.TEMP_DIR)
+    return tmp, tmp.name
+
+
+def _copy_upload(upload: UploadFile, suffix: str) -> Tuple[Any, str]:
+    """Stream an upload into a scratch file in 1 MB blocks; return the file and its path"""
+    upload.file.seek(0)
+    scratch, path = _open_scratch(suffix)
+    try:
+        shutil.copyfileobj(upload.file, scratch, length=1 << 20)
+        scratch.flush()
+    except Exception:
+        scratch.close()
+        raise
+    return scratch, path
+
+
+async def save_upload(upload: UploadFile, suffix: str) -> Tuple[Any, str]:
+    """Save an upload to a scratch file without holding it in memory or blocking the loop
+
+    The file is removed when the returned handle is closed.
+    """
+    return await run_in_threadpool(_copy_upload, upload, suffix)
+
+
+def invalidate_cache(namespace: str):
+    """Expire every cached response in namespace, keeping it as a stale fallback"""
+    for key in [k for k in _response_cache if k[0] == namespace]:
+        _response_cache[key] = (0.0, _response_cache[key][1])
+
+
+# Error bodies are fixed, so encode them once instead of per failure
+_NOT_FOUND_BODY = orjson.dumps({"error": "Not found"})
+_INTERNAL_ERROR_BODY = orjson.dumps({"error": "Internal server error"})
+
+
+def not_found_response() -> Response:
+    """404 response with the pre-encoded error body"""
+    return Response(content=_NOT_FOUND_BODY, status_code=404, media_type="application/json")
+
+
+def internal_error_response() -> Response:
+    """500 response with the pre-encoded error body"""
+    return Response(content=_INTERNAL_ERROR_BODY, status_code=500, media_type="application/json")
+
+
+def wrap_errors(action: str):
+    """Map endpoint failures to the shared error responses
+
+    HTTPExceptions pass through unchanged, FileNotFoundError becomes a 404 and
+    anything else is logged as "Error <action>: ..." and becomes a 500.
+
+    Args:
+        action: What the endpoint does, for the error log line
+
+    Returns:
+        Decorator for an async endpoint
+    """
+    def decorator(endpoint):
+        @wraps(endpoint)
+        async def wrapper(*args, **kwargs):
+            try:
+                return await endpoint(*args, **kwargs)
+            except HTTPException:
+                raise
+            except FileNotFoundError:
+                return not_found_response()
+            except Exception as e:
+                logger.error(f"Error {action}: {e}")
+                return internal_error_response()
+        return wrapper
+    return decorator
 
 
 # Pydantic models for request/response
 class GenerateVideoRequest(BaseModel):
     """Request model for video generation"""
+    model_config = ConfigDict(extra="ignore", frozen=True)
+
     script: str = Field(..., description="Text script to convert to speech")
     avatar_id: str = Field(..., description="ID of the avatar to use")
     voice_id: Optional[str] = Field(None, description="ElevenLabs voice ID")
@@ -61,6 +202,8 @@ class GenerateVideoRequest(BaseModel):
 
 class GenerateVideoResponse(BaseModel):
     """Response model for video generation"""
+    model_config = ConfigDict(extra="ignore", frozen=True)
+
     job_id: str
     status: str
     message: str
@@ -68,6 +211,8 @@ class GenerateVideoResponse(BaseModel):
 
 class JobStatusResponse(BaseModel):
     """Response model for job status"""
+    model_config = ConfigDict(extra="ignore", frozen=True)
+
     job_id: str
     status: str
     progress: int
@@ -79,6 +224,8 @@ class JobStatusResponse(BaseModel):
 
 class AvatarResponse(BaseModel):
     """Response model for avatar"""
+    model_config = ConfigDict(extra="ignore", frozen=True)
+
     avatar_id: str
     name: str
     created_at: str
@@ -87,11 +234,18 @@ class AvatarResponse(BaseModel):
 
 class VoiceResponse(BaseModel):
     """Response model for voice"""
+    model_config = ConfigDict(extra="ignore", frozen=True)
+
     voice_id: str
     name: str
     category: Optional[str] = None
 
 
+# Validate whole list responses in one call instead of one model per item
+AvatarListAdapter = TypeAdapter(List[AvatarResponse])
+VoiceListAdapter = TypeAdapter(List[VoiceResponse])
+
+
 # API Endpoints
 
 @app.get("/")
@@ -110,11 +264,12 @@ async def health():
     """Health check endpoint"""
     return {
         "status": "healthy",
-        "gpu_available": settings.USE_GPU and torch.cuda.is_available() if 'torch' in dir() else False
+        "gpu_available": bool(settings.USE_GPU and settings.gpu_available())
     }
 
 
 @app.post("/api/v1/generate", response_model=GenerateVideoResponse)
+@wrap_errors("generating video")
 async def generate_video(request: GenerateVideoRequest):
     """
     Generate a lip-synced avatar video
@@ -122,113 +277,111 @@ async def generate_video(request: GenerateVideoRequest):
     This endpoint creates a video generation job that will process asynchronously.
     Use the returned job_id to check status.
     """
-    try:
-        logger.info(f"Generating video for avatar {request.avatar_id}")
+    logger.info(f"Generating video for avatar {request.avatar_id}")
 
-        # Create job
+    # Create job
+    try:
         job = generator.generate_video(
             script=request.script,
             avatar_id=request.avatar_id,
             voice_id=request.voice_id,
             video_settings=request.video_settings
         )
-
-        return GenerateVideoResponse(
-            job_id=job["job_id"],
-            status=job["status"],
-            message="Video generation started"
-        )
-
-    except Exception as e:
-        logger.error(f"Error generating video: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
+    except Full:
+        raise HTTPException(status_code=429, detail="Job queue is full, try again later")
+    invalidate_cache("jobs")
+
+    return GenerateVideoResponse(
+        job_id=job["job_id"],
+        status=job["status"],
+        message="Video generation started"
+    )
 
 
 @app.get("/api/v1/status/{job_id}", response_model=JobStatusResponse)
+@wrap_errors("getting job status")
 async def get_job_status(job_id: str):
     """Get status of a video generation job"""
-    try:
-        job = generator.get_job_status(job_id)
-
-        if not job:
-            raise HTTPException(status_code=404, detail="Job not found")
-
-        return JobStatusResponse(
-            job_id=job["job_id"],
-            status=job["status"],
-            progress=job["progress"],
-            created_at=job["created_at"],
-            updated_at=job["updated_at"],
-            video_path=job.get("video_path"),
-            error=job.get("error")
-        )
-
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"Error getting job status: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
+    job = generator.get_job_status(job_id)
+
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+
+    return JobStatusResponse(
+        job_id=job["job_id"],
+        status=job["status"],
+        progress=job["progress"],
+        created_at=job["created_at"],
+        updated_at=job["updated_at"],
+        video_path=job.get("video_path"),
+        error=job.get("error")
+    )
 
 
 @app.get("/api/v1/jobs")
+@wrap_errors("listing jobs")
 async def list_jobs(status: Optional[str] = None, limit: int = 100):
     """List all jobs"""
-    try:
-        job_status = JobStatus(status) if status else None
-        jobs = generator.list_jobs(status=job_status, limit=limit)
-
-        return {
-            "jobs": jobs,
-            "count": len(jobs)
-        }
+    job_status = JobStatus(status) if status else None
+    jobs = cached_response(
+        ("jobs", status, limit),
+        settings.JOBS_RESPONSE_TTL,
+        lambda: generator.list_jobs(status=job_status, limit=limit)
+    )
 
-    except Exception as e:
-        logger.error(f"Error listing jobs: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
+    # Job payloads are plain dicts; hand them straight to orjson
+    return ORJSONResponse(content={
+        "jobs": jobs,
+        "count": len(jobs)
+    })
 
 
 @app.delete("/api/v1/jobs/{job_id}")
+@wrap_errors("deleting job")
 async def delete_job(job_id: str):
     """Delete a job"""
-    try:
-        generator.delete_job(job_id)
-        return {"message": "Job deleted successfully"}
-
-    except Exception as e:
-        logger.error(f"Error deleting job: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
+    generator.delete_job(job_id)
+    invalidate_cache("jobs")
+    return {"message": "Job deleted successfully"}
 
 
 @app.get("/api/v1/video/{job_id}")
+@wrap_errors("downloading video")
 async def download_video(job_id: str):
     """Download generated video"""
-    try:
-        job = generator.get_job_status(job_id)
+    job = generator.get_job_status(job_id)
 
-        if not job:
-            raise HTTPException(status_code=404, detail="Job not found")
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
 
-        if job["status"] != JobStatus.COMPLETED.value:
-            raise HTTPException(status_code=400, detail="Video not ready yet")
+    if job["status"] != JobStatus.COMPLETED.value:
+        raise HTTPException(status_code=400, detail="Video not ready yet")
 
-        video_path = job.get("video_path")
-        if not video_path or not os.path.exists(video_path):
-            raise HTTPException(status_code=404, detail="Video file not found")
+    video_path = job.get("video_path")
+    if not video_path or not os.path.exists(video_path):
+        raise HTTPException(status_code=404, detail="Video file not found")
 
-        return FileResponse(
-            video_path,
+    # Behind nginx, let it send the file from the page cache with sendfile(2)
+    output_dir = settings.OUTPUT_DIR.resolve()
+    resolved = Path(video_path).resolve()
+    if settings.VIDEO_ACCEL_REDIRECT_PREFIX and resolved.parent == output_dir:
+        return Response(
             media_type="video/mp4",
-            filename=f"{job_id}.mp4"
+            headers={
+                "X-Accel-Redirect": f"{settings.VIDEO_ACCEL_REDIRECT_PREFIX.rstrip('/')}/{resolved.name}",
+                "Content-Disposition": f'attachment; filename="{job_id}.mp4"'
+            }
         )
 
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"Error downloading video: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
+    return FileResponse(
+        video_path,
+        media_type="video/mp4",
+        filename=f"{job_id}.mp4"
+    )
 
 
 @app.post("/api/v1/avatars/train", response_model=AvatarResponse)
+@wrap_errors("training avatar")
 async def train_avatar(
     name: str = Form(...),
     video: UploadFile = File(...),
@@ -240,113 +393,91 @@ async def train_avatar(
     Upload a video of a person's face to create a new avatar.
     The video should have good lighting and the person should face the camera.
     """
-    try:
-        logger.info(f"Training avatar '{name}'")
-
-        # Save uploaded video
-        with tempfile.NamedTemporaryFile(delete=False, suffix=".mp4") as tmp:
-            content = await video.read()
-            tmp.write(content)
-            tmp_path = tmp.name
-
-        # Parse metadata
-        import json
-        metadata_dict = json.loads(metadata) if metadata else {}
-
-        # Train avatar
-        avatar_id = trainer.generate_avatar_id(name)
-        avatar = trainer.train_avatar(
-            video_path=tmp_path,
-            avatar_id=avatar_id,
-            name=name,
-            metadata=metadata_dict
-        )
+    logger.info(f"Training avatar '{name}'")
 
-        # Clean up temp file
-        os.unlink(tmp_path)
+    # Save uploaded video
+    scratch, tmp_path = await save_upload(video, ".mp4")
 
-        return AvatarResponse(
-            avatar_id=avatar["avatar_id"],
-            name=avatar["name"],
-            created_at=avatar["created_at"],
-            frame_count=avatar["frame_count"]
-        )
+    # Parse metadata
+    metadata_dict = json.loads(metadata) if metadata else {}
 
-    except Exception as e:
-        logger.error(f"Error training avatar: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
+    # Train avatar in the warm training process, off the event loop;
+    # closing the scratch file removes it
+    try:
+        avatar = await asyncio.get_running_loop().run_in_executor(
+            app.state.training_pool,
+            partial(run_avatar_training, tmp_path, name, metadata=metadata_dict)
+        )
+    finally:
+        scratch.close()
+    invalidate_cache("avatars")
+
+    return AvatarResponse(
+        avatar_id=avatar["avatar_id"],
+        name=avatar["name"],
+        created_at=avatar["created_at"],
+        frame_count=avatar["frame_count"]
+    )
 
 
 @app.get("/api/v1/avatars", response_model=List[AvatarResponse])
+@wrap_errors("listing avatars")
 async def list_avatars():
     """List all available avatars"""
-    try:
-        avatars = trainer.list_avatars()
-
-        return [
-            AvatarResponse(
-                avatar_id=a["avatar_id"],
-                name=a["name"],
-                created_at=a["created_at"],
-                frame_count=a["frame_count"]
-            )
-            for a in avatars
-        ]
+    avatars = cached_response(("avatars",), settings.AVATARS_RESPONSE_TTL, trainer.list_avatars)
 
-    except Exception as e:
-        logger.error(f"Error listing avatars: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
+    # Returning a response skips FastAPI's second validation pass over response_model
+    return ORJSONResponse(
+        content=AvatarListAdapter.dump_python(AvatarListAdapter.validate_python(avatars))
+    )
 
 
 @app.get("/api/v1/avatars/{avatar_id}")
+@wrap_errors("getting avatar")
 async def get_avatar(avatar_id: str):
     """Get avatar details"""
-    try:
-        avatar = trainer.load_avatar(avatar_id)
-        return avatar
-
-    except FileNotFoundError:
-        raise HTTPException(status_code=404, detail="Avatar not found")
-    except Exception as e:
-        logger.error(f"Error getting avatar: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
+    avatar = trainer.load_avatar(avatar_id)
+    return avatar
 
 
 @app.delete("/api/v1/avatars/{avatar_id}")
+@wrap_errors("deleting avatar")
 async def delete_avatar(avatar_id: str):
     """Delete an avatar"""
-    try:
-        trainer.delete_avatar(avatar_id)
-        return {"message": "Avatar deleted successfully"}
-
-    except FileNotFoundError:
-        raise HTTPException(status_code=404, detail="Avatar not found")
-    except Exception as e:
-        logger.error(f"Error deleting avatar: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
+    trainer.delete_avatar(avatar_id)
+    invalidate_cache("avatars")
+    return {"message": "Avatar deleted successfully"}
 
 
 @app.get("/api/v1/voices", response_model=List[VoiceResponse])
-async def list_voices():
+@wrap_errors("listing voices")
+async def list_voices(response: Response):
     """List all available voices from ElevenLabs"""
-    try:
-        voices = synthesizer.get_available_voices()
+    response.headers["Cache-Control"] = (
+        f"public, max-age={settings.VOICES_RESPONSE_TTL}, "
+        f"stale-if-error={settings.VOICES_STALE_IF_ERROR}"
+    )
 
-        return [
-            VoiceResponse(
-                voice_id=v["voice_id"],
-                name=v["name"],
-                category=v.get("category")
-            )
-            for v in voices
-        ]
+    # Fall back to the last good list if ElevenLabs is unreachable; an empty
+    # list is treated as a failure so it is never cached or sent with max-age
+    def fetch_voices():
+        voices = synthesizer.get_available_voices()
+        if not voices:
+            raise RuntimeError("ElevenLabs returned no voices")
+        return voices
+
+    voices = cached_response(
+        ("voices",),
+        settings.VOICES_RESPONSE_TTL,
+        fetch_voices,
+        stale_on_error=True
+    )
 
-    except Exception as e:
-        logger.error(f"Error listing voices: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
+    return VoiceListAdapter.validate_python(voices)
 
 
 @app.post("/api/v1/voices/clone")
+@wrap_errors("cloning voice")
 async def clone_voice(
     name: str = Form(...),
     description: Optional[str] = Form(None),
@@ -358,40 +489,42 @@ async def clone_voice(
     Upload 2-5 audio files of the same person speaking to clone their voice.
     Each audio should be at least 1 minute long.
     """
+    logger.info(f"Cloning voice '{name}'")
+
+    # Save uploaded audio files concurrently; keep the ones that were saved
+    # even if another failed, so they are still closed below
+    saved = await asyncio.gather(
+        *(save_upload(audio, ".mp3") for audio in audio_files),
+        return_exceptions=True
+    )
+    scratches = [result for result in saved if not isinstance(result, BaseException)]
     try:
-        logger.info(f"Cloning voice '{name}'")
-
-        # Save uploaded audio files
-        temp_paths = []
-        for audio in audio_files:
-            with tempfile.NamedTemporaryFile(delete=False, suffix=".mp3") as tmp:
-                content = await audio.read()
-                tmp.write(content)
-                temp_paths.append(tmp.name)
-
-        # Clone voice
-        voice_id = synthesizer.clone_voice(
+        for result in saved:
+            if isinstance(result, BaseException):
+                raise result
+
+        # Clone voice (an ElevenLabs upload, so a thread is enough to keep the loop free)
+        voice_id = await run_in_threadpool(
+            synthesizer.clone_voice,
             name=name,
-            audio_files=temp_paths,
+            audio_files=[path for _, path in scratches],
             description=description
         )
+    finally:
+        # Closing the scratch files removes them
+        for scratch, _ in scratches:
+            scratch.close()
+    invalidate_cache("voices")
 
-        # Clean up temp files
-        for path in temp_paths:
-            os.unlink(path)
-
-        return {
-            "voice_id": voice_id,
-            "name": name,
-            "message": "Voice cloned successfully"
-        }
-
-    except Exception as e:
-        logger.error(f"Error cloning voice: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
+    return {
+        "voice_id": voice_id,
+        "name": name,
+        "message": "Voice cloned successfully"
+    }
 
 
 @app.post("/api/v1/tts")
+@wrap_errors("generating speech")
 async def text_to_speech(
     text: str = Form(...),
     voice_id: Optional[str] = Form(None)
@@ -401,74 +534,114 @@ async def text_to_speech(
 
     Generate audio from text using ElevenLabs.
     """
-    try:
-        # Generate audio
-        with tempfile.NamedTemporaryFile(delete=False, suffix=".wav") as tmp:
-            output_path = tmp.name
-
-        audio_path = synthesizer.text_to_speech(
-            text=text,
-            output_path=output_path,
-            voice_id=voice_id
-        )
-
-        return FileResponse(
-            audio_path,
-            media_type="audio/wav",
-            filename="speech.wav"
-        )
+    # Generate audio
+    with tempfile.NamedTemporaryFile(delete=False, suffix=".wav") as tmp:
+        output_path = tmp.name
+
+    audio_path = synthesizer.text_to_speech(
+        text=text,
+        output_path=output_path,
+        voice_id=voice_id
+    )
 
-    except Exception as e:
-        logger.error(f"Error generating speech: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
+    return FileResponse(
+        audio_path,
+        media_type="audio/wav",
+        filename="speech.wav"
+    )
 
 
 @app.post("/api/v1/batch")
+@wrap_errors("creating batch jobs")
 async def batch_generate(jobs: List[GenerateVideoRequest]):
     """
     Generate multiple videos in batch
 
-    Submit multiple video generation jobs at once.
+    Submit multiple video generation jobs at once. Jobs are queued and
+    inserted in batches; the returned job IDs can be polled immediately
+    after insertion (usually within milliseconds).
     """
-    try:
-        job_specs = [
-            {
-                "script": job.script,
-                "avatar_id": job.avatar_id,
-                "voice_id": job.voice_id,
-                "video_settings": job.video_settings
-            }
-            for job in jobs
-        ]
+    batch_queue: asyncio.Queue = app.state.batch_queue
+
+    # All or nothing: don't queue part of a request the queue can't hold
+    if batch_queue.maxsize - batch_queue.qsize() < len(jobs):
+        raise HTTPException(status_code=429, detail="Batch queue is full, try again later")
+
+    created_jobs = []
+    for job in jobs:
+        job_id = generator.generate_job_id()
+        batch_queue.put_nowait({
+            "job_id": job_id,
+            "script": job.script,
+            "avatar_id": job.avatar_id,
+            "voice_id": job.voice_id,
+            "video_settings": job.video_settings
+        })
+        created_jobs.append({"job_id": job_id, "status": JobStatus.PENDING.value})
 
-        created_jobs = generator.batch_generate(job_specs)
+    return {
+        "jobs": created_jobs,
+        "count": len(created_jobs),
+        "message": f"{len(created_jobs)} jobs created"
+    }
 
-        return {
-            "jobs": created_jobs,
-            "count": len(created_jobs),
-            "message": f"{len(created_jobs)} jobs created"
-        }
 
-    except Exception as e:
-        logger.error(f"Error creating batch jobs: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
+def batch_start_done(task: asyncio.Task):
+    """Forget a finished start_jobs task, logging it if it failed"""
+    app.state.batch_start_tasks.discard(task)
+    if not task.cancelled() and task.exception() is not None:
+        logger.error(f"Error starting batch jobs: {task.exception()}")
+
+
+async def batch_worker(batch_queue: asyncio.Queue):
+    """Drain queued batch jobs, inserting up to BATCH_MAX_JOBS per transaction"""
+    loop = asyncio.get_running_loop()
+    starting = app.state.batch_start_tasks
+
+    while True:
+        specs = [await batch_queue.get()]
+
+        # Gather whatever else arrives within BATCH_MAX_WAIT
+        deadline = loop.time() + settings.BATCH_MAX_WAIT
+        while len(specs) < settings.BATCH_MAX_JOBS:
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                specs.append(await asyncio.wait_for(batch_queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+
+        try:
+            job_ids = generator.insert_many(specs)
+            invalidate_cache("jobs")
+
+            # Speech synthesis runs on its own so the next batch is inserted right away
+            task = asyncio.create_task(generator.start_jobs(job_ids))
+            starting.add(task)
+            task.add_done_callback(batch_start_done)
+
+        except Exception as e:
+            logger.error(f"Error inserting batch jobs: {e}")
+            # The client already holds these IDs, so record them as failed rather than lose them
+            try:
+                generator.fail_many(specs, f"Could not queue job: {e}")
+            except Exception as record_error:
+                logger.error(f"Error recording failed batch jobs: {record_error}")
+        finally:
+            for _ in specs:
+                batch_queue.task_done()
 
 
 # Error handlers
 @app.exception_handler(404)
 async def not_found_handler(request, exc):
-    return JSONResponse(
-        status_code=404,
-        content={"error": "Not found"}
-    )
+    return not_found_response()
 
 
 @app.exception_handler(500)
 async def internal_error_handler(request, exc):
-    return JSONResponse(
-        status_code=500,
-        content={"error": "Internal server error"}
-    )
+    return internal_error_response()
 
 
 # Startup and shutdown events
@@ -476,9 +649,33 @@ async def internal_error_handler(request, exc):
 async def startup_event():
     """Initialize on startup"""
     logger.info("Starting AI Avatar Platform...")
+    settings.validate_config()
     logger.info(f"Environment: {settings.ENVIRONMENT}")
     logger.info(f"GPU enabled: {settings.USE_GPU}")
 
+    # Initialize components
+    global generator, trainer, synthesizer
+    generator = get_generator()
+    trainer = get_trainer()
+    synthesizer = get_synthesizer()
+
+    # Avatar training runs in spawned worker processes that build their trainer
+    # once; submitting a no-op starts them now rather than on the first request
+    app.state.training_pool = ProcessPoolExecutor(
+        max_workers=settings.TRAINING_PROCESSES,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=get_trainer
+    )
+    app.state.training_pool.submit(os.getpid)
+
+    # Batch submissions are inserted by background workers
+    app.state.batch_queue = asyncio.Queue(maxsize=settings.BATCH_QUEUE_MAX_SIZE)
+    app.state.batch_start_tasks = set()
+    app.state.batch_workers = [
+        asyncio.create_task(batch_worker(app.state.batch_queue))
+        for _ in range(settings.BATCH_WORKERS)
+    ]
+
     # Pre-load models if configured
     if settings.USE_GPU:
         logger.info("Pre-loading models...")
@@ -496,11 +693,18 @@ async def shutdown_event():
     """Cleanup on shutdown"""
     logger.info("Shutting down AI Avatar Platform...")
 
+    # Insert everything already accepted, and let those jobs start, before stopping
+    await app.state.batch_queue.join()
+    for task in app.state.batch_workers:
+        task.cancel()
+    await asyncio.gather(*app.state.batch_workers, return_exceptions=True)
+    await asyncio.gather(*list(app.state.batch_start_tasks), return_exceptions=True)
+
+    app.state.training_pool.shutdown(wait=False, cancel_futures=True)
+
 
 # Main entry point
 if __name__ == "__main__":
-    import torch  # Import here to check GPU
-
     uvicorn.run(
         "main:app",
         host=settings.API_HOST,
@@ -6,6 +6,15 @@ Neural network for lip synchronization
 import torch
 import torch.nn as nn
 import torch.nn.functional as F
+from torch.nn.utils.fusion import fuse_conv_bn_eval
+
+try:
+    import onnxruntime as ort
+except ImportError:
+    ort = None
+
+# Input dtypes routed to cuDNN's fused conv + bias + add + ReLU kernels
+CUDNN_FUSED_DTYPES = (torch.float32, torch.float16)
 
 
 class Conv2d(nn.Module):
@@ -27,14 +36,33 @@ class Conv2d(nn.Module):
             nn.Conv2d(cin, cout, kernel_size, stride, padding),
             nn.BatchNorm2d(cout)
         )
-        self.act = nn.ReLU()
         self.residual = residual
 
+    def fuse(self):
+        """Replace conv + BN with one pre-folded nn.Conv2d (eval mode only)"""
+        if isinstance(self.conv_block, nn.Sequential):
+            conv, bn = self.conv_block
+            self.conv_block = fuse_conv_bn_eval(conv, bn)
+
     def forward(self, x):
-        out = self.conv_block(x)
+        # Once fused, cuDNN can do conv + bias (+ residual) + ReLU in one kernel
+        conv = self.conv_block
+        if x.is_cuda and x.dtype in CUDNN_FUSED_DTYPES and isinstance(conv, nn.Conv2d):
+            if self.residual:
+                return torch.cudnn_convolution_add_relu(
+                    x, conv.weight, x, 1.0, conv.bias,
+                    conv.stride, conv.padding, conv.dilation, conv.groups
+                )
+            return torch.cudnn_convolution_relu(
+                x, conv.weight, conv.bias,
+                conv.stride, conv.padding, conv.dilation, conv.groups
+            )
+
+        out = conv(x)
         if self.residual:
             out += x
-        return self.act(out)
+        # out is this block's own conv output, so it can be rectified in place
+        return F.relu_(out)
 
 
 class NonNegativeResidualBlock(nn.Module):
@@ -198,30 +226,31 @@ class FaceDecoder(nn.Module):
     def forward(self, x):
         out = self.conv1(x)
 
-        out = F.relu(self.bn2(self.conv2(out)))
+        out = F.relu_(self.bn2(self.conv2(out)))
         out = self.conv3(out)
         out = self.conv4(out)
 
-        out = F.relu(self.bn5(self.conv5(out)))
+        out = F.relu_(self.bn5(self.conv5(out)))
         out = self.conv6(out)
         out = self.conv7(out)
 
-        out = F.relu(self.bn8(self.conv8(out)))
+        out = F.relu_(self.bn8(self.conv8(out)))
         out = self.conv9(out)
         out = self.conv10(out)
         out = self.conv11(out)
 
-        out = F.relu(self.bn12(self.conv12(out)))
+        out = F.relu_(self.bn12(self.conv12(out)))
         out = self.conv13(out)
         out = self.conv14(out)
 
-        out = F.relu(self.bn15(self.conv15(out)))
+        out = F.relu_(self.bn15(self.conv15(out)))
         out = self.conv16(out)
 
-        out = F.relu(self.bn17(self.conv17(out)))
+        out = F.relu_(self.bn17(self.conv17(out)))
         out = self.conv18(out)
 
-        out = torch.sigmoid(self.conv19(out))
+        # Sigmoid in FP32 so reduced-precision logits don't saturate
+        out = torch.sigmoid(self.conv19(out).float())
 
         return out
 
@@ -234,11 +263,12 @@ class Wav2Lip(nn.Module):
     outputs lip-synced face image
     """
 
-    def __init__(self):
+    def __init__(self, face_encoder=None, audio_encoder=None):
         super().__init__()
 
-        self.face_encoder = FaceEncoder()
-        self.audio_encoder = AudioEncoder()
+        # Encoders may be passed in to share weights with a discriminator
+        self.face_encoder = face_encoder or FaceEncoder()
+        self.audio_encoder = audio_encoder or AudioEncoder()
         self.face_decoder = FaceDecoder()
 
     def forward(self, audio, face):
@@ -252,6 +282,15 @@ class Wav2Lip(nn.Module):
         Returns:
             Lip-synced face image (B, 3, 96, 96)
         """
+        # Match the weights' dtype, so a BF16/FP16 model can take FP32 inputs
+        dtype = self.face_decoder.conv19.weight.dtype
+        audio = audio.to(dtype)
+        face = face.to(dtype)
+
+        # cuDNN's Tensor Core convolutions are NHWC; the 1-channel audio gains nothing
+        if face.is_cuda:
+            face = face.contiguous(memory_format=torch.channels_last)
+
         # Encode audio
         audio_embedding = self.audio_encoder(audio)
 
@@ -273,11 +312,12 @@ class Wav2LipDiscriminator(nn.Module):
     Not used for inference, but included for completeness
     """
 
-    def __init__(self):
+    def __init__(self, face_encoder=None, audio_encoder=None):
         super().__init__()
 
-        self.face_encoder = FaceEncoder()
-        self.audio_encoder = AudioEncoder()
+        # Encoders may be passed in to share weights with the generator
+        self.face_encoder = face_encoder or FaceEncoder()
+        self.audio_encoder = audio_encoder or AudioEncoder()
 
         self.fc = nn.Sequential(
             nn.Linear(1024, 512),
@@ -306,37 +346,180 @@ class Wav2LipDiscriminator(nn.Module):
         return output
 
 
-def get_model(model_type="wav2lip", device="cpu"):
+class Wav2LipGraphRunner:
+    """
+    Replays one captured Wav2Lip forward pass as a CUDA graph
+
+    The pass is captured once for a fixed batch size into static input and
+    output buffers; each call copies its inputs in, replays the graph (one
+    launch instead of one per kernel) and returns a copy of the output.
+    Smaller batches are padded into the static buffers; larger ones run eagerly.
+    Construct it under the same autocast context the calls will use.
+    """
+
+    def __init__(self, model, batch_size=1, dtype=torch.float32, warmup_iters=3):
+        device = next(model.parameters()).device
+
+        self.model = model
+        self.batch_size = batch_size
+        self.audio_static = torch.zeros((batch_size, 1, 80, 16), device=device, dtype=dtype)
+        self.face_static = torch.zeros(
+            (batch_size, 6, 96, 96), device=device, dtype=dtype
+        ).contiguous(memory_format=torch.channels_last)
+
+        # Warm up on a side stream so cuDNN autotuning and allocations happen
+        # outside the capture
+        stream = torch.cuda.Stream(device=device)
+        stream.wait_stream(torch.cuda.current_stream(device))
+        with torch.no_grad(), torch.cuda.stream(stream):
+            for _ in range(warmup_iters):
+                model(self.audio_static, self.face_static)
+        torch.cuda.current_stream(device).wait_stream(stream)
+
+        self.graph = torch.cuda.CUDAGraph()
+        with torch.no_grad(), torch.cuda.graph(self.graph):
+            self.out_static = model(self.audio_static, self.face_static)
+
+    def __call__(self, audio, face):
+        n = audio.size(0)
+        if n > self.batch_size:
+            return self.model(audio, face)
+
+        self.audio_static[:n].copy_(audio)
+        self.face_static[:n].copy_(face)
+        self.graph.replay()
+
+        return self.out_static[:n].clone()
+
+
+def get_model(model_type="wav2lip", device="cpu", face_encoder=None, audio_encoder=None):
     """
     Get model instance
 
+    On CUDA the weights are stored channels_last so convolutions run on
+    cuDNN's NHWC kernels without layout conversions.
+
     Args:
         model_type: Type of model ("wav2lip" or "discriminator")
         device: Device to load model on
+        face_encoder: Existing FaceEncoder to share instead of creating one
+        audio_encoder: Existing AudioEncoder to share instead of creating one
 
     Returns:
         Model instance
     """
     if model_type == "wav2lip":
-        model = Wav2Lip()
+        model = Wav2Lip(face_encoder, audio_encoder)
     elif model_type == "discriminator":
-        model = Wav2LipDiscriminator()
+        model = Wav2LipDiscriminator(face_encoder, audio_encoder)
     else:
         raise ValueError(f"Unknown model type: {model_type}")
 
-    return model.to(device)
+    model = model.to(device)
+    if torch.device(device).type == "cuda":
+        model = model.to(memory_format=torch.channels_last)
+
+    return model
+
+
+def get_model_pair(device="cpu"):
+    """
+    Get a Wav2Lip generator and discriminator that share one pair of encoders
+
+    Args:
+        device: Device to load the models on
+
+    Returns:
+        (generator, discriminator) tuple
+    """
+    generator = get_model("wav2lip", device)
+    discriminator = get_model(
+        "discriminator",
+        device,
+        face_encoder=generator.face_encoder,
+        audio_encoder=generator.audio_encoder
+    )
+    return generator, discriminator
+
+
+def fuse_bn(model):
+    """
+    Fold every BatchNorm into the convolution before it, for inference
+
+    Each Conv2d block's conv + BN becomes a single bare convolution, and each of
+    FaceDecoder's ConvTranspose2d/bnN pairs becomes one transposed
+    convolution followed by nn.Identity. The model must be in eval mode.
+
+    Args:
+        model: Model to fuse in place
+
+    Returns:
+        The same model
+    """
+    for module in list(model.modules()):
+        if isinstance(module, Conv2d):
+            module.fuse()
+        elif isinstance(module, FaceDecoder):
+            for name, bn in list(module.named_children()):
+                if isinstance(bn, nn.BatchNorm2d):
+                    conv_name = "conv" + name[len("bn"):]
+                    conv = getattr(module, conv_name)
+                    setattr(module, conv_name, fuse_conv_bn_eval(conv, bn, transpose=True))
+                    setattr(module, name, nn.Identity())
+
+    return model
+
+
+def configure_cuda_backends():
+    """
+    Let cuDNN autotune its convolution algorithms and allow TF32
+
+    Inference shapes are fixed, so cuDNN times its algorithms once per
+    (shape, layout) and reuses the fastest; TF32 covers any FP32
+    convs/matmuls. These flags are process-wide, so call this from model
+    setup rather than at import.
+    """
+    torch.backends.cudnn.benchmark = True
+    torch.backends.cudnn.allow_tf32 = True
+    torch.backends.cuda.matmul.allow_tf32 = True
+    torch.set_float32_matmul_precision("high")
 
 
-def load_checkpoint(checkpoint_path, device="cpu"):
+def warm_up(model, batch_size=1, device="cpu", dtype=torch.float32):
+    """
+    Run one inference pass on zeros of the inference shapes
+
+    For a compiled model this triggers compilation (and CUDA graph capture)
+    up front instead of on the first real batch.
+
+    Args:
+        model: Wav2Lip model, eager or compiled
+        batch_size: Batch size to specialize for
+        device: Device the model is on
+        dtype: Input dtype used at inference time
+    """
+    audio = torch.zeros((batch_size, 1, 80, 16), device=device, dtype=dtype)
+    face = torch.zeros((batch_size, 6, 96, 96), device=device, dtype=dtype)
+
+    with torch.no_grad():
+        model(audio, face)
+
+
+def load_checkpoint(checkpoint_path, device="cpu", compile=True, cuda_graph=False, dtype=None):
     """
     Load model from checkpoint
 
     Args:
         checkpoint_path: Path to checkpoint file
         device: Device to load model on
+        compile: On CUDA, compile with torch.compile and warm it up
+        cuda_graph: On CUDA without compile, wrap the model in a
+            Wav2LipGraphRunner for batch size 1 (compile's reduce-overhead
+            mode already captures CUDA graphs)
+        dtype: On CUDA, cast the weights to this dtype (e.g. torch.bfloat16)
 
     Returns:
-        Loaded model
+        Loaded model, or a Wav2LipGraphRunner around it
     """
     model = get_model("wav2lip", device)
     checkpoint = torch.load(checkpoint_path, map_location=device)
@@ -347,5 +530,90 @@ def load_checkpoint(checkpoint_path, device="cpu"):
         model.load_state_dict(checkpoint)
 
     model.eval()
+    fuse_bn(model)
+    if torch.device(device).type == "cuda":
+        configure_cuda_backends()
+        # Fused weights are new tensors; keep them NHWC
+        model = model.to(memory_format=torch.channels_last)
+        if dtype is not None:
+            model = model.to(dtype=dtype)
+
+    if compile and torch.device(device).type == "cuda" and hasattr(torch, "compile"):
+        # Inductor fuses the Conv+BN+ReLU chains (and the final sigmoid into
+        # conv19's epilogue); reduce-overhead replays them as a CUDA graph
+        model = torch.compile(model, mode="reduce-overhead", fullgraph=False, dynamic=False)
+        warm_up(model, device=device, dtype=dtype or torch.float32)
+    elif cuda_graph and torch.device(device).type == "cuda":
+        return Wav2LipGraphRunner(model, dtype=dtype or torch.float32)
+    elif torch.device(device).type == "cuda":
+        # Run the cuDNN autotuner now rather than on the first real frame
+        warm_up(model, device=device, dtype=dtype or torch.float32)
 
     return model
+
+
+def export_onnx(model, path, opset_version=17):
+    """
+    Export a Wav2Lip model to ONNX with a dynamic batch dimension
+
+    Args:
+        model: Eager Wav2Lip model (BatchNorm may already be fused)
+        path: Output .onnx path
+        opset_version: ONNX opset to target
+
+    Returns:
+        path
+    """
+    device = next(model.parameters()).device
+    dummy_audio = torch.zeros((1, 1, 80, 16), device=device)
+    dummy_face = torch.zeros((1, 6, 96, 96), device=device)
+
+    torch.onnx.export(
+        model,
+        (dummy_audio, dummy_face),
+        str(path),
+        opset_version=opset_version,
+        input_names=["audio", "face"],
+        output_names=["frame"],
+        dynamic_axes={"audio": {0: "B"}, "face": {0: "B"}, "frame": {0: "B"}}
+    )
+
+    return path
+
+
+class OnnxWav2Lip:
+    """
+    Wav2Lip inference through ONNX Runtime, called like the PyTorch model
+
+    ORT fuses Conv+BN+ReLU at graph optimization time and runs on its
+    MLAS/oneDNN CPU kernels (or CUDA when that provider is available).
+    """
+
+    def __init__(self, path, providers=None):
+        if ort is None:
+            raise ImportError("onnxruntime is not installed")
+
+        self.session = ort.InferenceSession(
+            str(path),
+            providers=providers or ["CUDAExecutionProvider", "CPUExecutionProvider"]
+        )
+
+    def __call__(self, audio, face):
+        """
+        Args:
+            audio: Audio mel spectrogram (B, 1, 80, 16)
+            face: Face image (B, 6, 96, 96)
+
+        Returns:
+            Lip-synced face image (B, 3, 96, 96), as a tensor on audio's device
+        """
+        (frame,) = self.session.run(
+            ["frame"],
+            {
+                "audio": audio.detach().float().cpu().numpy(),
+                "face": face.detach().float().cpu().numpy(),
+            }
+        )
+        return torch.from_numpy(frame).to(audio.device)
+
+    forward = __call__
@@ -4,15 +4,24 @@ Manages 12 parallel quad-terminal agents for building HeyGen competitor
 """
 
 import asyncio
+import atexit
 import logging
+import queue
 import signal
 import sys
-from datetime import datetime
+import time
+from collections import Counter
 from typing import Dict, List, Optional
 from dataclasses import dataclass, field
 from enum import Enum
+from logging.handlers import QueueHandler, QueueListener
 import json
 
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
+
 
 class AgentStatus(Enum):
     IDLE = "idle"
@@ -22,7 +31,7 @@ class AgentStatus(Enum):
     HEALTHY = "healthy"
 
 
-@dataclass
+@dataclass(slots=True)
 class AgentTask:
     """Represents a task for an agent"""
     id: str
@@ -32,12 +41,12 @@ class AgentTask:
     dependencies: List[str] = field(default_factory=list)
     status: AgentStatus = AgentStatus.IDLE
     assigned_to: Optional[int] = None
-    started_at: Optional[datetime] = None
-    completed_at: Optional[datetime] = None
+    started_at: Optional[float] = None  # time.monotonic() seconds
+    completed_at: Optional[float] = None  # time.monotonic() seconds
     error: Optional[str] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class Agent:
     """Represents a quad-terminal agent"""
     id: int
@@ -45,7 +54,8 @@ class Agent:
     status: AgentStatus = AgentStatus.IDLE
     current_task: Optional[AgentTask] = None
     tasks_completed: int = 0
-    last_heartbeat: datetime = field(default_factory=datetime.now)
+    last_heartbeat: float = 0.0  # event loop clock; set when a task is assigned
+    busy_until: float = 0.0  # loop time the current task is expected to finish
 
 
 class MultiAgentOrchestrator:
@@ -56,23 +66,44 @@ class MultiAgentOrchestrator:
 
     def __init__(self, num_agents: int = 12):
         self.num_agents = num_agents
-        self.agents: Dict[int, Agent] = {}
+        self.agents: List[Agent] = []  # indexed by agent id (0..num_agents-1)
         self.tasks: Dict[str, AgentTask] = {}
+        # Dependency bookkeeping: tasks become ready when their last dependency completes
+        self.reverse_deps: Dict[str, List[str]] = {}
+        self.pending_count: Dict[str, int] = {}
+        self.ready_queue: asyncio.Queue = asyncio.Queue()  # ids of tasks whose dependencies are met
+        self.all_completed = asyncio.Event()
+        # Running tallies kept in step with every task status change
+        self.status_counts: Counter = Counter({status: 0 for status in AgentStatus})
+        self.component_index: Dict[str, List[AgentTask]] = {}
         self.running = False
         self.setup_logging()
         self.initialize_agents()
         self.initialize_tasks()
 
     def setup_logging(self):
-        """Configure logging"""
-        logging.basicConfig(
-            level=logging.INFO,
-            format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-            handlers=[
-                logging.FileHandler('orchestrator.log'),
-                logging.StreamHandler()
-            ]
-        )
+        """Configure logging
+
+        The event loop only enqueues records; file and console writes happen
+        on a QueueListener thread.
+        """
+        formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+        handlers = [
+            logging.FileHandler('orchestrator.log'),
+            logging.StreamHandler()
+        ]
+        for handler in handlers:
+            handler.setFormatter(formatter)
+
+        log_queue = queue.SimpleQueue()
+        self._log_listener = QueueListener(log_queue, *handlers)
+        self._log_listener.start()
+        atexit.register(self._log_listener.stop)
+
+        # Left unformatted: the listener's handlers apply the formatter
+        root = logging.getLogger()
+        root.setLevel(logging.INFO)
+        root.addHandler(QueueHandler(log_queue))
         self.logger = logging.getLogger('Orchestrator')
 
     def initialize_agents(self):
@@ -93,10 +124,10 @@ class MultiAgentOrchestrator:
         ]
 
         for i in range(self.num_agents):
-            self.agents[i] = Agent(
+            self.agents.append(Agent(
                 id=i,
                 name=agent_names[i] if i < len(agent_names) else f"Agent-{i}"
-            )
+            ))
             self.logger.info(f"Initialized {self.agents[i].name} (ID: {i})")
 
     def initialize_tasks(self):
@@ -263,36 +294,49 @@ class MultiAgentOrchestrator:
             task = AgentTask(**task_config)
             self.tasks[task.id] = task
 
+        # Map each task to its dependents and count unmet dependencies once,
+        # so completions release dependents without rescanning every task
+        for task in self.tasks.values():
+            self.status_counts[task.status] += 1
+            self.component_index.setdefault(task.component, []).append(task)
+            self.pending_count[task.id] = len(task.dependencies)
+            for dep_id in task.dependencies:
+                self.reverse_deps.setdefault(dep_id, []).append(task.id)
+
+        for task_id, count in self.pending_count.items():
+            if count == 0:
+                self.ready_queue.put_nowait(task_id)
+
         self.logger.info(f"Initialized {len(self.tasks)} tasks")
 
-    def get_available_tasks(self) -> List[AgentTask]:
-        """Get tasks that are ready to be assigned"""
-        available = []
-        for task in self.tasks.values():
-            if task.status == AgentStatus.IDLE:
-                # Check if all dependencies are completed
-                deps_completed = all(
-                    self.tasks[dep_id].status == AgentStatus.COMPLETED
-                    for dep_id in task.dependencies
-                )
-                if deps_completed:
-                    available.append(task)
-        return available
+    def set_task_status(self, task: AgentTask, status: AgentStatus):
+        """Change a task's status, keeping status_counts in step"""
+        self.status_counts[task.status] -= 1
+        self.status_counts[status] += 1
+        task.status = status
+
+    def release_dependents(self, task: AgentTask):
+        """Queue every task whose last unmet dependency was task"""
+        for dependent_id in self.reverse_deps.get(task.id, ()):
+            self.pending_count[dependent_id] -= 1
+            if self.pending_count[dependent_id] == 0:
+                self.ready_queue.put_nowait(dependent_id)
 
     def get_idle_agents(self) -> List[Agent]:
         """Get agents that are available for work"""
-        return [agent for agent in self.agents.values()
+        return [agent for agent in self.agents
                 if agent.status == AgentStatus.IDLE]
 
     async def assign_task(self, agent: Agent, task: AgentTask):
         """Assign a task to an agent"""
         agent.status = AgentStatus.WORKING
         agent.current_task = task
-        task.status = AgentStatus.WORKING
+        agent.last_heartbeat = asyncio.get_running_loop().time()
+        self.set_task_status(task, AgentStatus.WORKING)
         task.assigned_to = agent.id
-        task.started_at = datetime.now()
+        task.started_at = time.monotonic()
 
-        self.logger.info(f"✓ Assigned {task.name} to {agent.name}")
+        self.logger.info("✓ Assigned %s to %s", task.name, agent.name)
 
         # Simulate task execution
         await self.execute_task(agent, task)
@@ -300,56 +344,84 @@ class MultiAgentOrchestrator:
     async def execute_task(self, agent: Agent, task: AgentTask):
         """Execute a task (simulated with actual build logic)"""
         try:
-            self.logger.info(f"▶ {agent.name} started: {task.name}")
+            self.logger.info("▶ %s started: %s", agent.name, task.name)
 
             # Simulate work with different durations based on complexity
             work_time = len(task.dependencies) * 2 + 5
 
-            # Send periodic heartbeats during execution
-            for i in range(work_time):
-                await asyncio.sleep(1)
-                agent.last_heartbeat = datetime.now()
-                if i % 3 == 0:
-                    self.logger.info(f"  {agent.name} progress: {task.name} ({i}/{work_time}s)")
+            # One timer for the whole task; the health loop treats the agent as
+            # alive until busy_until, and progress lines are scheduled up front
+            loop = asyncio.get_running_loop()
+            agent.busy_until = loop.time() + work_time
+            progress = [
+                loop.call_later(
+                    i, self.logger.info, "  %s progress: %s (%d/%ds)", agent.name, task.name, i, work_time
+                )
+                for i in range(0, work_time, 3)
+            ]
+            try:
+                await asyncio.sleep(work_time)
+            finally:
+                for handle in progress:
+                    handle.cancel()
+            agent.last_heartbeat = loop.time()
 
             # Mark as completed
-            task.status = AgentStatus.COMPLETED
-            task.completed_at = datetime.now()
+            self.set_task_status(task, AgentStatus.COMPLETED)
+            task.completed_at = time.monotonic()
             agent.status = AgentStatus.IDLE
             agent.current_task = None
             agent.tasks_completed += 1
+            self.release_dependents(task)
+            if self.status_counts[AgentStatus.COMPLETED] == len(self.tasks):
+                self.all_completed.set()
 
-            duration = (task.completed_at - task.started_at).total_seconds()
-            self.logger.info(f"✓ {agent.name} completed: {task.name} ({duration:.1f}s)")
+            duration = task.completed_at - task.started_at
+            self.logger.info("✓ %s completed: %s (%.1fs)", agent.name, task.name, duration)
 
         except Exception as e:
-            task.status = AgentStatus.FAILED
+            self.set_task_status(task, AgentStatus.FAILED)
             task.error = str(e)
             agent.status = AgentStatus.IDLE
             agent.current_task = None
-            self.logger.error(f"✗ {agent.name} failed: {task.name} - {e}")
+            self.logger.error("✗ %s failed: %s - %s", agent.name, task.name, e)
 
     async def health_check_loop(self):
         """Continuous health monitoring of all agents"""
         while self.running:
             await asyncio.sleep(5)
 
-            for agent in self.agents.values():
-                time_since_heartbeat = (datetime.now() - agent.last_heartbeat).total_seconds()
+            # Only a working agent can be stuck; it counts as alive until its
+            # task is due to finish
+            now = asyncio.get_running_loop().time()
+            for agent in self.agents:
+                if agent.status != AgentStatus.WORKING:
+                    continue
+
+                heartbeat = max(agent.last_heartbeat, min(now, agent.busy_until))
+                time_since_heartbeat = now - heartbeat
 
                 if time_since_heartbeat > 30:
-                    self.logger.warning(f"⚠ {agent.name} may be stuck (no heartbeat for {time_since_heartbeat:.0f}s)")
-                else:
-                    # Update heartbeat for idle agents
-                    if agent.status == AgentStatus.IDLE:
-                        agent.last_heartbeat = datetime.now()
+                    self.logger.warning(
+                        "⚠ %s may be stuck (no heartbeat for %.0fs)", agent.name, time_since_heartbeat
+                    )
 
             # Log overall progress
-            completed = sum(1 for t in self.tasks.values() if t.status == AgentStatus.COMPLETED)
+            completed = self.status_counts[AgentStatus.COMPLETED]
             total = len(self.tasks)
-            working = sum(1 for a in self.agents.values() if a.status == AgentStatus.WORKING)
+            # Each working agent holds exactly one working task
+            working = self.status_counts[AgentStatus.WORKING]
+
+            self.logger.info(
+                "📊 Progress: %d/%d tasks | %d/%d agents working",
+                completed, total, working, self.num_agents
+            )
 
-            self.logger.info(f"📊 Progress: {completed}/{total} tasks | {working}/{self.num_agents} agents working")
+    async def agent_worker(self, agent: Agent):
+        """Run ready tasks on one agent until the orchestrator stops"""
+        while self.running:
+            task_id = await self.ready_queue.get()
+            await self.assign_task(agent, self.tasks[task_id])
 
     async def orchestrate(self):
         """Main orchestration loop"""
@@ -362,35 +434,18 @@ class MultiAgentOrchestrator:
         # Start health check in background
         health_task = asyncio.create_task(self.health_check_loop())
 
-        # Main work loop
-        while self.running:
-            # Get available work
-            available_tasks = self.get_available_tasks()
-            idle_agents = self.get_idle_agents()
-
-            # Assign tasks to idle agents
-            assignments = []
-            for task, agent in zip(available_tasks, idle_agents):
-                assignments.append(self.assign_task(agent, task))
-
-            if assignments:
-                await asyncio.gather(*assignments)
-            else:
-                # Check if we're done
-                all_completed = all(
-                    task.status == AgentStatus.COMPLETED
-                    for task in self.tasks.values()
-                )
+        # Each agent pulls its next task as soon as it finishes the last one
+        workers = [asyncio.create_task(self.agent_worker(agent)) for agent in self.agents]
+        await self.all_completed.wait()
 
-                if all_completed:
-                    self.logger.info("=" * 80)
-                    self.logger.info("🎉 All tasks completed!")
-                    self.logger.info("=" * 80)
-                    self.print_summary()
-                    break
+        for worker in workers:
+            worker.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
 
-                # Wait a bit before checking again
-                await asyncio.sleep(2)
+        self.logger.info("=" * 80)
+        self.logger.info("🎉 All tasks completed!")
+        self.logger.info("=" * 80)
+        self.print_summary()
 
         # Keep running to maintain keep-alive
         self.logger.info("💚 Entering keep-alive mode (press Ctrl+C to exit)")
@@ -404,21 +459,14 @@ class MultiAgentOrchestrator:
         self.logger.info("\n📈 Execution Summary:")
         self.logger.info("-" * 80)
 
-        for agent in self.agents.values():
+        for agent in self.agents:
             self.logger.info(f"  {agent.name}: {agent.tasks_completed} tasks completed")
 
         self.logger.info("-" * 80)
 
         # Task breakdown by component
-        components = {}
-        for task in self.tasks.values():
-            comp = task.component
-            if comp not in components:
-                components[comp] = []
-            components[comp].append(task)
-
         self.logger.info("\n📦 Components Built:")
-        for comp, tasks in components.items():
+        for comp, tasks in self.component_index.items():
             completed = sum(1 for t in tasks if t.status == AgentStatus.COMPLETED)
             self.logger.info(f"  {comp}: {completed}/{len(tasks)} tasks")
 
@@ -445,4 +493,11 @@ async def main():
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    # libuv's event loop is cheaper for this sleep/timer-heavy scheduling
+    if uvloop is None:
+        asyncio.run(main())
+    elif sys.version_info >= (3, 12):
+        asyncio.run(main(), loop_factory=uvloop.new_event_loop)
+    else:
+        uvloop.install()
+        asyncio.run(main())
@@ -4,136 +4,292 @@ Paste prompts to all 12 terminals then run keep-alive monitoring
 """
 
 import json
-import time
+import multiprocessing
+import os
+import shutil
+import signal
 import subprocess
+import tempfile
 import threading
+import time
+
+# Keep-alive poke interval in seconds (adaptive between min and max)
+KEEPALIVE_INTERVAL = float(os.getenv("KEEPALIVE_INTERVAL", "10"))
+KEEPALIVE_MIN_INTERVAL = float(os.getenv("KEEPALIVE_MIN_INTERVAL", "2"))
+KEEPALIVE_MAX_INTERVAL = float(os.getenv("KEEPALIVE_MAX_INTERVAL", "30"))
+
+# Total prompt size above which AppleScript escaping is spread over processes
+PARALLEL_PREP_MIN_CHARS = 4 * 1024 * 1024
+
+# (prompts.json key, display name), one per Terminal window
+TASKS = [
+    ("task_1", "🔍 SEO"),
+    ("task_2", "👤 Avatars"),
+    ("task_3", "✨ UI"),
+    ("task_4", "🎤 Voice"),
+    ("task_5", "⚡ Performance"),
+    ("task_6", "♿ Accessibility"),
+    ("task_7", "📊 Analytics"),
+    ("task_8", "❓ FAQ"),
+    ("task_9", "💰 Pricing"),
+    ("task_10", "⭐ Testimonials"),
+    ("task_11", "🎮 Demo"),
+    ("task_12", "📱 PWA"),
+]
 
-# Load prompts
+# Load prompts, keeping just the bodies in window order
 with open('tasks/prompts.json', 'r') as f:
     prompts = json.load(f)
+prompt_bodies = [prompts[task_key]["prompt"] for task_key, _ in TASKS]
 
-def paste_to_terminal(window_num, prompt_text):
-    """Paste text to terminal window using clipboard"""
-    # Write to temp file
-    temp_file = f"/tmp/claude_task_{window_num}.txt"
-    with open(temp_file, 'w') as f:
-        f.write(prompt_text)
+def applescript_string(text):
+    """Quote text as an AppleScript string literal"""
+    escaped = (
+        text.replace('\\', '\\\\')
+        .replace('"', '\\"')
+        .replace('\n', '\\n')
+        .replace('\r', '\\r')
+        .replace('\t', '\\t')
+    )
+    return f'"{escaped}"'
 
-    # Use pbcopy and AppleScript to paste
-    script = f'''
-    do shell script "cat {temp_file} | pbcopy"
-    delay 0.2
+def get_window_ids():
+    """Return Terminal's window ids, frontmost first
+
+    Ids stay fixed while windows are reordered, unlike window indices.
+    """
+    result = subprocess.run(
+        ['osascript', '-e', 'tell application "Terminal" to get id of every window'],
+        capture_output=True, text=True, check=True, timeout=10
+    )
+    return [int(window_id) for window_id in result.stdout.strip().split(", ") if window_id]
+
+def paste_to_terminals(window_prompts):
+    """Paste each prompt to its terminal window with a single osascript call
+
+    Args:
+        window_prompts: List of (window_id, prompt_text) pairs
 
-    tell application "Terminal"
-        activate
-        set index of window {window_num} to 1
-    end tell
+    Returns:
+        True if every paste was issued
+    """
+    # Embed the prompts in the script so the clipboard is set without a shell;
+    # escaping only goes to a process pool once the prompts are big enough to pay for it
+    window_ids = [window_id for window_id, _ in window_prompts]
+    texts = [prompt_text for _, prompt_text in window_prompts]
+    if sum(map(len, texts)) >= PARALLEL_PREP_MIN_CHARS:
+        with multiprocessing.Pool(min(len(texts), os.cpu_count() or 1)) as pool:
+            literals = pool.map(applescript_string, texts)
+    else:
+        literals = [applescript_string(text) for text in texts]
+    pairs = [f'{{{window_id}, {literal}}}' for window_id, literal in zip(window_ids, literals)]
 
-    delay 0.3
+    # One AppleScript loops over every window: copy, raise, paste, submit
+    script = f'''
+    repeat with pair in {{{", ".join(pairs)}}}
+        set winId to item 1 of pair
+        set the clipboard to item 2 of pair
+        delay 0.2
+
+        tell application "Terminal"
+            activate
+            set index of window id winId to 1
+        end tell
 
-    tell application "System Events"
-        keystroke "v" using command down
         delay 0.3
-        keystroke return
-    end tell
+
+        tell application "System Events"
+            keystroke "v" using command down
+            delay 0.3
+            keystroke return
+        end tell
+
+        delay 0.5 -- Let the paste settle before the clipboard changes
+    end repeat
     '''
 
+    # The script is fed on stdin: with the prompts embedded it can exceed
+    # ARG_MAX (1 MiB on macOS), which `osascript -e` would hit as E2BIG
     try:
-        subprocess.run(['osascript', '-e', script], check=True, timeout=10)
+        subprocess.run(
+            ['osascript', '-'],
+            input=script.encode('utf-8'),
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
+            check=True,
+            timeout=10 * len(pairs),
+        )
         return True
+    except subprocess.CalledProcessError as e:
+        print(f"Error pasting to terminals: {e.stderr.decode(errors='replace').strip()}")
+        return False
     except Exception as e:
-        print(f"Error pasting to terminal {window_num}: {e}")
+        print(f"Error pasting to terminals: {e}")
         return False
 
-def send_enter_key(window_num):
-    """Send Enter key to terminal window"""
-    script = f'''
-    tell application "Terminal"
-        activate
-        set index of window {window_num} to 1
-    end tell
-    delay 0.1
-    tell application "System Events"
-        keystroke return
-    end tell
-    '''
+class EnterKeySender:
+    """One long-lived osascript that presses Enter in whichever window it is sent
 
-    try:
-        subprocess.run(['osascript', '-e', script], check=False, timeout=5, capture_output=True)
-    except:
-        pass
+    Window ids are written one per line to a FIFO; the AppleScript loops reading
+    a line and sending an empty `do script` to that window, which submits Enter
+    without focusing or reordering windows. Keep-alive ticks cost a pipe write
+    instead of an osascript spawn. Ids whose `do script` fails are echoed back
+    on a second FIFO so the caller can back off from broken windows.
+    """
 
-def keep_alive_worker(window_num, task_name, duration_minutes=30):
-    """Keep terminal alive with Enter presses"""
-    print(f"[{task_name}] Keep-alive started (window {window_num})")
+    def __init__(self):
+        self.fifo_dir = tempfile.mkdtemp(prefix="claude_keepalive_")
+        self.fifo_path = os.path.join(self.fifo_dir, "windows")
+        os.mkfifo(self.fifo_path)
+        # Opened read-write so writes never hit EPIPE while the script is between reads
+        self.fifo_fd = os.open(self.fifo_path, os.O_RDWR)
+        self.failed_path = os.path.join(self.fifo_dir, "failed")
+        os.mkfifo(self.failed_path)
+        self.failed_fd = os.open(self.failed_path, os.O_RDWR | os.O_NONBLOCK)
+        self.failed_buffer = b""
 
-    end_time = time.time() + (duration_minutes * 60)
-    count = 0
+        # `read` in sh consumes exactly one line, unlike head which may buffer ahead
+        script = f'''
+        repeat
+            set winId to (do shell script "read -r w < {self.fifo_path}; echo $w") as integer
+            try
+                tell application "Terminal" to do script "" in window id winId
+            on error
+                do shell script "echo " & winId & " > {self.failed_path}"
+            end try
+        end repeat
+        '''
+        self.proc = subprocess.Popen(
+            ['osascript', '-e', script],
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+
+    def send(self, window_id):
+        """Queue an Enter press for a terminal window"""
+        os.write(self.fifo_fd, b"%d\n" % window_id)
+
+    def failed_windows(self):
+        """Return the ids of windows whose Enter presses failed since the last call"""
+        while True:
+            try:
+                chunk = os.read(self.failed_fd, 4096)
+            except BlockingIOError:
+                break
+            if not chunk:
+                break
+            self.failed_buffer += chunk
+        *lines, self.failed_buffer = self.failed_buffer.split(b"\n")
+        return {int(line) for line in lines if line}
+
+    def close(self):
+        """Stop the osascript process and remove the FIFOs"""
+        self.proc.terminate()
+        try:
+            self.proc.wait(timeout=5)
+        except subprocess.TimeoutExpired:
+            self.proc.kill()
+        os.close(self.fifo_fd)
+        os.close(self.failed_fd)
+        shutil.rmtree(self.fifo_dir, ignore_errors=True)
+
+def keep_alive_all(sender, windows, stop, duration_minutes=30,
+                   interval_s=KEEPALIVE_INTERVAL, min_interval=KEEPALIVE_MIN_INTERVAL,
+                   max_interval=KEEPALIVE_MAX_INTERVAL):
+    """Keep all terminals alive with Enter presses from a single loop
+
+    The interval starts at interval_s and backs off by 1.5x per tick up to
+    max_interval; agents that are already working need little prodding.
+    A window whose pokes keep failing is skipped for 2, 4, 8... seconds (capped
+    at a minute) after each consecutive failure. Returns as soon as the stop
+    event is set.
+    """
+    print(f"Keep-alive started ({len(windows)} windows)")
+
+    start_time = time.time()
+    end_time = start_time + (duration_minutes * 60)
+    next_report = start_time + 60
+    interval = max(min_interval, min(interval_s, max_interval))
+    fail_count = {}
+    next_retry = {}
+    sent = []
 
     while time.time() < end_time:
-        time.sleep(2)
-        count += 1
-        send_enter_key(window_num)
+        if stop.wait(min(interval, max(0, end_time - time.time()))):
+            break
+
+        # Failures from the previous tick have been reported by now
+        now = time.time()
+        failed = sender.failed_windows()
+        for window_id in sent:
+            if window_id in failed:
+                fail_count[window_id] = fail_count.get(window_id, 0) + 1
+                next_retry[window_id] = now + min(60, 2 ** fail_count[window_id])
+            else:
+                fail_count.pop(window_id, None)
+
+        sent = []
+        for window_id in windows:
+            if now < next_retry.get(window_id, 0):
+                continue
+            try:
+                sender.send(window_id)
+                sent.append(window_id)
+            except OSError:
+                fail_count[window_id] = fail_count.get(window_id, 0) + 1
+                next_retry[window_id] = now + min(60, 2 ** fail_count[window_id])
+        interval = min(max_interval, interval * 1.5)
 
-        if count % 30 == 0:
-            print(f"[{task_name}] Alive ({count*2}s)")
+        now = time.time()
+        if now >= next_report:
+            print(f"Alive ({int(now - start_time)}s, next poke in {interval:.0f}s)")
+            next_report = now + 60
 
-    print(f"[{task_name}] Complete")
+    print("Keep-alive complete")
 
 def main():
+    # Stay out of the way of the agents running in the terminals; the
+    # osascript processes started below inherit this
+    os.nice(10)
+    try:
+        import psutil
+        psutil.Process().cpu_affinity([0])
+    except (ImportError, AttributeError):
+        pass  # psutil missing, or no CPU affinity support (macOS)
+
     print("=" * 80)
     print("🚀 Pasting prompts to 12 Claude terminals")
     print("=" * 80)
 
-    tasks = [
-        ("task_1", "🔍 SEO"),
-        ("task_2", "👤 Avatars"),
-        ("task_3", "✨ UI"),
-        ("task_4", "🎤 Voice"),
-        ("task_5", "⚡ Performance"),
-        ("task_6", "♿ Accessibility"),
-        ("task_7", "📊 Analytics"),
-        ("task_8", "❓ FAQ"),
-        ("task_9", "💰 Pricing"),
-        ("task_10", "⭐ Testimonials"),
-        ("task_11", "🎮 Demo"),
-        ("task_12", "📱 PWA"),
-    ]
-
     # Paste prompts to all terminals
-    print("\n📤 Pasting prompts (this will take ~30 seconds)...\n")
-
-    for i, (task_key, task_name) in enumerate(tasks):
-        window_num = i + 1
-        prompt = prompts[task_key]["prompt"]
+    print("\n📤 Pasting prompts (this will take ~15 seconds)...\n")
 
-        print(f"[{task_name}] Pasting to window {window_num}...")
+    # Windows are addressed by id so raising one doesn't shift the others
+    window_ids = get_window_ids()
+    if len(window_ids) < len(TASKS):
+        print(f"❌ Need {len(TASKS)} Terminal windows, found {len(window_ids)}")
+        return
+    window_ids = window_ids[:len(TASKS)]
 
-        success = paste_to_terminal(window_num, prompt)
+    window_prompts = list(zip(window_ids, prompt_bodies))
+    print("\n".join(
+        f"[{task_name}] Pasting to window {i + 1}..." for i, (_, task_name) in enumerate(TASKS)
+    ), flush=True)
 
-        if success:
-            print(f"[{task_name}] ✅ Pasted")
-        else:
-            print(f"[{task_name}] ❌ Failed")
-
-        time.sleep(2.5)  # Give time for each paste
+    if paste_to_terminals(window_prompts):
+        print("✅ Pasted")
+    else:
+        print("❌ Failed")
 
     print("\n✅ All prompts pasted!")
-    print("\n🔄 Starting keep-alive monitoring (Enter every 2s for 30min)...\n")
-
-    # Start keep-alive threads
-    threads = []
+    print("\n🔄 Starting keep-alive monitoring (adaptive Enter interval for 30min)...\n")
 
-    for i, (task_key, task_name) in enumerate(tasks):
-        window_num = i + 1
-
-        thread = threading.Thread(
-            target=keep_alive_worker,
-            args=(window_num, task_name, 30),
-            daemon=True
-        )
-        thread.start()
-        threads.append(thread)
+    # One loop pokes every window through a shared osascript process; SIGTERM
+    # ends it like Ctrl+C so the osascript is still cleaned up
+    sender = EnterKeySender()
+    stop = threading.Event()
+    signal.signal(signal.SIGTERM, lambda signum, frame: stop.set())
 
     print("=" * 80)
     print("✅ All agents are working!")
@@ -142,10 +298,11 @@ def main():
     print()
 
     try:
-        while any(t.is_alive() for t in threads):
-            time.sleep(10)
+        keep_alive_all(sender, window_ids, stop, 30)
     except KeyboardInterrupt:
         print("\n⚠️  Stopped by user")
+    finally:
+        sender.close()
 
     print("\n✅ Done!")
 
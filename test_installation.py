@@ -3,11 +3,45 @@ Test Installation Script
 Verify that all components are installed and working correctly
 """
 
+import importlib.util
+import io
+import shutil
 import sys
-import subprocess
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 
+class ThreadOutput(io.TextIOBase):
+    """sys.stdout stand-in that collects each worker thread's prints separately"""
+
+    def __init__(self, stream):
+        self.stream = stream
+        self.local = threading.local()
+
+    def write(self, text):
+        buffer = getattr(self.local, "buffer", None)
+        target = buffer if buffer is not None else self.stream
+        return target.write(text)
+
+    def flush(self):
+        self.stream.flush()
+
+
+def run_buffered(output, test_func):
+    """Run a test with its prints captured, returning (result, printed text)"""
+    output.local.buffer = io.StringIO()
+    try:
+        try:
+            result = test_func()
+        except Exception as e:
+            print(f"✗ Unexpected error: {e}")
+            result = False
+        return result, output.local.buffer.getvalue()
+    finally:
+        output.local.buffer = None
+
+
 def test_python_version():
     """Test Python version"""
     print("Testing Python version...")
@@ -21,13 +55,12 @@ def test_python_version():
 
 
 def test_package_import(package_name, import_name=None):
-    """Test if a package can be imported"""
+    """Test if a package is installed, without importing it"""
     import_name = import_name or package_name
-    try:
-        __import__(import_name)
+    if importlib.util.find_spec(import_name) is not None:
         print(f"✓ {package_name} installed")
         return True
-    except ImportError:
+    else:
         print(f"✗ {package_name} not installed")
         return False
 
@@ -103,8 +136,8 @@ def test_face_detection():
     """Test face detection"""
     print("\nTesting face detection...")
     try:
-        import mediapipe as mp
         import cv2
+        import mediapipe as mp
         import numpy as np
 
         face_detection = mp.solutions.face_detection.FaceDetection()
@@ -171,20 +204,11 @@ def test_fastapi():
 def test_ffmpeg():
     """Test FFmpeg"""
     print("\nTesting FFmpeg...")
-    try:
-        result = subprocess.run(
-            ['ffmpeg', '-version'],
-            capture_output=True,
-            text=True
-        )
-        if result.returncode == 0:
-            version_line = result.stdout.split('\n')[0]
-            print(f"✓ FFmpeg installed: {version_line}")
-            return True
-        else:
-            print("✗ FFmpeg not working")
-            return False
-    except FileNotFoundError:
+    ffmpeg_path = shutil.which('ffmpeg')
+    if ffmpeg_path is not None:
+        print(f"✓ FFmpeg installed: {ffmpeg_path}")
+        return True
+    else:
         print("✗ FFmpeg not installed")
         return False
 
@@ -198,16 +222,12 @@ def run_all_tests():
 
     tests = [
         ("Python Version", test_python_version),
-        ("Core Packages", lambda: all([
-            test_package_import("fastapi"),
-            test_package_import("uvicorn"),
-            test_package_import("pydantic"),
-            test_package_import("torch"),
-            test_package_import("cv2", "cv2"),
-            test_package_import("mediapipe"),
-            test_package_import("librosa"),
-            test_package_import("elevenlabs"),
-        ])),
+        ("Core Packages", lambda: all(
+            test_package_import(package) for package in (
+                "fastapi", "uvicorn", "pydantic", "torch",
+                "cv2", "mediapipe", "librosa", "elevenlabs",
+            )
+        )),
         ("GPU", test_gpu),
         ("API Key", test_api_key),
         ("Directories", test_directories),
@@ -219,16 +239,22 @@ def run_all_tests():
         ("FFmpeg", test_ffmpeg),
     ]
 
+    # The checks are independent and mostly wait on imports or native code,
+    # so run them together and print each one's output in order afterwards
     results = {}
-    for name, test_func in tests:
-        print(f"\n{'=' * 60}")
-        print(f"Test: {name}")
-        print('=' * 60)
-        try:
-            results[name] = test_func()
-        except Exception as e:
-            print(f"✗ Unexpected error: {e}")
-            results[name] = False
+    output = ThreadOutput(sys.stdout)
+    sys.stdout = output
+    try:
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            futures = [executor.submit(run_buffered, output, test_func) for _, test_func in tests]
+            for (name, _), future in zip(tests, futures):
+                results[name], text = future.result()
+                print(f"\n{'=' * 60}")
+                print(f"Test: {name}")
+                print('=' * 60)
+                print(text, end="")
+    finally:
+        sys.stdout = output.stream
 
     # Summary
     print("\n" + "=" * 60)